@@ -0,0 +1,350 @@
+"""Command line interface for polling and commanding a Winix account.
+
+Runs without Home Assistant, e.g.
+
+    python -m custom_components.winix -u USER -p PASS poll --interval 30
+    python -m custom_components.winix -u USER -p PASS command mode laundry_dry
+    python -m custom_components.winix telemetry config/winix_telemetry_ENTRY
+
+Decoded states and command results are written as JSON lines. With
+`--interval 0 --count N` the poll loop doubles as a load generator; a latency
+summary is printed to stderr at the end. The telemetry action summarizes a
+telemetry log offline and needs no credentials.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+from typing import Any, TextIO
+
+import aiohttp
+
+from .const import REGION_AUTO
+from .core import mobile
+from .core.capabilities import InvalidCommand, get_profile
+from .core.driver import WinixDriver
+from .core.endpoints import REGIONS, WinixEndpoint
+from .core.models import MyWinixDeviceStub
+from .endpoints import async_resolve_endpoint
+from .telemetry import TelemetryReader
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_INTERVAL = 30.0
+
+
+def _on_off(value: str) -> bool:
+    """Parse on/off."""
+    if value not in ("on", "off"):
+        raise ValueError(f"expected on or off, got {value}")
+    return value == "on"
+
+
+def _at_least(minimum: float, convert: Callable[[str], Any]) -> Callable[[str], Any]:
+    """Return an argparse type that rejects values below minimum."""
+
+    def parse(value: str) -> Any:
+        try:
+            number = convert(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid number: {value}") from None
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return number
+
+    return parse
+
+
+# Command name -> (driver method, argument parser). Power has no setter and
+# maps to turn_on/turn_off.
+COMMANDS: dict[str, tuple[str | None, Callable[[str], Any]]] = {
+    "power": (None, _on_off),
+    "mode": ("set_mode", str),
+    "fan_speed": ("set_fan_speed", str),
+    "humidity": ("set_humidity", int),
+    "timer": ("set_timer", int),
+    "child_lock": ("set_child_lock", _on_off),
+    "uv_sterilization": ("set_uv_sterilization", _on_off),
+}
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Return the argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="python -m custom_components.winix",
+        description="Poll or command every Winix device of an account.",
+    )
+    parser.add_argument(
+        "-u", "--username", default=os.environ.get("WINIX_USERNAME")
+    )
+    parser.add_argument(
+        "-p", "--password", default=os.environ.get("WINIX_PASSWORD")
+    )
+    parser.add_argument(
+        "--region", choices=[REGION_AUTO, *REGIONS], default=REGION_AUTO
+    )
+    parser.add_argument(
+        "-d",
+        "--device",
+        action="append",
+        default=[],
+        help="Device id or alias to include, repeatable (default: all)",
+    )
+    parser.add_argument(
+        "-c",
+        "--concurrency",
+        type=_at_least(1, int),
+        default=DEFAULT_CONCURRENCY,
+        help="Maximum requests in flight",
+    )
+    parser.add_argument(
+        "-o", "--output", help="Write JSON lines to this file instead of stdout"
+    )
+    parser.add_argument("-v", "--verbose", action="store_true")
+
+    subparsers = parser.add_subparsers(dest="action", required=True)
+
+    poll = subparsers.add_parser("poll", help="Stream decoded device states")
+    poll.add_argument(
+        "-i",
+        "--interval",
+        type=_at_least(0, float),
+        default=DEFAULT_INTERVAL,
+        help="Seconds between cycles, 0 to poll back to back",
+    )
+    poll.add_argument(
+        "-n",
+        "--count",
+        type=_at_least(0, int),
+        default=1,
+        help="Cycles to run, 0 for forever",
+    )
+
+    command = subparsers.add_parser("command", help="Send a command to devices")
+    command.add_argument("name", choices=sorted(COMMANDS))
+    command.add_argument("value")
+
+    telemetry = subparsers.add_parser(
+        "telemetry", help="Summarize a telemetry log, per --device if given"
+    )
+    telemetry.add_argument("directory", help="Telemetry directory of an entry")
+    telemetry.add_argument(
+        "--since", type=float, help="Only include the last SINCE hours"
+    )
+    telemetry.add_argument(
+        "-P",
+        "--percentile",
+        type=int,
+        action="append",
+        help="Percentile to report, repeatable (default: 50, 90 and 99)",
+    )
+
+    return parser
+
+
+class FleetRunner:
+    """Run requests against all selected devices with bounded concurrency."""
+
+    def __init__(
+        self,
+        client: aiohttp.ClientSession,
+        endpoint: WinixEndpoint,
+        devices: list[MyWinixDeviceStub],
+        concurrency: int,
+        output: TextIO,
+    ) -> None:
+        """Create a runner for devices."""
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._output = output
+        self.latencies: list[float] = []
+        self.errors = 0
+        self.drivers = {
+            device.id: (
+                device,
+                WinixDriver(device.id, client, endpoint, get_profile(device.model)),
+            )
+            for device in devices
+        }
+        for _, driver in self.drivers.values():
+            driver.state_cache_ttl = 0  # Every cycle goes to the cloud
+
+    async def async_poll(self, cycle: int) -> None:
+        """Fetch and emit the state of every device once."""
+        await self._async_run_all(
+            lambda driver: driver.get_state(), {"cycle": cycle}
+        )
+
+    async def async_command(self, name: str, value: str) -> None:
+        """Send one command to every device."""
+        method, parse = COMMANDS[name]
+        if method is None:
+            method = "turn_on" if parse(value) else "turn_off"
+            args: tuple[Any, ...] = ()
+        else:
+            args = (parse(value),)
+
+        await self._async_run_all(
+            lambda driver: getattr(driver, method)(*args),
+            {"command": name, "value": value},
+        )
+
+    async def _async_run_all(
+        self,
+        request: Callable[[WinixDriver], Awaitable[Any]],
+        fields: dict[str, Any],
+    ) -> None:
+        await asyncio.gather(
+            *(
+                self._async_run(device, driver, request, fields)
+                for device, driver in self.drivers.values()
+            )
+        )
+
+    async def _async_run(
+        self,
+        device: MyWinixDeviceStub,
+        driver: WinixDriver,
+        request: Callable[[WinixDriver], Awaitable[Any]],
+        fields: dict[str, Any],
+    ) -> None:
+        record: dict[str, Any] = {
+            "ts": round(time.time(), 3),
+            "device_id": device.id,
+            "alias": device.alias,
+            **fields,
+        }
+
+        async with self._semaphore:
+            started = time.perf_counter()
+            try:
+                result = await request(driver)
+            except (aiohttp.ClientError, asyncio.TimeoutError, InvalidCommand) as err:
+                self.errors += 1
+                record["error"] = repr(err)
+            else:
+                if result is not None:
+                    record["state"] = result
+            elapsed = time.perf_counter() - started
+
+        self.latencies.append(elapsed)
+        record["elapsed"] = round(elapsed, 4)
+        self._output.write(json.dumps(record) + "\n")
+        self._output.flush()
+
+    def summary(self) -> str:
+        """Return a one line latency summary."""
+        if not self.latencies:
+            return "no requests"
+
+        latencies = sorted(self.latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f"{len(latencies)} requests, {self.errors} errors, "
+            f"p50 {statistics.median(latencies) * 1000:.0f} ms, "
+            f"p95 {p95 * 1000:.0f} ms, max {latencies[-1] * 1000:.0f} ms"
+        )
+
+
+def _select_devices(
+    devices: list[MyWinixDeviceStub], wanted: list[str]
+) -> list[MyWinixDeviceStub]:
+    if not wanted:
+        return devices
+    return [
+        device for device in devices if device.id in wanted or device.alias in wanted
+    ]
+
+
+async def async_main(args: argparse.Namespace, output: TextIO) -> int:
+    """Log in, discover devices and run the requested action."""
+    async with aiohttp.ClientSession() as client:
+        endpoint = await async_resolve_endpoint(client, args.region)
+
+        response = await asyncio.to_thread(
+            mobile.login, args.username, args.password, endpoint
+        )
+        uuid = await asyncio.to_thread(mobile.get_uuid, response.access_token)
+        devices = _select_devices(
+            await mobile.get_device_stubs(
+                client, response.access_token, uuid, endpoint
+            ),
+            args.device,
+        )
+        if not devices:
+            print("No matching devices", file=sys.stderr)
+            return 1
+
+        runner = FleetRunner(client, endpoint, devices, args.concurrency, output)
+
+        if args.action == "command":
+            await runner.async_command(args.name, args.value)
+        else:
+            cycle = 0
+            while True:
+                started = time.monotonic()
+                await runner.async_poll(cycle)
+                cycle += 1
+                if args.count and cycle >= args.count:
+                    break
+                await asyncio.sleep(
+                    max(0.0, args.interval - (time.monotonic() - started))
+                )
+
+        print(runner.summary(), file=sys.stderr)
+        return 1 if runner.errors else 0
+
+
+def summarize_telemetry(args: argparse.Namespace, output: TextIO) -> int:
+    """Write the summary of a telemetry log as JSON lines."""
+    reader = TelemetryReader(args.directory)
+    since = time.time() - args.since * 3600 if args.since is not None else None
+    options: dict[str, Any] = {"since": since}
+    if args.percentile:
+        options["percentiles"] = args.percentile
+
+    for device in args.device or [None]:
+        summary = reader.summary(device=device, **options)
+        output.write(json.dumps({"device_id": device, **summary.as_dict()}) + "\n")
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the command line interface."""
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.action == "telemetry":
+        if not os.path.isdir(args.directory):
+            parser.error(f"no telemetry log in {args.directory}")
+    elif not args.username or not args.password:
+        parser.error(
+            "username and password are required (or WINIX_USERNAME/WINIX_PASSWORD)"
+        )
+    if args.action == "command":
+        try:
+            COMMANDS[args.name][1](args.value)
+        except ValueError as err:
+            parser.error(f"invalid value for {args.name}: {err}")
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+
+    output = open(args.output, "a", encoding="utf-8") if args.output else sys.stdout
+    try:
+        if args.action == "telemetry":
+            return summarize_telemetry(args, output)
+        return asyncio.run(async_main(args, output))
+    except KeyboardInterrupt:
+        return 130
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+"""Fleet-wide statistics over all devices of a config entry.
+
+The manager collects one sample per device at the end of each poll cycle and
+reduces them in a single array pass. NumPy is used when it is installed (it
+ships with Home Assistant); otherwise the same statistics are computed in
+pure Python. Call numpy_module() in an executor first to keep its import
+off the event loop.
+"""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Sequence
+from dataclasses import dataclass, field
+from functools import cache
+import math
+from types import ModuleType
+
+from .const import FLEET_OUTLIERS, FLEET_PERCENTILES
+
+NAN = float("nan")
+
+
+@cache
+def numpy_module() -> ModuleType | None:
+    """Return numpy if it is installed, importing it on the first call."""
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+@dataclass(frozen=True, slots=True)
+class FleetAggregate:
+    """Statistics of one poll cycle across the fleet.
+
+    Humidity statistics cover the devices that reported a humidity and are
+    None when none did. `off_target` lists (name, humidity - target) of the
+    running devices furthest from their target, largest deviation first.
+    """
+
+    devices: int
+    reporting: int
+    running: int
+    humidity_mean: float | None = None
+    humidity_min: float | None = None
+    humidity_max: float | None = None
+    percentiles: dict[int, float] = field(default_factory=dict)
+    off_target: list[tuple[str, float]] = field(default_factory=list)
+
+
+class FleetSamples:
+    """Column-wise samples of the fleet, filled with one append per device."""
+
+    __slots__ = ("names", "humidity", "target", "running")
+
+    def __init__(self) -> None:
+        """Create empty columns."""
+        self.names: list[str] = []
+        self.humidity = array("d")
+        self.target = array("d")
+        self.running = array("b")
+
+    def __len__(self) -> int:
+        """Return the number of devices sampled."""
+        return len(self.names)
+
+    def append(
+        self,
+        name: str,
+        humidity: float | None,
+        target: float | None,
+        running: bool,
+    ) -> None:
+        """Add the sample of a device; missing values are stored as NaN."""
+        self.names.append(name)
+        self.humidity.append(NAN if humidity is None else humidity)
+        self.target.append(NAN if target is None else target)
+        self.running.append(running)
+
+
+def compute_fleet_aggregate(
+    samples: FleetSamples,
+    percentiles: Sequence[int] = FLEET_PERCENTILES,
+    outliers: int = FLEET_OUTLIERS,
+) -> FleetAggregate:
+    """Reduce the samples to fleet statistics."""
+    if (numpy := numpy_module()) is not None:
+        return _compute_numpy(numpy, samples, percentiles, outliers)
+    return _compute_python(samples, percentiles, outliers)
+
+
+def _compute_numpy(
+    np: ModuleType,
+    samples: FleetSamples,
+    percentiles: Sequence[int],
+    outliers: int,
+) -> FleetAggregate:
+    humidity = np.frombuffer(samples.humidity, dtype=np.float64)
+    target = np.frombuffer(samples.target, dtype=np.float64)
+    running = np.frombuffer(samples.running, dtype=np.int8).astype(bool)
+
+    reported = humidity[~np.isnan(humidity)]
+    stats: dict = {}
+    if reported.size:
+        stats = {
+            "humidity_mean": float(reported.mean()),
+            "humidity_min": float(reported.min()),
+            "humidity_max": float(reported.max()),
+            "percentiles": dict(
+                zip(
+                    percentiles,
+                    (float(value) for value in np.percentile(reported, percentiles)),
+                    strict=True,
+                )
+            ),
+        }
+
+    deviation = humidity - target
+    candidates = np.flatnonzero(running & ~np.isnan(deviation))
+    order = np.argsort(-np.abs(deviation[candidates]), kind="stable")[:outliers]
+
+    return FleetAggregate(
+        devices=len(samples),
+        reporting=int(reported.size),
+        running=int(running.sum()),
+        off_target=[
+            (samples.names[index], float(deviation[index]))
+            for index in candidates[order]
+        ],
+        **stats,
+    )
+
+
+def _compute_python(
+    samples: FleetSamples,
+    percentiles: Sequence[int],
+    outliers: int,
+) -> FleetAggregate:
+    reported = sorted(value for value in samples.humidity if not math.isnan(value))
+    stats: dict = {}
+    if reported:
+        stats = {
+            "humidity_mean": math.fsum(reported) / len(reported),
+            "humidity_min": reported[0],
+            "humidity_max": reported[-1],
+            "percentiles": {
+                percentile: percentile_of(reported, percentile)
+                for percentile in percentiles
+            },
+        }
+
+    deviations = [
+        (name, humidity - target)
+        for name, humidity, target, running in zip(
+            samples.names, samples.humidity, samples.target, samples.running
+        )
+        if running and not math.isnan(humidity - target)
+    ]
+    deviations.sort(key=lambda item: -abs(item[1]))
+
+    return FleetAggregate(
+        devices=len(samples),
+        reporting=len(reported),
+        running=sum(samples.running),
+        off_target=deviations[:outliers],
+        **stats,
+    )
+
+
+def percentile_of(ordered: list[float], percentile: float) -> float:
+    """Return the percentile of sorted values with linear interpolation."""
+    rank = percentile / 100 * (len(ordered) - 1)
+    lower = math.floor(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
@@ -3,28 +3,88 @@
 from __future__ import annotations
 
 from collections.abc import Mapping
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
-from winix import auth
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-
-from .const import LOGGER, WINIX_AUTH_RESPONSE, WINIX_DOMAIN, WINIX_NAME
+from homeassistant.helpers import aiohttp_client
+
+from .const import (
+    CONF_DEBOUNCE,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_CONCURRENCY,
+    CONF_RECORD_TRAFFIC,
+    CONF_REGION,
+    CONF_REQUEST_TIMEOUT,
+    CONF_TELEMETRY,
+    CONNECTION_LIMIT,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    LOGGER,
+    REGION_AUTO,
+    WINIX_AUTH_RESPONSE,
+    WINIX_DOMAIN,
+    WINIX_NAME,
+)
+from .core.endpoints import DEFAULT_ENDPOINT, REGIONS
+from .endpoints import async_resolve_endpoint
 from .helpers import Helpers, WinixException
 
+if TYPE_CHECKING:
+    from winix import auth
+
 REAUTH_SCHEMA = vol.Schema({vol.Required(CONF_PASSWORD): str})
 
 AUTH_DATA_SCHEMA = vol.Schema(
     {
         vol.Required(CONF_USERNAME): str,
         vol.Required(CONF_PASSWORD): str,
+        vol.Optional(CONF_REGION, default=REGION_AUTO): vol.In(
+            [REGION_AUTO, *REGIONS]
+        ),
     }
 )
 
 
+def build_options_schema(options: Mapping[str, Any]) -> vol.Schema:
+    """Return the options schema with the current options as defaults."""
+    return vol.Schema(
+        {
+            vol.Optional(
+                CONF_SCAN_INTERVAL,
+                default=options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+            ): vol.All(vol.Coerce(int), vol.Range(min=10, max=600)),
+            vol.Optional(
+                CONF_REQUEST_TIMEOUT,
+                default=options.get(CONF_REQUEST_TIMEOUT, DEFAULT_POST_TIMEOUT),
+            ): vol.All(vol.Coerce(float), vol.Range(min=1, max=60)),
+            vol.Optional(
+                CONF_MAX_CONCURRENCY,
+                default=options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=CONNECTION_LIMIT)),
+            vol.Optional(
+                CONF_DEBOUNCE,
+                default=options.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE),
+            ): vol.All(vol.Coerce(float), vol.Range(min=0, max=30)),
+            vol.Optional(
+                CONF_LOOP_WATCHDOG, default=options.get(CONF_LOOP_WATCHDOG, False)
+            ): bool,
+            vol.Optional(
+                CONF_TELEMETRY, default=options.get(CONF_TELEMETRY, False)
+            ): bool,
+            vol.Optional(
+                CONF_RECORD_TRAFFIC, default=options.get(CONF_RECORD_TRAFFIC, False)
+            ): bool,
+        }
+    )
+
+
 class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
     """Config flow handler."""
 
@@ -34,10 +94,46 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
         """Start a config flow."""
         self._reauth_unique_id = None
 
-    async def _validate_input(self, username: str, password: str):
-        """Validate the user input."""
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> WinixOptionsFlow:
+        """Return the options flow."""
+        return WinixOptionsFlow()
+
+    async def _validate_input(
+        self, username: str, password: str, region: str | None = None
+    ):
+        """Validate the user input.
+
+        The auto region is resolved here, once: the fastest region is kept only
+        if it lists the account's devices, otherwise the US region is used. The
+        concrete region is returned for the entry data.
+        """
+        client = aiohttp_client.async_get_clientsession(self.hass)
+        endpoint = await async_resolve_endpoint(client, region)
+
         try:
-            auth_response = await Helpers.async_login(self.hass, username, password)
+            auth_response = await Helpers.async_login(
+                self.hass, username, password, endpoint
+            )
+            if (
+                region == REGION_AUTO
+                and endpoint != DEFAULT_ENDPOINT
+                and not await Helpers.async_validate_endpoint(
+                    client, auth_response.access_token, endpoint
+                )
+            ):
+                LOGGER.info(
+                    "Region %s does not list the account, using %s",
+                    endpoint.region,
+                    DEFAULT_ENDPOINT.region,
+                )
+                endpoint = DEFAULT_ENDPOINT
+                auth_response = await Helpers.async_login(
+                    self.hass, username, password, endpoint
+                )
         except WinixException as err:
             if err.result_code == "UserNotFoundException":
                 return {"errors": {"base": "invalid_user"}, WINIX_AUTH_RESPONSE: None}
@@ -49,7 +145,11 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
                 WINIX_AUTH_RESPONSE: None,
             }
         else:
-            return {"errors": None, WINIX_AUTH_RESPONSE: auth_response}
+            return {
+                "errors": None,
+                WINIX_AUTH_RESPONSE: auth_response,
+                CONF_REGION: endpoint.region,
+            }
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -60,7 +160,7 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
         if user_input is not None:
             username = user_input[CONF_USERNAME]
             errors_and_auth = await self._validate_input(
-                username, user_input[CONF_PASSWORD]
+                username, user_input[CONF_PASSWORD], user_input.get(CONF_REGION)
             )
             errors = errors_and_auth["errors"]
             if not errors:
@@ -71,7 +171,11 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
                 self._abort_if_unique_id_configured()
                 return self.async_create_entry(
                     title=WINIX_NAME,
-                    data={**user_input, WINIX_AUTH_RESPONSE: auth_response},
+                    data={
+                        **user_input,
+                        CONF_REGION: errors_and_auth[CONF_REGION],
+                        WINIX_AUTH_RESPONSE: auth_response,
+                    },
                 )
 
         return self.async_show_form(
@@ -93,7 +197,9 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
         username = existing_entry.data[CONF_USERNAME]
         if user_input is not None:
             password = user_input[CONF_PASSWORD]
-            errors_and_auth = await self._validate_input(username, password)
+            errors_and_auth = await self._validate_input(
+                username, password, existing_entry.data.get(CONF_REGION)
+            )
             errors = errors_and_auth["errors"]
             if not errors:
                 auth_response = errors_and_auth[WINIX_AUTH_RESPONSE]
@@ -102,6 +208,7 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
                     data={
                         **existing_entry.data,
                         CONF_PASSWORD: password,
+                        CONF_REGION: errors_and_auth[CONF_REGION],
                         WINIX_AUTH_RESPONSE: auth_response,
                     },
                 )
@@ -114,3 +221,19 @@ class WinixFlowHandler(config_entries.ConfigFlow, domain=WINIX_DOMAIN):
             data_schema=REAUTH_SCHEMA,
             errors=errors,
         )
+
+
+class WinixOptionsFlow(config_entries.OptionsFlow):
+    """Tune polling and instrumentation of a running entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Show and save the options; the manager picks them up live."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        return self.async_show_form(
+            step_id="init",
+            data_schema=build_options_schema(self.config_entry.options),
+        )
@@ -0,0 +1,160 @@
+"""Detection of a lost connection to the Winix cloud."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Coroutine
+import time
+from typing import Any
+
+from .const import (
+    CONNECTIVITY_FAILURE_THRESHOLD,
+    CONNECTIVITY_PROBE_INTERVAL,
+    CONNECTIVITY_PROBE_MAX_INTERVAL,
+    LOGGER,
+)
+
+Command = Callable[[], Awaitable[None]]
+Probe = Callable[[], Awaitable[object | None]]
+TaskFactory = Callable[[Coroutine[Any, Any, None], str], asyncio.Task]
+
+PROBE_TASK_NAME = "winix connectivity probe"
+
+
+class ConnectivitySupervisor:
+    """Pause all Winix traffic while the cloud is unreachable.
+
+    Every request of the shared session reports its outcome through trace
+    hooks. After `failure_threshold` consecutive transport failures, with no
+    response of any kind in between, the supervisor goes offline: polling
+    stops, and instead a single probe request is sent with exponential back
+    off. When the probe is answered, commands queued while offline are sent
+    (the last one per device and attribute) and listeners are told to resume.
+    """
+
+    def __init__(
+        self,
+        probe: Probe | None = None,
+        failure_threshold: int = CONNECTIVITY_FAILURE_THRESHOLD,
+        probe_interval: float = CONNECTIVITY_PROBE_INTERVAL,
+        probe_max_interval: float = CONNECTIVITY_PROBE_MAX_INTERVAL,
+    ) -> None:
+        """Create a supervisor; probe returns None while unreachable."""
+        self.probe = probe
+        # Starts the probe task; the owner sets it so the task is tracked and
+        # cancelled with the config entry
+        self.create_task: TaskFactory | None = None
+        self.failure_threshold = failure_threshold
+        self.probe_interval = probe_interval
+        self.probe_max_interval = probe_max_interval
+
+        self.online = True
+        self.offline_since: float | None = None
+        self.outages = 0
+        self._failures = 0
+        self._queued: dict[tuple[str, str], Command] = {}
+        self._listeners: list[Callable[[bool], None]] = []
+        self._probe_task: asyncio.Task | None = None
+
+    @property
+    def queued_commands(self) -> int:
+        """Return the number of commands waiting for the connection."""
+        return len(self._queued)
+
+    def add_listener(self, listener: Callable[[bool], None]) -> Callable[[], None]:
+        """Call listener with the new state when going offline or online."""
+        self._listeners.append(listener)
+        return lambda: self._listeners.remove(listener)
+
+    def record_success(self) -> None:
+        """Record a response; the network is up even if the request failed."""
+        self._failures = 0
+
+    def record_failure(self) -> None:
+        """Record a transport failure and go offline when they add up."""
+        self._failures += 1
+        if self.online and self._failures >= self.failure_threshold:
+            self._set_offline()
+
+    def queue(self, key: tuple[str, str], command: Command) -> None:
+        """Hold a command until the connection is back, replacing an older one."""
+        self._queued.pop(key, None)
+        self._queued[key] = command
+        LOGGER.debug("Queued command %s until the Winix cloud is reachable", key)
+
+    def _set_offline(self) -> None:
+        LOGGER.warning(
+            "Winix cloud unreachable after %d failed requests, pausing polling",
+            self._failures,
+        )
+        self.online = False
+        self.offline_since = time.monotonic()
+        self.outages += 1
+        self._notify()
+
+        if self.probe is not None and self._probe_task is None:
+            probe = self._async_probe_until_online()
+            if self.create_task is None:
+                self._probe_task = asyncio.get_running_loop().create_task(
+                    probe, name=PROBE_TASK_NAME
+                )
+            else:
+                self._probe_task = self.create_task(probe, PROBE_TASK_NAME)
+
+    async def _async_probe_until_online(self) -> None:
+        interval = self.probe_interval
+        try:
+            while True:
+                await asyncio.sleep(interval)
+                try:
+                    if await self.probe() is not None:
+                        break
+                except Exception as err:  # pylint: disable=broad-except
+                    # Any failure means still unreachable; keep backing off
+                    LOGGER.debug("Winix cloud probe failed: %s", err)
+                interval = min(self.probe_max_interval, interval * 2)
+                LOGGER.debug(
+                    "Winix cloud still unreachable, next probe in %ss", interval
+                )
+        finally:
+            self._probe_task = None
+
+        await self._async_set_online()
+
+    async def _async_set_online(self) -> None:
+        LOGGER.warning(
+            "Winix cloud reachable again after %.0fs, resuming polling",
+            time.monotonic() - (self.offline_since or time.monotonic()),
+        )
+        self.online = True
+        self.offline_since = None
+        self._failures = 0
+
+        queued, self._queued = self._queued, {}
+        for key, command in queued.items():
+            try:
+                await command()
+            except Exception as err:  # pylint: disable=broad-except
+                LOGGER.warning("Queued command %s failed: %s", key, err)
+
+        self._notify()
+
+    def _notify(self) -> None:
+        for listener in list(self._listeners):
+            listener(self.online)
+
+    async def async_close(self) -> None:
+        """Stop probing and drop queued commands."""
+        self._queued.clear()
+        if self._probe_task is not None:
+            self._probe_task.cancel()
+            self._probe_task = None
+
+    def as_dict(self) -> dict[str, object]:
+        """Return the state for diagnostics."""
+        return {
+            "online": self.online,
+            "outages": self.outages,
+            "consecutive_failures": self._failures,
+            "queued_commands": self.queued_commands,
+        }
@@ -4,7 +4,16 @@ from enum import Enum, unique
 import logging
 from typing import Final
 
-__min_ha_version__ = "2024.8"
+# 프로토콜 상수는 core에 있고 여기서 다시 내보냄
+from .core.const import (  # noqa: F401
+    CONNECT_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_FILTER_ALARM_DURATION,
+    DEFAULT_POST_TIMEOUT,
+)
+
+__min_ha_version__ = "2024.11"
 
 LOGGER = logging.getLogger(__package__)
 
@@ -15,6 +24,38 @@ WINIX_DATA_KEY: Final = "winix_dehumidifier"
 WINIX_DATA_COORDINATOR: Final = "coordinator"
 WINIX_AUTH_RESPONSE: Final = "WinixAuthResponse"
 WINIX_ACCESS_TOKEN_EXPIRATION: Final = "access_token_expiration"
+ACCESS_TOKEN_LIFETIME: Final = 60 * 60  # 초, Cognito 기본값
+ACCESS_TOKEN_REFRESH_MARGIN: Final = 5 * 60  # 만료 전에 미리 갱신 (초)
+
+# 900: 다른 곳에서 같은 계정으로 로그인함, 400: 유효하지 않은 사용자
+AUTH_RESULT_CODES: Final = ("900", "400")
+
+# 서버 지역 선택 (auto: 설정 시 지연 시간 측정으로 결정)
+CONF_REGION: Final = "region"
+REGION_AUTO: Final = "auto"
+
+# 옵션: 재로드 없이 실행 중인 매니저에 바로 적용
+CONF_REQUEST_TIMEOUT: Final = "request_timeout"  # 요청당 타임아웃 (초)
+CONF_MAX_CONCURRENCY: Final = "max_concurrency"  # 동시에 진행하는 장치 폴링 수
+CONF_DEBOUNCE: Final = "debounce"  # 같은 장치 상태 요청을 묶는 시간 (초)
+DEFAULT_SCAN_INTERVAL: Final = 30
+
+# 이벤트 루프 지연 감시 (옵션, 기본 비활성)
+CONF_LOOP_WATCHDOG: Final = "loop_watchdog"
+
+# 클라우드 통신 기록 (옵션, 기본 비활성, 변경 시 재로드). 설정 폴더에 gzip JSON lines 로 저장
+CONF_RECORD_TRAFFIC: Final = "record_traffic"
+TRAFFIC_CAPTURE_FILE: Final = "winix_traffic_{}.jsonl.gz"
+TRAFFIC_FLUSH_INTERVAL: Final = 60  # 초
+TRAFFIC_CAPTURE_MAX_BYTES: Final = 10 * 1024 * 1024  # 넘으면 .1 파일로 교체
+
+# 폴링 텔레메트리 (옵션, 기본 비활성). 설정 폴더에 고정 길이 바이너리 레코드로 저장
+CONF_TELEMETRY: Final = "telemetry"
+TELEMETRY_DIR: Final = "winix_telemetry_{}"
+TELEMETRY_FILE_RECORDS: Final = 1_000_000  # 파일당 레코드 수 (약 20MB)
+TELEMETRY_MAX_FILES: Final = 12  # 넘으면 가장 오래된 파일 삭제
+TELEMETRY_FLUSH_INTERVAL: Final = 60  # 초
+TELEMETRY_PERCENTILES: Final = (50, 90, 99)
 
 # 제습기 관련 속성 추가
 ATTR_HUMIDITY: Final = "current_humidity"  # 현재 습도
@@ -26,8 +67,47 @@ ATTR_TIMER: Final = "timer"  # 타이머 설정
 ATTR_CHILD_LOCK: Final = "child_lock"  # 차일드락 기능
 ATTR_UV_STERILIZATION: Final = "uv_sterilization"  # UV 살균 기능
 
+# 속성 기록 정책: 엔티티 속성으로 노출할지, 레코더에 기록할지 결정
+ATTRIBUTE_POLICY_NATIVE: Final = "native"  # 엔티티 고유 속성(state, mode, humidity)으로 이미 노출됨
+ATTRIBUTE_POLICY_STABLE: Final = "stable"  # 자주 바뀌지 않으므로 추가 속성으로 노출
+ATTRIBUTE_POLICY_VOLATILE: Final = "volatile"  # 전용 센서로 노출하고 레코더에는 기록하지 않음
+
+HUMIDIFIER_ATTRIBUTE_POLICY: Final = {
+    ATTR_POWER: ATTRIBUTE_POLICY_NATIVE,
+    ATTR_MODE: ATTRIBUTE_POLICY_NATIVE,
+    ATTR_TARGET_HUMIDITY: ATTRIBUTE_POLICY_NATIVE,
+    ATTR_FAN_SPEED: ATTRIBUTE_POLICY_STABLE,
+    ATTR_CHILD_LOCK: ATTRIBUTE_POLICY_STABLE,
+    ATTR_UV_STERILIZATION: ATTRIBUTE_POLICY_STABLE,
+    ATTR_HUMIDITY: ATTRIBUTE_POLICY_VOLATILE,
+    ATTR_TIMER: ATTRIBUTE_POLICY_VOLATILE,
+}
+
 SENSOR_HUMIDITY: Final = "humidity"
 SENSOR_TARGET_HUMIDITY: Final = "target_humidity"
+SENSOR_TIMER: Final = "timer"
+SENSOR_DRYING_RATE: Final = "drying_rate"
+SENSOR_TIME_TO_TARGET: Final = "time_to_target"
+SENSOR_HUMIDITY_MIN: Final = "humidity_min"
+SENSOR_HUMIDITY_MAX: Final = "humidity_max"
+SENSOR_HUMIDITY_MEAN: Final = "humidity_mean"
+SENSOR_HUMIDITY_ESTIMATE: Final = "humidity_estimate"
+SENSOR_FILTER_USAGE_HOURS: Final = "filter_usage_hours"
+SENSOR_OPERATING_HOURS: Final = "operating_hours"
+SENSOR_FILTER_LIFE: Final = "filter_life"
+SENSOR_LOOP_LAG: Final = "loop_lag"
+SENSOR_RAW: Final = "raw"  # 프로파일에 없는 속성 코드 (기본 비활성)
+SENSOR_FLEET_HUMIDITY_MEAN: Final = "fleet_humidity_mean"
+SENSOR_FLEET_HUMIDITY_MIN: Final = "fleet_humidity_min"
+SENSOR_FLEET_HUMIDITY_MAX: Final = "fleet_humidity_max"
+SENSOR_FLEET_HUMIDITY_P50: Final = "fleet_humidity_p50"
+SENSOR_FLEET_HUMIDITY_P90: Final = "fleet_humidity_p90"
+SENSOR_FLEET_RUNNING: Final = "fleet_running"
+SENSOR_FLEET_OFF_TARGET: Final = "fleet_off_target"
+
+# PARAM_URL 에서 가져오는 장치 파라미터
+PARAM_FILTER_USAGE_HOURS: Final = "filter_usage_hours"
+PARAM_OPERATING_HOURS: Final = "operating_hours"
 
 OFF_VALUE: Final = "off"
 ON_VALUE: Final = "on"
@@ -40,6 +120,7 @@ SERVICE_SET_TIMER: Final = "set_timer"  # 타이머 설정
 SERVICE_CHILD_LOCK: Final = "set_child_lock"  # 차일드락 기능 ON/OFF
 SERVICE_UV_STERILIZATION: Final = "set_uv_sterilization"  # UV 살균 기능 ON/OFF
 SERVICE_REMOVE_STALE_ENTITIES: Final = "remove_stale_entities"  # 불필요한 엔티티 제거
+ATTR_DRY_RUN: Final = "dry_run"  # 삭제하지 않고 대상만 보고
 
 HUMIDIFIER_SERVICES: Final = [
     SERVICE_SET_HUMIDITY,
@@ -88,8 +169,51 @@ PRESET_MODE_LABELS: Final = {
     MODE_CONTINUOUS: "연속",
 }
 
-# 네트워크 요청 타임아웃
-DEFAULT_POST_TIMEOUT: Final = 10
+# 장치별 습도 기록 샘플 수 (30초 폴링 기준 2시간)
+HUMIDITY_HISTORY_SIZE: Final = 240
+
+# 폴링 사이 값 추정 (타이머는 시간 단위로 보고됨)
+TIMER_MINUTES_PER_UNIT: Final = 60
+HUMIDITY_EXTRAPOLATION_LIMIT: Final = 3  # 마지막 측정값에서 최대 ±3%까지만 추정
+PREDICTION_REFRESH_INTERVAL: Final = 60  # 초
+
+# 장치 파라미터는 상태보다 훨씬 드물게 갱신 (초)
+PARAM_REFRESH_INTERVAL: Final = 6 * 60 * 60
+
+# 장치 목록 재검색 주기 (초), 새 장치는 재로드 없이 추가됨
+DISCOVERY_INTERVAL: Final = 15 * 60
+SIGNAL_DEVICES_ADDED: Final = "winix_devices_added_{}"
+
+# 장치 폴링을 스캔 주기 안에서 분산 (주기의 비율, 초)
+POLL_SPREAD: Final = 0.5
+POLL_JITTER: Final = 1.0
+
+# 폴링 주기 마감: 주기의 90% 안에 응답하지 않은 장치는 지연으로 표시하고
+# 요청은 다음 주기로 넘김 (최대 1주기, 이후 취소)
+CYCLE_DEADLINE_RATIO: Final = 0.9
+CYCLE_MAX_CARRIED: Final = 1
+
+# 전체 장치 집계: 습도 백분위수와 목표에서 가장 먼 장치 수
+FLEET_PERCENTILES: Final = (50, 90)
+FLEET_OUTLIERS: Final = 3
+
+# 실패한 장치의 최대 재시도 대기 시간 (초)
+DEVICE_BACKOFF_MAX: Final = 10 * 60
+
+# 연결 끊김 감지: 연속 전송 실패 횟수, 이후 단일 요청으로 재시도 (초, 지수 증가)
+CONNECTIVITY_FAILURE_THRESHOLD: Final = 3
+CONNECTIVITY_PROBE_INTERVAL: Final = 5
+CONNECTIVITY_PROBE_MAX_INTERVAL: Final = 5 * 60
+
+# 이벤트 루프 지연 측정 간격과 경고 임계값 (초)
+LOOP_LAG_INTERVAL: Final = 0.05
+LOOP_LAG_THRESHOLD: Final = 0.1
+
+# Winix 전용 연결 풀 설정
+CONNECTION_LIMIT: Final = 32
+DEFAULT_MAX_CONCURRENCY: Final = CONNECTION_LIMIT_PER_HOST
+KEEPALIVE_TIMEOUT: Final = 60  # 30초 폴링 사이에 연결 유지
+DNS_CACHE_TTL: Final = 300
 
-# 필터 알람 기본값 (개월)
-DEFAULT_FILTER_ALARM_DURATION: Final = 9
+# 필터 알람 정보는 하루 동안 캐시 (초)
+FILTER_ALARM_CACHE_TTL: Final = 24 * 60 * 60
@@ -0,0 +1,17 @@
+"""Winix cloud protocol layer.
+
+Nothing in this package imports Home Assistant or the integration modules
+around it. Heavy dependencies (pycryptodome, requests and the winix/boto3
+login library) are imported on first use, so loading the driver or the models
+stays cheap.
+
+- driver: per-device REST API (state, params, commands)
+- capabilities: per-model profiles compiled from profiles/*.json
+- codec: AES payload encoding used by the mobile RPC
+- mobile: mobile app RPC (login, device list, filter alarm)
+- endpoints: regional base URLs of the cloud
+- cache: TTLCache shared by the driver and the integration
+- const: protocol constants such as request timeouts
+- models: device stubs
+- exceptions: WinixException
+"""
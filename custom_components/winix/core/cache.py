@@ -0,0 +1,101 @@
+"""Time-based caching for Winix cloud data."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import time
+from typing import Generic, TypeVar
+
+_K = TypeVar("_K")
+_V = TypeVar("_V")
+
+
+class TTLCache(Generic[_K, _V]):
+    """Cache whose entries expire `ttl` seconds after they were stored.
+
+    Concurrent `async_get` calls for the same missing key share a single load.
+    A load that is still running when its key is invalidated is not stored.
+    """
+
+    def __init__(
+        self, ttl: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        """Create an empty cache."""
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: dict[_K, tuple[float, _V]] = {}
+        self._pending: dict[_K, asyncio.Future[_V]] = {}
+        # Bumped by invalidate so loads started before it are discarded
+        self._generations: dict[_K, int] = {}
+
+    def __contains__(self, key: _K) -> bool:
+        """Return True if key holds a value that has not expired."""
+        return self.is_fresh(key)
+
+    def is_fresh(self, key: _K) -> bool:
+        """Return True if key holds a value that has not expired."""
+        entry = self._entries.get(key)
+        return entry is not None and self._clock() - entry[0] < self.ttl
+
+    def get(self, key: _K, default: _V | None = None) -> _V | None:
+        """Return the value for key, even if it has expired."""
+        entry = self._entries.get(key)
+        return default if entry is None else entry[1]
+
+    def set(self, key: _K, value: _V) -> None:
+        """Store a value for key."""
+        self._entries[key] = (self._clock(), value)
+
+    def invalidate(self, key: _K | None = None) -> None:
+        """Expire one key, or every key if none is given."""
+        keys = list(self._pending) if key is None else [key]
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+
+        for pending_key in keys:
+            self._generations[pending_key] = self._generations.get(pending_key, 0) + 1
+            # Later callers start a fresh load instead of joining this one
+            self._pending.pop(pending_key, None)
+
+    async def async_get(self, key: _K, loader: Callable[[], Awaitable[_V]]) -> _V:
+        """Return the value for key, loading it if missing or expired.
+
+        Raises whatever loader raises; the previous value is kept in that case.
+        If the caller running a shared load is cancelled, a waiting caller
+        starts the load again instead of being cancelled with it.
+        """
+        while (pending := self._pending.get(key)) is not None:
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if not pending.cancelled() or (task and task.cancelling()):
+                    raise
+
+        if self.is_fresh(key):
+            return self._entries[key][1]
+
+        generation = self._generations.get(key, 0)
+        future: asyncio.Future[_V] = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            value = await loader()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as err:
+            future.set_exception(err)
+            # Mark retrieved so a failed load without waiters is not reported
+            future.exception()
+            raise
+        else:
+            if self._generations.get(key, 0) == generation:
+                self.set(key, value)
+            future.set_result(value)
+            return value
+        finally:
+            if self._pending.get(key) is future:
+                del self._pending[key]
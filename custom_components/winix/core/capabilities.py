@@ -0,0 +1,313 @@
+"""Per-model capability profiles.
+
+A profile lists the attributes a model supports, their payload codes and
+their allowed values or numeric range. Profiles are JSON files in the
+profiles directory and are compiled once when this module is loaded:
+
+    {
+      "extends": "default",          # optional, inherit and override
+      "models": ["DXJH120"],         # values of MyWinixDeviceStub.model
+      "attributes": {
+        "mode": {"code": "D03", "values": {"auto": "01"}},
+        "target_humidity": {"code": "D05", "range": [35, 70, 5]},
+        "current_humidity": {"code": "D10", "read_only": true}
+      },
+      "params": {"filter_usage_hours": "D21"}
+    }
+
+Models without a profile of their own use default.json. Attributes with
+"lazy": true are left out of the decoded state and only decoded when read through
+RawAttributes, like codes no profile knows.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+import json
+import logging
+from pathlib import Path
+from typing import Any
+
+from .exceptions import WinixException
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILES_DIR = Path(__file__).parent / "profiles"
+DEFAULT_PROFILE_NAME = "default"
+
+ON_OFF_VALUES = {True: "on", False: "off"}
+
+
+class InvalidCommand(WinixException):
+    """A command the device model does not support."""
+
+    def __init__(self, message: str) -> None:
+        """Create an instance for message."""
+        super().__init__({"message": message})
+
+
+@dataclass(frozen=True, slots=True)
+class AttributeSpec:
+    """Payload code and allowed values of one attribute."""
+
+    name: str
+    code: str
+    values: Mapping[str, str] | None = None
+    range: tuple[int, int, int] | None = None
+    read_only: bool = False
+    lazy: bool = False
+
+
+def _to_int(raw: Any) -> int | None:
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+class ModelProfile:
+    """Compiled capability profile of a device model."""
+
+    def __init__(
+        self,
+        name: str,
+        attributes: Mapping[str, AttributeSpec],
+        params: Mapping[str, str],
+    ) -> None:
+        """Compile the payload decoders of a profile."""
+        self.name = name
+        self.attributes = dict(attributes)
+        self.params = dict(params)
+
+        # Payload code -> (attribute, converter); a converter returns None for
+        # values the profile does not know. Lazy attributes are not decoded
+        # into the state.
+        self._decoders: dict[str, tuple[str, Callable[[Any], Any]]] = {}
+        for spec in self.attributes.values():
+            if spec.values is not None:
+                reverse = {code: value for value, code in spec.values.items()}
+                self._decoders[spec.code] = (spec.name, reverse.get)
+            else:
+                self._decoders[spec.code] = (spec.name, _to_int)
+        self._eager_decoders = {
+            spec.code: self._decoders[spec.code]
+            for spec in self.attributes.values()
+            if not spec.lazy
+        }
+
+    def __repr__(self) -> str:
+        """Return the profile name."""
+        return f"ModelProfile({self.name!r})"
+
+    def supports(self, name: str) -> bool:
+        """Return True if the model has the attribute."""
+        return name in self.attributes
+
+    def options(self, name: str) -> list[str]:
+        """Return the allowed values of an enumerated attribute."""
+        spec = self.attributes.get(name)
+        if spec is None or spec.values is None:
+            return []
+        return list(spec.values)
+
+    def range(self, name: str) -> tuple[int, int, int] | None:
+        """Return the (minimum, maximum, step) of a numeric attribute."""
+        spec = self.attributes.get(name)
+        return None if spec is None else spec.range
+
+    def decode(self, payload: Mapping[str, Any]) -> dict[str, Any]:
+        """Decode a state payload; unknown codes and values are dropped."""
+        decoders = self._eager_decoders
+        output: dict[str, Any] = {}
+        for code, raw in payload.items():
+            decoder = decoders.get(code)
+            if decoder is None:
+                continue
+
+            name, convert = decoder
+            value = convert(raw)
+            if value is not None:
+                output[name] = value
+
+        return output
+
+    def knows(self, code: str) -> bool:
+        """Return True if the payload code belongs to an attribute."""
+        return code in self._decoders
+
+    def decode_value(self, code: str, raw: Any) -> Any:
+        """Decode a single payload value.
+
+        Codes the profile does not know decode to an int when numeric and are
+        returned as is otherwise.
+        """
+        if (decoder := self._decoders.get(code)) is not None:
+            return decoder[1](raw)
+
+        number = _to_int(raw)
+        return raw if number is None else number
+
+    def decode_params(self, payload: Mapping[str, Any]) -> dict[str, int]:
+        """Decode a parameter payload of integer counters."""
+        output: dict[str, int] = {}
+        for name, code in self.params.items():
+            value = _to_int(payload.get(code))
+            if value is not None:
+                output[name] = value
+            elif code in payload:
+                _LOGGER.debug("Ignoring non-numeric param %s=%s", code, payload[code])
+
+        return output
+
+    def encode(self, name: str, value: Any) -> tuple[str, str]:
+        """Return the (code, value) of a command.
+
+        Raises InvalidCommand if the model does not accept it.
+        """
+        spec = self.attributes.get(name)
+        if spec is None or spec.read_only:
+            raise InvalidCommand(f"{name} is not supported by profile {self.name}")
+
+        if spec.values is not None:
+            key = ON_OFF_VALUES.get(value, value) if isinstance(value, bool) else value
+            code = spec.values.get(key)
+            if code is None:
+                raise InvalidCommand(
+                    f"Invalid {name} {value!r}, "
+                    f"expected one of {', '.join(spec.values)}"
+                )
+            return spec.code, code
+
+        number = _to_int(value)
+        if number is None:
+            raise InvalidCommand(f"Invalid {name} {value!r}, expected a number")
+
+        if spec.range is not None:
+            minimum, maximum, step = spec.range
+            if not minimum <= number <= maximum or (number - minimum) % step:
+                raise InvalidCommand(
+                    f"Invalid {name} {number}, expected {minimum}-{maximum} "
+                    f"in steps of {step}"
+                )
+
+        return spec.code, str(number)
+
+
+def compile_profile(
+    name: str, data: Mapping[str, Any], base: ModelProfile | None = None
+) -> ModelProfile:
+    """Compile the JSON data of a profile on top of an optional base."""
+    attributes = dict(base.attributes) if base else {}
+    for attribute, spec in data.get("attributes", {}).items():
+        if spec is None:  # Removed from the base profile
+            attributes.pop(attribute, None)
+            continue
+
+        attributes[attribute] = AttributeSpec(
+            name=attribute,
+            code=spec["code"],
+            values=spec.get("values"),
+            range=tuple(spec["range"]) if "range" in spec else None,
+            read_only=spec.get("read_only", False),
+            lazy=spec.get("lazy", False),
+        )
+
+    params = {**(base.params if base else {}), **data.get("params", {})}
+    return ModelProfile(name, attributes, params)
+
+
+class RawAttributes(Mapping[str, Any]):
+    """Attribute map of one state payload, keyed by code and decoded on access.
+
+    Decoded values are memoized; the next poll brings a new map.
+    """
+
+    __slots__ = ("_decoded", "_payload", "_profile")
+
+    def __init__(self, profile: ModelProfile, payload: Mapping[str, Any]) -> None:
+        """Wrap the raw payload of a poll."""
+        self._profile = profile
+        self._payload = payload
+        self._decoded: dict[str, Any] = {}
+
+    def __getitem__(self, code: str) -> Any:
+        """Return the decoded value of a code."""
+        try:
+            return self._decoded[code]
+        except KeyError:
+            pass
+
+        value = self._profile.decode_value(code, self._payload[code])
+        self._decoded[code] = value
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the codes of the payload."""
+        return iter(self._payload)
+
+    def __len__(self) -> int:
+        """Return the number of codes in the payload."""
+        return len(self._payload)
+
+    def raw(self) -> Mapping[str, Any]:
+        """Return the undecoded payload."""
+        return self._payload
+
+    def unknown_codes(self) -> list[str]:
+        """Return the codes the profile has no attribute for."""
+        return [code for code in self._payload if not self._profile.knows(code)]
+
+
+class ProfileRegistry:
+    """Compiled profiles, looked up by device model."""
+
+    def __init__(
+        self, profiles: Mapping[str, ModelProfile], models: Mapping[str, str]
+    ) -> None:
+        """Create a registry of named profiles and a model -> name index."""
+        self._profiles = dict(profiles)
+        self._models = dict(models)
+        self.default = self._profiles[DEFAULT_PROFILE_NAME]
+
+    def get(self, model: str | None) -> ModelProfile:
+        """Return the profile of a model, or the default profile."""
+        name = self._models.get(model) if model else None
+        return self._profiles[name] if name else self.default
+
+    @classmethod
+    def from_directory(cls, path: Path) -> ProfileRegistry:
+        """Load and compile all profiles in a directory."""
+        sources = {
+            file.stem: json.loads(file.read_text(encoding="utf-8"))
+            for file in sorted(path.glob("*.json"))
+        }
+        profiles: dict[str, ModelProfile] = {}
+
+        def _compile(name: str, chain: tuple[str, ...] = ()) -> ModelProfile:
+            if name in chain:
+                raise ValueError(f"Profile {name} extends itself")
+            if name not in profiles:
+                data = sources[name]
+                base = data.get("extends")
+                profiles[name] = compile_profile(
+                    name, data, _compile(base, (*chain, name)) if base else None
+                )
+            return profiles[name]
+
+        models: dict[str, str] = {}
+        for name, data in sources.items():
+            _compile(name)
+            for model in data.get("models", []):
+                models[model] = name
+
+        return cls(profiles, models)
+
+
+REGISTRY = ProfileRegistry.from_directory(PROFILES_DIR)
+DEFAULT_PROFILE = REGISTRY.default
+
+
+def get_profile(model: str | None) -> ModelProfile:
+    """Return the capability profile of a device model."""
+    return REGISTRY.get(model)
@@ -0,0 +1,52 @@
+"""AES-256-CBC payload encoding of the Winix mobile RPC.
+
+pycryptodome is imported on the first encrypt/decrypt call.
+"""
+
+from __future__ import annotations
+
+from functools import cache
+import json
+from types import ModuleType
+from typing import Any
+
+# Key and IV used by the Winix mobile app for AES-256-CBC encryption/decryption.
+# See https://github.com/regaw-leinad/winix-api/blob/main/src/account/winix-crypto.ts
+AES_KEY = bytes.fromhex(
+    "84be38f854e320dd4a0a8c7fe0f3a9b84c288445916933fc222465bbd5a518d0"
+)
+AES_IV = bytes.fromhex("dfd55f316e72e97b905f8739005c99a7")
+
+
+@cache
+def _crypto() -> tuple[ModuleType, ModuleType]:
+    """Import the AES cipher and padding helpers."""
+    from Crypto.Cipher import AES
+    from Crypto.Util import Padding
+
+    return AES, Padding
+
+
+def json_loads(text: str | bytes) -> dict[str, Any]:
+    """Safely load JSON from a string and return a dictionary."""
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        return {}
+
+
+def encrypt(payload: dict[str, Any]) -> bytes:
+    """AES-256-CBC encrypt the payload and return the ciphertext."""
+    aes, padding = _crypto()
+    plaintext = json.dumps(payload).encode("utf-8")
+
+    cipher = aes.new(AES_KEY, aes.MODE_CBC, AES_IV)
+    return cipher.encrypt(padding.pad(plaintext, aes.block_size))
+
+
+def decrypt(ciphertext: bytes) -> bytes:
+    """AES-256-CBC decrypt the ciphertext and return the plaintext."""
+    aes, padding = _crypto()
+
+    cipher = aes.new(AES_KEY, aes.MODE_CBC, AES_IV)
+    return padding.unpad(cipher.decrypt(ciphertext), aes.block_size)
@@ -0,0 +1,18 @@
+"""Constants of the Winix cloud protocol."""
+
+from __future__ import annotations
+
+from typing import Final
+
+# 네트워크 요청 타임아웃 (초)
+DEFAULT_POST_TIMEOUT: Final = 10
+CONNECT_TIMEOUT: Final = 5
+
+# 호스트당 동시 연결 수
+CONNECTION_LIMIT_PER_HOST: Final = 8
+
+# 같은 장치 상태 요청을 묶는 기본 시간 (초)
+DEFAULT_DEBOUNCE: Final = 2.0
+
+# 필터 알람 기본값 (개월)
+DEFAULT_FILTER_ALARM_DURATION: Final = 9
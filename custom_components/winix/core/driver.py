@@ -0,0 +1,234 @@
+"""Per-device Winix REST API."""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable
+from contextlib import AbstractContextManager, nullcontext
+import logging
+from typing import TYPE_CHECKING, Any, Protocol
+
+from .cache import TTLCache
+from .capabilities import DEFAULT_PROFILE, ModelProfile, RawAttributes
+from .const import DEFAULT_DEBOUNCE, DEFAULT_POST_TIMEOUT
+from .endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+
+if TYPE_CHECKING:
+    import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandQueue(Protocol):
+    """Holds commands back while the cloud is unreachable."""
+
+    online: bool
+
+    def queue(
+        self, key: tuple[str, str], command: Callable[[], Awaitable[None]]
+    ) -> None:
+        """Send command once the cloud is reachable, replacing one with key."""
+
+STATE_CACHE_TTL = DEFAULT_DEBOUNCE
+
+# Modified from https://github.com/hfern/winix to support async operations
+
+
+class WinixDriver:
+    """WinixDevice driver."""
+
+    # URLs are relative to the api_url of the selected endpoint
+    # pylint: disable=line-too-long
+    CTRL_URL = "{base}/common/control/devices/{deviceid}/A211/{attribute}:{value}"
+    STATE_URL = "{base}/common/event/sttus/devices/{deviceid}"
+    PARAM_URL = "{base}/common/event/param/devices/{deviceid}"
+    CONNECTED_STATUS_URL = "{base}/common/event/connsttus/devices/{deviceid}"
+
+    def __init__(
+        self,
+        device_id: str,
+        client: aiohttp.ClientSession,
+        endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+        profile: ModelProfile = DEFAULT_PROFILE,
+        supervisor: CommandQueue | None = None,
+    ) -> None:
+        """Create an instance of WinixDevice."""
+        self.device_id = device_id
+        self.profile = profile
+        self._supervisor = supervisor
+        self.request_timeout: float = DEFAULT_POST_TIMEOUT
+
+        # Wraps synchronous decoding so a loop lag monitor can time it
+        self.blocking: Callable[[str], AbstractContextManager[Any]] = nullcontext
+
+        # Every attribute of the last state payload, decoded on access
+        self.raw_attributes = RawAttributes(profile, {})
+        # Number of state payloads fetched; unchanged while answered from cache
+        self.state_fetches = 0
+        self._client = client
+        self._base = endpoint.api_url
+
+        # Concurrent get_state callers share one request, and back-to-back
+        # calls within state_cache_ttl are answered from the last result.
+        self._state_cache: TTLCache[str, dict[str, str]] = TTLCache(
+            STATE_CACHE_TTL
+        )
+
+    @property
+    def state_cache_ttl(self) -> float:
+        """Return how long a fetched state answers repeated get_state calls."""
+        return self._state_cache.ttl
+
+    @state_cache_ttl.setter
+    def state_cache_ttl(self, value: float) -> None:
+        self._state_cache.ttl = value
+
+    async def turn_off(self):
+        """Turn the device off."""
+        await self._command("power", "off")
+
+    async def turn_on(self):
+        """Turn the device on."""
+        await self._command("power", "on")
+
+    async def set_mode(self, mode):
+        """Set device mode."""
+        await self._command("mode", mode)
+
+    async def set_fan_speed(self, speed):
+        """Set fan speed."""
+        await self._command("fan_speed", speed)
+
+    async def set_humidity(self, humidity):
+        """Set target humidity."""
+        await self._command("target_humidity", humidity)
+
+    async def set_timer(self, timer):
+        """Set timer."""
+        await self._command("timer", timer)
+
+    async def set_child_lock(self, lock: bool):
+        """Enable or disable child lock."""
+        await self._command("child_lock", lock)
+
+    async def set_uv_sterilization(self, uv: bool):
+        """Enable or disable UV sterilization."""
+        await self._command("uv_sterilization", uv)
+
+    async def _command(self, name: str, value) -> None:
+        """Send a command after validating it against the model profile.
+
+        Raises InvalidCommand without contacting the cloud.
+        """
+        await self._rpc_attr(*self.profile.encode(name, value))
+
+    async def _rpc_attr(self, attr: str, value: str):
+        if self._supervisor is not None and not self._supervisor.online:
+            # Sent once the cloud is reachable again
+            self._supervisor.queue(
+                (self.device_id, attr), lambda: self._send_rpc_attr(attr, value)
+            )
+            return
+
+        await self._send_rpc_attr(attr, value)
+
+    async def _send_rpc_attr(self, attr: str, value: str):
+        _LOGGER.debug("_rpc_attr attribute=%s, value=%s", attr, value)
+        resp = await self._client.get(
+            self.CTRL_URL.format(
+                base=self._base, deviceid=self.device_id, attribute=attr, value=value
+            ),
+            raise_for_status=True,
+            timeout=self.request_timeout,
+        )
+        raw_resp = await resp.text()
+        _LOGGER.debug("_rpc_attr response=%s", raw_resp)
+
+        # The next get_state must observe the command
+        self._state_cache.invalidate(self.device_id)
+
+    async def get_params(self) -> dict[str, int]:
+        """Get device parameters such as usage counters."""
+        if not self.profile.params:
+            return {}
+
+        response = await self._client.get(
+            self.PARAM_URL.format(base=self._base, deviceid=self.device_id),
+            timeout=self.request_timeout,
+        )
+        json = await response.json()
+
+        output: dict[str, int] = {}
+
+        try:
+            _LOGGER.debug("Winix raw param response: %s", json)
+            data = (json.get("body") or {}).get("data")
+            if not data:
+                _LOGGER.debug("Winix API returned no params for device %s", self.device_id)
+                return output
+
+            payload = data[0].get("attributes", {})
+        except Exception as err:  # pylint: disable=broad-except
+            _LOGGER.error(
+                "Error parsing param response json, received %s", json, exc_info=err
+            )
+            return output
+
+        return self.profile.decode_params(payload)
+
+    async def get_state(self) -> dict[str, str]:
+        """Get device state.
+
+        Concurrent calls share a single STATE_URL request.
+        """
+        state = await self._state_cache.async_get(self.device_id, self._fetch_state)
+        return dict(state)
+
+    async def _fetch_state(self) -> dict[str, str]:
+        """Request and decode the device state."""
+        response = await self._client.get(
+            self.STATE_URL.format(base=self._base, deviceid=self.device_id),
+            timeout=self.request_timeout,
+        )
+        json = await response.json()
+        self.state_fetches += 1
+
+        with self.blocking("get_state_decode"):
+            return self._decode_state(json)
+
+    def _decode_state(self, json: dict[str, Any]) -> dict[str, str]:
+        """Decode a state response; runs on the event loop."""
+        output: dict[str, str] = {}
+
+        # Attributes of an earlier poll must not outlive a response without data
+        self.raw_attributes = RawAttributes(self.profile, {})
+
+        # ###-------- Winix 응답 방어 로직 추가 --------###
+        try:
+            _LOGGER.debug("Winix raw state response: %s", json)
+
+            # body 키가 없을 수도 있으므로 get 사용
+            body = json.get("body") or {}
+
+            # data 키가 없거나 빈 리스트일 수 있음
+            data = body.get("data")
+            if not data:
+                # 겨울철 등으로 서버가 'no data' 를 보낼 때 여기로 들어옴
+                _LOGGER.warning(
+                    "Winix API returned no data for device %s: %s",
+                    self.device_id,
+                    json,
+                )
+                return output
+
+            # data[0]에 attributes 키가 없을 수도 있으므로 get 사용
+            payload = data[0].get("attributes", {})
+
+        except Exception as err:  # 예외가 생기더라도 HA 전체가 죽지 않도록 방어
+            _LOGGER.error(
+                "Error parsing response json, received %s", json, exc_info=err
+            )
+            return output
+
+        # 모델 프로파일에서 미리 만든 디코더로 변환, 나머지 코드는 접근 시 변환
+        self.raw_attributes = RawAttributes(self.profile, payload)
+        return self.profile.decode(payload)
@@ -0,0 +1,32 @@
+"""Winix cloud endpoint registry."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+API_URL_TEMPLATE = "https://{region}.api.winix-iot.com"
+MOBILE_URL_TEMPLATE = "https://{region}.mobile.winix-iot.com"
+
+DEFAULT_REGION = "us"
+REGIONS = ("us", "eu", "kr")
+
+
+@dataclass(frozen=True)
+class WinixEndpoint:
+    """Base URLs of the Winix cloud in one region."""
+
+    region: str
+    api_url: str
+    mobile_url: str
+
+    @classmethod
+    def for_region(cls, region: str) -> WinixEndpoint:
+        """Build the endpoint for a region from the URL templates."""
+        return cls(
+            region=region,
+            api_url=API_URL_TEMPLATE.format(region=region),
+            mobile_url=MOBILE_URL_TEMPLATE.format(region=region),
+        )
+
+
+DEFAULT_ENDPOINT = WinixEndpoint.for_region(DEFAULT_REGION)
@@ -0,0 +1,72 @@
+"""Exceptions raised by the Winix protocol layer."""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+
+
+class WinixException(Exception):
+    """Wiinx related operation exception."""
+
+    result_code: str = ""
+    """Error code."""
+    result_message: str = ""
+    """Error code message."""
+
+    def __init__(self, values: dict) -> None:
+        """Create instance of WinixException."""
+
+        if values:
+            super().__init__(values.get("message", "Unknown error"))
+            self.result_code: str = values.get("result_code", "")
+            self.result_message: str = values.get("result_message", "")
+        else:
+            super().__init__("Unknown error")
+
+    @staticmethod
+    def from_winix_exception(err: Exception) -> WinixException:
+        """Build exception for Winix library operation."""
+        return WinixException(WinixException.parse_winix_exception(err))
+
+    @staticmethod
+    def from_aws_exception(err: Exception) -> WinixException:
+        """Build exception for AWS operation."""
+        return WinixException(WinixException.parse_aws_exception(err))
+
+    @staticmethod
+    def parse_winix_exception(err: Exception) -> Mapping[str, str]:
+        """Parse Winix library exception message."""
+
+        message = str(err)
+        if message.find(":") == -1:
+            return {"message": message}
+
+        pcs = message.partition(":")
+        if pcs[0].rfind("(") == -1:
+            return {"message": message}
+
+        pcs2 = pcs[0].rpartition("(")
+        return {
+            "message": message,
+            "result_code": pcs2[2].rstrip(")"),
+            "result_message": pcs[2],
+        }
+
+    @staticmethod
+    def parse_aws_exception(err: Exception) -> Mapping[str, str]:
+        """Parse AWS operation exception."""
+        message = str(err)
+
+        # https://stackoverflow.com/questions/60703127/how-to-catch-botocore-errorfactory-usernotfoundexception
+        try:
+            response = err.response
+            if response:
+                return {
+                    "message": message,
+                    "result_code": response.get("Error", {}).get("Code"),
+                }
+
+        except AttributeError:
+            return {"message": message}
+        else:
+            return None
@@ -0,0 +1,322 @@
+"""Winix mobile app RPC.
+
+Login goes through the winix library (boto3) and the blocking calls use
+requests; both are imported on first use. The asynchronous calls take an
+aiohttp session from the caller.
+"""
+
+from __future__ import annotations
+
+import base64
+from datetime import datetime, timedelta
+from functools import cache
+import json
+from http import HTTPStatus
+import logging
+from typing import TYPE_CHECKING, Any
+
+from . import codec
+from .const import (
+    CONNECT_TIMEOUT,
+    CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_FILTER_ALARM_DURATION,
+    DEFAULT_POST_TIMEOUT,
+)
+from .endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+from .exceptions import WinixException
+from .models import MyWinixDeviceStub
+
+if TYPE_CHECKING:
+    import aiohttp
+    import requests
+    from winix import auth
+
+_LOGGER = logging.getLogger(__name__)
+
+HEADERS = {
+    "Content-Type": "application/octet-stream",
+    "Accept": "application/octet-stream",
+}
+
+
+@cache
+def _http_session() -> requests.Session:
+    """Return the pooled session shared by the blocking calls."""
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_maxsize=CONNECTION_LIMIT_PER_HOST))
+    return session
+
+
+def _mobile_app_metadata() -> dict[str, str]:
+    """Return the metadata the current mobile app sends along."""
+    from winix import auth
+
+    return {
+        "cognitoClientSecretKey": auth.COGNITO_CLIENT_SECRET_KEY,
+        "osType": "android",
+        "osVersion": "29",
+        "mobileLang": "en",
+        "appVersion": "1.5.6",
+        "mobileModel": "SM-G988B",
+    }
+
+
+def build_mobile_app_payload(
+    access_token: str, uuid: str, **kwargs: Any
+) -> dict[str, str]:
+    """Build a payload that matches the current mobile app metadata."""
+
+    return {
+        "accessToken": access_token,
+        "uuid": uuid,
+        **_mobile_app_metadata(),
+        **kwargs,
+    }
+
+
+def parse_auth_response(data: Any) -> auth.WinixAuthResponse:
+    """Return the auth response stored in a config entry."""
+    from winix import auth
+
+    if isinstance(data, auth.WinixAuthResponse):
+        return data
+    return auth.WinixAuthResponse(**data)
+
+
+def access_token_expiry(access_token: str) -> float | None:
+    """Return the expiry of a Cognito access token as unix time.
+
+    Reads the exp claim without verifying the token; None if it has none.
+    """
+    try:
+        payload = access_token.split(".")[1]
+        padded = payload + "=" * (-len(payload) % 4)
+        claims = json.loads(base64.urlsafe_b64decode(padded))
+        return float(claims["exp"])
+    except (IndexError, KeyError, TypeError, ValueError):
+        return None
+
+
+def get_uuid(access_token: str) -> str:
+    """Return the mobile identity derived from the access token."""
+    from winix import WinixAccount
+
+    return WinixAccount(access_token).get_uuid()
+
+
+def login(
+    username: str, password: str, endpoint: WinixEndpoint = DEFAULT_ENDPOINT
+) -> auth.WinixAuthResponse:
+    """Log in synchronously.
+
+    Raises WinixException.
+    """
+    from winix import auth
+
+    try:
+        response = auth.login(username, password)
+    except Exception as err:  # pylint: disable=broad-except
+        raise WinixException.from_aws_exception(err) from err
+
+    access_token = response.access_token
+    uuid = get_uuid(access_token)
+
+    try:
+        register_user(access_token, uuid, username, endpoint)
+        check_access_token(access_token, uuid, endpoint)
+    except Exception as err:  # pylint: disable=broad-except
+        raise WinixException.from_winix_exception(err) from err
+
+    expires_at = (datetime.now() + timedelta(seconds=3600)).timestamp()
+    _LOGGER.debug("Login successful, token expires %d", expires_at)
+    return response
+
+
+def refresh_auth(
+    response: auth.WinixAuthResponse, endpoint: WinixEndpoint = DEFAULT_ENDPOINT
+) -> auth.WinixAuthResponse:
+    """Refresh authentication synchronously.
+
+    Raises WinixException.
+    """
+    from winix import auth
+
+    _LOGGER.debug("Attempting re-authentication")
+
+    try:
+        reponse = auth.refresh(
+            user_id=response.user_id, refresh_token=response.refresh_token
+        )
+    except Exception as err:  # pylint: disable=broad-except
+        raise WinixException.from_aws_exception(err) from err
+
+    uuid = get_uuid(reponse.access_token)
+    _LOGGER.debug("Attempting access token check")
+
+    try:
+        check_access_token(reponse.access_token, uuid, endpoint)
+    except Exception as err:  # pylint: disable=broad-except
+        raise WinixException.from_winix_exception(err) from err
+
+    _LOGGER.debug("Re-authentication successful")
+    return reponse
+
+
+def check_access_token(
+    access_token: str, uuid: str, endpoint: WinixEndpoint = DEFAULT_ENDPOINT
+) -> None:
+    """Validate the access token with Winix cloud using current app metadata.
+
+    Raises WinixException.
+    """
+
+    resp = _http_session().post(
+        f"{endpoint.mobile_url}/checkAccessToken",
+        headers=HEADERS,
+        data=codec.encrypt(build_mobile_app_payload(access_token, uuid)),
+        timeout=(CONNECT_TIMEOUT, DEFAULT_POST_TIMEOUT),
+    )
+
+    response_json = codec.json_loads(codec.decrypt(resp.content))
+
+    if resp.status_code != HTTPStatus.OK:
+        response_json["message"] = (
+            f"Error while performing RPC checkAccessToken ({resp.status_code})"
+        )
+        raise WinixException(response_json)
+
+
+def register_user(
+    access_token: str,
+    uuid: str,
+    email: str,
+    endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+) -> None:
+    """Register the generated mobile identity with the Winix backend.
+
+    Raises WinixException.
+    """
+
+    resp = _http_session().post(
+        f"{endpoint.mobile_url}/registerUser",
+        headers=HEADERS,
+        data=codec.encrypt(build_mobile_app_payload(access_token, uuid, email=email)),
+        timeout=(CONNECT_TIMEOUT, DEFAULT_POST_TIMEOUT),
+    )
+
+    response_json = codec.json_loads(codec.decrypt(resp.content))
+
+    if resp.status_code != HTTPStatus.OK:
+        response_json["message"] = (
+            f"Error while performing RPC registerUser ({resp.status_code})"
+        )
+        raise WinixException(response_json)
+
+
+async def get_filter_alarm_duration(
+    client: aiohttp.ClientSession,
+    access_token: str,
+    uuid: str,
+    device_id: str,
+    endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+) -> int:
+    """Get filter change duration reminder in hours.
+
+    Raises WinixException.
+    """
+
+    resp = await client.post(
+        f"{endpoint.mobile_url}/getFilterAlarmInfo",
+        json={
+            "accessToken": access_token,
+            "uuid": uuid,
+            "deviceId": device_id,
+        },
+        timeout=DEFAULT_POST_TIMEOUT,
+    )
+
+    if resp.status != HTTPStatus.OK:
+        raise WinixException(
+            {
+                "message": "Failed to get filterAlarmInfo.",
+            }
+        )
+
+    response_json = await resp.json()
+
+    # Sample json
+    # {'resultCode': '200', 'resultMessage': 'SUCCESS', 'filterUsageAlarm': 9}
+    _LOGGER.debug("getFilterAlarmInfo: %s", response_json)
+
+    # Fall back to 9 months if filter alram has been turned off in mobile app in which case we receive this:
+    # {'resultCode': '200', 'resultMessage': 'SUCCESS', 'filterUsageAlarm': 0}
+    value = int(response_json["filterUsageAlarm"])
+
+    if value == 0:
+        value = DEFAULT_FILTER_ALARM_DURATION
+    return value * 30 * 24
+
+
+async def get_device_stubs(
+    client: aiohttp.ClientSession,
+    access_token: str,
+    uuid: str,
+    endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+) -> list[MyWinixDeviceStub]:
+    """Get device list.
+
+    Raises WinixException.
+    """
+
+    # Modified from https://github.com/hfern/winix to support additional attributes.
+
+    # com.google.gson.k kVar = new com.google.gson.k();
+    # kVar.p("accessToken", deviceMainActivity2.f2938o);
+    # kVar.p("uuid", Common.w(deviceMainActivity2.f2934k));
+    # new com.winix.smartiot.util.o0(deviceMainActivity2.f2934k, "https://us.mobile.winix-iot.com/getDeviceInfoList", kVar).a(new TypeToken<g4.v>() {
+    #  // from class: com.winix.smartiot.activity.DeviceMainActivity.9
+    # }, new com.winix.smartiot.activity.d(deviceMainActivity2, 4));
+
+    resp = await client.post(
+        f"{endpoint.mobile_url}/getDeviceInfoList",
+        headers=HEADERS,
+        data=codec.encrypt(
+            {
+                "accessToken": access_token,
+                "uuid": uuid,
+            }
+        ),
+        timeout=DEFAULT_POST_TIMEOUT,
+    )
+
+    binary_data = resp.content
+    response_json = codec.json_loads(codec.decrypt(await binary_data.read()))
+
+    if resp.status != HTTPStatus.OK:
+        err_data = response_json
+        result_code = err_data.get("resultCode")
+        result_message = err_data.get("resultMessage")
+
+        raise WinixException(
+            {
+                "message": f"Failed to get device list (code-{result_code}). {result_message}.",
+                "result_code": result_code,
+                "result_message": result_message,
+            }
+        )
+
+    return [
+        MyWinixDeviceStub(
+            id=item.get("deviceId"),
+            mac=item.get("mac"),
+            alias=item.get("deviceAlias"),
+            location_code=item.get("deviceLocCode"),
+            filter_replace_date=item.get("filterReplaceDate"),
+            model=item.get("modelName"),
+            sw_version=item.get("mcuVer"),
+        )
+        for item in response_json["deviceInfoList"]
+    ]
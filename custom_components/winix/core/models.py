@@ -0,0 +1,18 @@
+"""Data models of the Winix cloud."""
+
+from __future__ import annotations
+
+import dataclasses
+
+
+@dataclasses.dataclass
+class MyWinixDeviceStub:
+    """Winix dehumidifier device information."""
+
+    id: str
+    mac: str
+    alias: str
+    location_code: str
+    filter_replace_date: str
+    model: str
+    sw_version: str
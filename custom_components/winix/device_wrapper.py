@@ -1,7 +1,9 @@
 from __future__ import annotations
 
-import dataclasses
-import aiohttp
+from collections.abc import Callable
+from contextlib import AbstractContextManager
+import time
+from typing import TYPE_CHECKING, Any
 
 from .const import (
     FAN_SPEED_LOW,
@@ -9,11 +11,14 @@ from .const import (
     FAN_SPEED_TURBO,
     ATTR_HUMIDITY,
     ATTR_TARGET_HUMIDITY,
+    ATTR_FAN_SPEED,
     ATTR_MODE,
     ATTR_POWER,
     ATTR_TIMER,
     ATTR_CHILD_LOCK,
     ATTR_UV_STERILIZATION,
+    HUMIDITY_EXTRAPOLATION_LIMIT,
+    HUMIDITY_HISTORY_SIZE,
     MODE_AUTO,
     MODE_MANUAL,
     MODE_LAUNDRY,
@@ -22,20 +27,21 @@ from .const import (
     MODE_SILENT,
     OFF_VALUE,
     ON_VALUE,
+    PARAM_REFRESH_INTERVAL,
+    TIMER_MINUTES_PER_UNIT,
 )
-from .driver import WinixDriver
+from .core.cache import TTLCache
+from .core.capabilities import ModelProfile, RawAttributes, get_profile
+from .core.driver import WinixDriver
+from .core.endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+from .core.models import MyWinixDeviceStub
+from .history import HumidityHistory
+
+if TYPE_CHECKING:
+    import aiohttp
+
+    from .connectivity import ConnectivitySupervisor
 
-@dataclasses.dataclass
-class MyWinixDeviceStub:
-    """Winix dehumidifier device information."""
-    
-    id: str
-    mac: str
-    alias: str
-    location_code: str
-    filter_replace_date: str
-    model: str
-    sw_version: str
 
 class WinixDeviceWrapper:
     """Representation of the Winix dehumidifier data."""
@@ -45,20 +51,53 @@ class WinixDeviceWrapper:
         client: aiohttp.ClientSession,
         device_stub: MyWinixDeviceStub,
         logger,
+        endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+        supervisor: ConnectivitySupervisor | None = None,
     ) -> None:
         """Initialize the wrapper."""
 
-        self._driver = WinixDriver(device_stub.id, client)
+        self._driver = WinixDriver(
+            device_stub.id,
+            client,
+            endpoint,
+            get_profile(device_stub.model),
+            supervisor,
+        )
         self._state = {}
         self._on = False
         self._logger = logger
         self.device_stub = device_stub
         self._alias = device_stub.alias
+        self.history = HumidityHistory(HUMIDITY_HISTORY_SIZE)
+        self._sampled_fetch = 0
+
+        # Reported timer value and when it was first seen, used to count down
+        # between polls.
+        self._timer_anchor: tuple[int, float] | None = None
+
+        # Device parameters are only fetched while some entity needs them
+        self._params_cache: TTLCache[str, dict[str, int]] = TTLCache(
+            PARAM_REFRESH_INTERVAL
+        )
+        self._params_demand = 0
+
+        # Set by the manager from the cached getFilterAlarmInfo response
+        self.filter_alarm_hours: int | None = None
 
     async def update(self) -> None:
         """Update the device data."""
         self._state = await self._driver.get_state()
         self._on = self._state.get(ATTR_POWER) == ON_VALUE
+        now = time.monotonic()
+
+        # A state answered from the debounce cache is not a new sample
+        fetches = self._driver.state_fetches
+        humidity = self._state.get(ATTR_HUMIDITY)
+        if humidity is not None and fetches != self._sampled_fetch:
+            self._sampled_fetch = fetches
+            self.history.append(now, humidity)
+
+        self._anchor_timer(self._state.get(ATTR_TIMER), now)
         
         self._logger.debug("%s: Full device state: %s", self._alias, self._state)  # 🔍 모든 데이터 출력
 
@@ -72,6 +111,67 @@ class WinixDeviceWrapper:
             self._state.get(ATTR_TIMER),
         )
 
+    @property
+    def params_due(self) -> bool:
+        """Return True if an entity needs parameters and the cached ones expired."""
+        return bool(self._params_demand) and not self._params_cache.is_fresh(
+            self.device_stub.id
+        )
+
+    async def async_update_params(self) -> None:
+        """Refresh device parameters once the cached copy has expired.
+
+        Runs apart from the state poll, so a slow parameter request does not
+        hold up the device's poll cycle.
+        """
+        try:
+            await self._params_cache.async_get(
+                self.device_stub.id, self._driver.get_params
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # Parameters are auxiliary; keep the previous values
+            self._logger.warning("%s: failed to get parameters: %s", self._alias, err)
+
+    def request_params(self) -> Callable[[], None]:
+        """Register interest in device parameters; returns a release callback."""
+        self._params_demand += 1
+
+        def release() -> None:
+            self._params_demand -= 1
+
+        return release
+
+    def get_params(self) -> dict[str, int]:
+        """Return the last fetched device parameters."""
+        return self._params_cache.get(self.device_stub.id) or {}
+
+    def update_device_stub(self, device_stub: MyWinixDeviceStub) -> None:
+        """Apply changed device information, such as alias or firmware."""
+        self.device_stub = device_stub
+        self._alias = device_stub.alias
+        self._driver.profile = get_profile(device_stub.model)
+
+    def set_blocking_monitor(
+        self, blocking: Callable[[str], AbstractContextManager[Any]]
+    ) -> None:
+        """Time synchronous decoding of device responses with blocking."""
+        self._driver.blocking = blocking
+
+    def set_request_options(self, timeout: float, debounce: float) -> None:
+        """Apply the request timeout and state debounce window of the entry."""
+        self._driver.request_timeout = timeout
+        self._driver.state_cache_ttl = debounce
+
+    @property
+    def profile(self) -> ModelProfile:
+        """Return the capability profile of the device model."""
+        return self._driver.profile
+
+    @property
+    def raw_attributes(self) -> RawAttributes:
+        """Return all attributes of the last poll by code, decoded on access."""
+        return self._driver.raw_attributes
+
     def update_features(self) -> None:
         """제습기는 별도 feature 업데이트 없음."""
         pass
@@ -80,6 +180,73 @@ class WinixDeviceWrapper:
         """Return the device data."""
         return self._state
 
+    @property
+    def drying_rate(self) -> float | None:
+        """Return how fast humidity is dropping in %/h (negative when rising)."""
+        rate = self.history.rate_per_hour()
+        return None if rate is None else -rate
+
+    @property
+    def minutes_to_target(self) -> float | None:
+        """Return the estimated minutes until the target humidity is reached."""
+        target = self._state.get(ATTR_TARGET_HUMIDITY)
+        latest = self.history.latest
+        if target is None or latest is None:
+            return None
+
+        if latest[1] <= target:
+            return 0.0
+
+        seconds = self.history.seconds_to_reach(target)
+        return None if seconds is None else seconds / 60
+
+    @property
+    def predicted_timer_minutes(self) -> float | None:
+        """Return the remaining timer minutes extrapolated since the last poll.
+
+        The device reports the timer in whole units, so the countdown never
+        leaves the range implied by the reported value. The next poll reporting
+        a different value re-anchors the countdown.
+        """
+        if self._timer_anchor is None:
+            return None
+
+        value, seen_at = self._timer_anchor
+        if value <= 0:
+            return 0.0
+
+        upper = value * TIMER_MINUTES_PER_UNIT
+        lower = (value - 1) * TIMER_MINUTES_PER_UNIT
+        elapsed = (time.monotonic() - seen_at) / 60
+        return max(lower, upper - elapsed)
+
+    @property
+    def estimated_humidity(self) -> float | None:
+        """Return the humidity extrapolated from the recent trend.
+
+        The estimate stays within HUMIDITY_EXTRAPOLATION_LIMIT of the last
+        measurement and is replaced by the next real sample.
+        """
+        latest = self.history.latest
+        if latest is None:
+            return None
+
+        sampled_at, humidity = latest
+        rate = self.history.rate_per_hour()
+        if rate is None:
+            return humidity
+
+        delta = rate * (time.monotonic() - sampled_at) / 3600
+        delta = max(-HUMIDITY_EXTRAPOLATION_LIMIT, min(HUMIDITY_EXTRAPOLATION_LIMIT, delta))
+        return max(0.0, min(100.0, humidity + delta))
+
+    def _anchor_timer(self, value: int | None, now: float) -> None:
+        """Start a new countdown when the timer value changes."""
+        if value is None:
+            self._timer_anchor = None
+        elif self._timer_anchor is None or self._timer_anchor[0] != value:
+            self._timer_anchor = (value, now)
+
     @property
     def is_on(self) -> bool:
         """Return if the dehumidifier is on."""
@@ -100,37 +267,42 @@ class WinixDeviceWrapper:
             await self._driver.turn_off()
 
     async def async_set_humidity(self, target_humidity: int) -> None:
-        """Set the target humidity level."""
-        self._state[ATTR_TARGET_HUMIDITY] = target_humidity
+        """Set the target humidity level.
+
+        Commands are validated against the model profile and raise
+        InvalidCommand before anything is sent or the state is touched.
+        """
         self._logger.debug("%s => set target humidity=%s", self._alias, target_humidity)
         await self._driver.set_humidity(target_humidity)
+        self._state[ATTR_TARGET_HUMIDITY] = target_humidity
 
     async def async_set_mode(self, mode: str) -> None:
         """Set the operating mode."""
-        self._state[ATTR_MODE] = mode
         self._logger.debug("%s => set mode=%s", self._alias, mode)
         await self._driver.set_mode(mode)
+        self._state[ATTR_MODE] = mode
 
     async def async_set_fan_speed(self, speed: str) -> None:
         """Set the fan speed."""
-        self._state[ATTR_MODE] = speed
         self._logger.debug("%s => set fan speed=%s", self._alias, speed)
         await self._driver.set_fan_speed(speed)
+        self._state[ATTR_FAN_SPEED] = speed
 
     async def async_set_timer(self, timer: int) -> None:
         """Set the timer (0-12 hours)."""
-        self._state[ATTR_TIMER] = timer
         self._logger.debug("%s => set timer=%s", self._alias, timer)
         await self._driver.set_timer(timer)
+        self._state[ATTR_TIMER] = timer
+        self._anchor_timer(timer, time.monotonic())
 
     async def async_set_child_lock(self, lock: bool) -> None:
         """Enable or disable child lock."""
-        self._state[ATTR_CHILD_LOCK] = ON_VALUE if lock else OFF_VALUE
         self._logger.debug("%s => set child lock=%s", self._alias, lock)
         await self._driver.set_child_lock(lock)
+        self._state[ATTR_CHILD_LOCK] = ON_VALUE if lock else OFF_VALUE
 
     async def async_set_uv_sterilization(self, uv: bool) -> None:
         """Enable or disable UV sterilization."""
-        self._state[ATTR_UV_STERILIZATION] = ON_VALUE if uv else OFF_VALUE
         self._logger.debug("%s => set UV sterilization=%s", self._alias, uv)
         await self._driver.set_uv_sterilization(uv)
+        self._state[ATTR_UV_STERILIZATION] = ON_VALUE if uv else OFF_VALUE
@@ -0,0 +1,44 @@
+"""Diagnostics support for Winix."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from . import WinixConfigEntry
+from .const import WINIX_AUTH_RESPONSE
+
+TO_REDACT = {CONF_USERNAME, CONF_PASSWORD, WINIX_AUTH_RESPONSE, "id", "mac"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: WinixConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    manager = entry.runtime_data
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "endpoint": manager.endpoint.region,
+        "connection_stats": manager.connection_stats.as_dict(),
+        "connectivity": manager.supervisor.as_dict(),
+        "loop_lag": manager.watchdog.as_dict() if manager.watchdog else None,
+        "executor_jobs": (
+            {label: stats.as_dict() for label, stats in manager.watchdog.jobs.items()}
+            if manager.watchdog
+            else None
+        ),
+        "devices": [
+            {
+                "device": async_redact_data(vars(wrapper.device_stub), TO_REDACT),
+                "state": wrapper.get_state(),
+                "profile": wrapper.profile.name,
+                "raw_attributes": dict(wrapper.raw_attributes.raw()),
+                "late_cycles": manager.get_device_coordinator(wrapper).late_cycles,
+            }
+            for wrapper in manager.get_device_wrappers()
+        ],
+    }
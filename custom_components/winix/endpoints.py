@@ -0,0 +1,75 @@
+"""Selection of the Winix cloud region."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING
+
+from .const import LOGGER, REGION_AUTO
+from .core.endpoints import DEFAULT_ENDPOINT, DEFAULT_REGION, REGIONS, WinixEndpoint
+
+if TYPE_CHECKING:
+    import aiohttp
+
+PROBE_TIMEOUT = 5
+
+
+async def async_probe_latency(
+    client: aiohttp.ClientSession, endpoint: WinixEndpoint
+) -> float | None:
+    """Return the round-trip time to the endpoint in seconds, None if unreachable.
+
+    Any HTTP response counts as reachable; only the time to get it matters.
+    """
+    import aiohttp
+
+    started = time.perf_counter()
+    try:
+        async with client.head(
+            endpoint.api_url,
+            allow_redirects=False,
+            timeout=aiohttp.ClientTimeout(total=PROBE_TIMEOUT),
+        ):
+            pass
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        LOGGER.debug("Endpoint %s unreachable: %s", endpoint.api_url, err)
+        return None
+
+    return time.perf_counter() - started
+
+
+async def async_select_endpoint(
+    client: aiohttp.ClientSession, regions: tuple[str, ...] = REGIONS
+) -> WinixEndpoint:
+    """Probe all regions concurrently and return the fastest one."""
+    endpoints = [WinixEndpoint.for_region(region) for region in regions]
+    latencies = await asyncio.gather(
+        *(async_probe_latency(client, endpoint) for endpoint in endpoints)
+    )
+
+    reachable = [
+        (latency, endpoint)
+        for latency, endpoint in zip(latencies, endpoints)
+        if latency is not None
+    ]
+    if not reachable:
+        LOGGER.warning("No Winix endpoint answered, using %s", DEFAULT_REGION)
+        return DEFAULT_ENDPOINT
+
+    latency, endpoint = min(reachable, key=lambda item: item[0])
+    LOGGER.info("Using Winix region %s (%.0f ms)", endpoint.region, latency * 1000)
+    return endpoint
+
+
+async def async_resolve_endpoint(
+    client: aiohttp.ClientSession, region: str | None
+) -> WinixEndpoint:
+    """Return the endpoint for a configured region, probing when it is auto."""
+    if not region:
+        return DEFAULT_ENDPOINT
+
+    if region == REGION_AUTO:
+        return await async_select_endpoint(client)
+
+    return WinixEndpoint.for_region(region)
@@ -0,0 +1,109 @@
+"""Filter life tracking for Winix devices."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime
+
+import aiohttp
+
+from .const import (
+    AUTH_RESULT_CODES,
+    DEFAULT_FILTER_ALARM_DURATION,
+    FILTER_ALARM_CACHE_TTL,
+    LOGGER,
+)
+from .core.cache import TTLCache
+from .core.endpoints import WinixEndpoint
+from .helpers import Helpers, WinixException
+
+DEFAULT_FILTER_ALARM_HOURS = DEFAULT_FILTER_ALARM_DURATION * 30 * 24
+
+
+def parse_filter_replace_date(value: str | None) -> datetime | None:
+    """Parse filterReplaceDate from getDeviceInfoList."""
+    if not value:
+        return None
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        LOGGER.debug("Unrecognized filter replace date %s", value)
+        return None
+
+
+def remaining_filter_life(
+    replace_date: str | None, alarm_hours: int, now: datetime | None = None
+) -> int | None:
+    """Return the remaining filter life in percent."""
+    replaced_at = parse_filter_replace_date(replace_date)
+    if replaced_at is None or alarm_hours <= 0:
+        return None
+
+    if now is None:
+        now = datetime.now(replaced_at.tzinfo)
+
+    used_hours = (now - replaced_at).total_seconds() / 3600
+    remaining = 100 - used_hours * 100 / alarm_hours
+    return max(0, min(100, round(remaining)))
+
+
+class FilterAlarmCache:
+    """Filter alarm durations of all devices of an account.
+
+    getFilterAlarmInfo is requested concurrently for every device and cached for
+    FILTER_ALARM_CACHE_TTL, so filter sensors add nothing to regular polling.
+    """
+
+    def __init__(
+        self, client: aiohttp.ClientSession, endpoint: WinixEndpoint
+    ) -> None:
+        """Create an empty cache."""
+        self._client = client
+        self._endpoint = endpoint
+        self._cache: TTLCache[str, int] = TTLCache(FILTER_ALARM_CACHE_TTL)
+
+    def get_alarm_hours(self, device_id: str) -> int:
+        """Return the cached alarm duration, or the default one."""
+        return self._cache.get(device_id) or DEFAULT_FILTER_ALARM_HOURS
+
+    async def async_refresh(
+        self, access_token: str, uuid: str, device_ids: list[str]
+    ) -> None:
+        """Fetch the alarm duration for every device whose entry has expired.
+
+        Other failures fall back to the default duration. Raises WinixException
+        if the access token was rejected, so the caller can renew it and retry.
+        """
+
+        async def _fetch(device_id: str) -> int:
+            return await Helpers.get_filter_alarm_duration(
+                self._client, access_token, uuid, device_id, self._endpoint
+            )
+
+        stale = [device_id for device_id in device_ids if device_id not in self._cache]
+        if not stale:
+            return
+
+        results = await asyncio.gather(
+            *(
+                self._cache.async_get(device_id, lambda d=device_id: _fetch(d))
+                for device_id in stale
+            ),
+            return_exceptions=True,
+        )
+
+        rejected: WinixException | None = None
+        for device_id, result in zip(stale, results):
+            if (
+                isinstance(result, WinixException)
+                and result.result_code in AUTH_RESULT_CODES
+            ):
+                rejected = result
+            elif isinstance(result, Exception):
+                LOGGER.warning(
+                    "Failed to get filter alarm info for %s: %s", device_id, result
+                )
+
+        if rejected is not None:
+            raise rejected
@@ -0,0 +1,189 @@
+"""In-memory humidity history for Winix devices."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterator
+
+SECONDS_PER_HOUR = 3600
+
+
+class HumidityHistory:
+    """Fixed-size, array-backed ring buffer of humidity samples.
+
+    Statistics are maintained incrementally on every append, so reading the
+    rolling mean, minimum, maximum and trend is O(1) and never needs the
+    recorder. Memory use is bounded by `capacity`.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        """Create an empty history holding at most capacity samples."""
+        if capacity < 2:
+            raise ValueError("capacity must be at least 2")
+
+        self._capacity = capacity
+        self._times = array("d", bytes(8 * capacity))
+        self._values = array("d", bytes(8 * capacity))
+        self._start = 0  # Index of the oldest sample
+        self._count = 0
+        self._seq = 0  # Sequence number of the next sample
+
+        # Running sums for the mean and the least squares slope. Times are kept
+        # relative to _origin to preserve precision.
+        self._origin = 0.0
+        self._sum_t = 0.0
+        self._sum_v = 0.0
+        self._sum_tt = 0.0
+        self._sum_tv = 0.0
+
+        # Monotonic queues of (seq, value) for the rolling minimum and maximum
+        self._min_queue: deque[tuple[int, float]] = deque()
+        self._max_queue: deque[tuple[int, float]] = deque()
+
+    def __len__(self) -> int:
+        """Return the number of samples held."""
+        return self._count
+
+    @property
+    def capacity(self) -> int:
+        """Return the maximum number of samples held."""
+        return self._capacity
+
+    def append(self, timestamp: float, value: float) -> None:
+        """Add a sample, evicting the oldest one when full."""
+        if self._count == 0:
+            self._origin = timestamp
+
+        if self._count == self._capacity:
+            self._evict_oldest()
+
+        index = (self._start + self._count) % self._capacity
+        self._times[index] = timestamp
+        self._values[index] = value
+        self._count += 1
+        self._add_to_sums(timestamp, value)
+
+        seq = self._seq
+        self._seq += 1
+
+        while self._min_queue and self._min_queue[-1][1] >= value:
+            self._min_queue.pop()
+        self._min_queue.append((seq, value))
+
+        while self._max_queue and self._max_queue[-1][1] <= value:
+            self._max_queue.pop()
+        self._max_queue.append((seq, value))
+
+    def clear(self) -> None:
+        """Remove all samples."""
+        self._start = 0
+        self._count = 0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        self._min_queue.clear()
+        self._max_queue.clear()
+
+    def samples(self) -> Iterator[tuple[float, float]]:
+        """Iterate over (timestamp, value) from the oldest to the newest."""
+        for offset in range(self._count):
+            index = (self._start + offset) % self._capacity
+            yield self._times[index], self._values[index]
+
+    @property
+    def latest(self) -> tuple[float, float] | None:
+        """Return the newest (timestamp, value) sample."""
+        if self._count == 0:
+            return None
+
+        index = (self._start + self._count - 1) % self._capacity
+        return self._times[index], self._values[index]
+
+    @property
+    def mean(self) -> float | None:
+        """Return the mean of the held samples."""
+        if self._count == 0:
+            return None
+        return self._sum_v / self._count
+
+    @property
+    def minimum(self) -> float | None:
+        """Return the minimum of the held samples."""
+        return self._min_queue[0][1] if self._min_queue else None
+
+    @property
+    def maximum(self) -> float | None:
+        """Return the maximum of the held samples."""
+        return self._max_queue[0][1] if self._max_queue else None
+
+    def rate_per_hour(self) -> float | None:
+        """Return the least squares trend of the samples in units per hour."""
+        count = self._count
+        if count < 2:
+            return None
+
+        denominator = count * self._sum_tt - self._sum_t * self._sum_t
+        if denominator <= 0:
+            return None
+
+        slope = (count * self._sum_tv - self._sum_t * self._sum_v) / denominator
+        return slope * SECONDS_PER_HOUR
+
+    def seconds_to_reach(self, target: float) -> float | None:
+        """Return the estimated seconds until the trend reaches target.
+
+        Returns 0 when the latest sample is at the target and None if the trend
+        moves away from it. A sample already past the target has the trend
+        moving away from it, so that is None too; callers that know which side
+        of the target counts as reached, like the wrapper, check that first.
+        """
+        latest = self.latest
+        rate = self.rate_per_hour()
+        if latest is None or rate is None or rate == 0:
+            return None
+
+        remaining = target - latest[1]
+        if remaining == 0:
+            return 0.0
+        if (remaining < 0) != (rate < 0):
+            return None
+
+        return remaining / rate * SECONDS_PER_HOUR
+
+    def _add_to_sums(self, timestamp: float, value: float) -> None:
+        t = timestamp - self._origin
+        self._sum_t += t
+        self._sum_v += value
+        self._sum_tt += t * t
+        self._sum_tv += t * value
+
+    def _evict_oldest(self) -> None:
+        t = self._times[self._start] - self._origin
+        value = self._values[self._start]
+        self._sum_t -= t
+        self._sum_v -= value
+        self._sum_tt -= t * t
+        self._sum_tv -= t * value
+
+        evicted_seq = self._seq - self._count
+        if self._min_queue and self._min_queue[0][0] == evicted_seq:
+            self._min_queue.popleft()
+        if self._max_queue and self._max_queue[0][0] == evicted_seq:
+            self._max_queue.popleft()
+
+        self._start = (self._start + 1) % self._capacity
+        self._count -= 1
+
+        if self._start == 0:
+            self._rebase()
+
+    def _rebase(self) -> None:
+        """Recompute the running sums relative to the oldest sample.
+
+        Done once per wrap-around so rounding errors do not accumulate and the
+        relative times stay small.
+        """
+        samples = list(self.samples())
+        self._origin = samples[0][0] if samples else 0.0
+        self._sum_t = self._sum_v = self._sum_tt = self._sum_tv = 0.0
+        for timestamp, value in samples:
+            self._add_to_sums(timestamp, value)
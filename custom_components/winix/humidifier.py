@@ -8,17 +8,22 @@ import logging
 from typing import Any
 
 from homeassistant.components.humidifier import (
+    DEFAULT_MAX_HUMIDITY,
+    DEFAULT_MIN_HUMIDITY,
     DOMAIN as HUMIDIFIER_DOMAIN,
     HumidifierEntity,
     HumidifierDeviceClass,
     HumidifierEntityFeature,
 )
 from homeassistant.const import ATTR_ENTITY_ID
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import WinixConfigEntry
 from .const import (
+    ATTRIBUTE_POLICY_STABLE,
+    ATTRIBUTE_POLICY_VOLATILE,
     ATTR_MODE,
     ATTR_FAN_SPEED,
     ATTR_HUMIDITY,
@@ -26,11 +31,12 @@ from .const import (
     ATTR_TIMER,
     ATTR_CHILD_LOCK,
     ATTR_UV_STERILIZATION,
+    HUMIDIFIER_ATTRIBUTE_POLICY,
     LOGGER,
     ORDERED_NAMED_FAN_SPEEDS,
     WINIX_DOMAIN,
-    PRESET_MODES,
 )
+from .core.capabilities import InvalidCommand
 from .device_wrapper import WinixDeviceWrapper
 from .manager import WinixEntity, WinixManager
 
@@ -42,11 +48,19 @@ async def async_setup_entry(
 ) -> None:
     """Set up the Winix dehumidifiers."""
     manager = entry.runtime_data
-    entities = [
-        WinixDehumidifier(wrapper, manager) for wrapper in manager.get_device_wrappers()
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s Winix dehumidifiers", len(entities))
+
+    @callback
+    def _async_add_wrappers(wrappers: list[WinixDeviceWrapper]) -> None:
+        entities = [WinixDehumidifier(wrapper, manager) for wrapper in wrappers]
+        async_add_entities(entities)
+        LOGGER.info("Added %s Winix dehumidifiers", len(entities))
+
+    _async_add_wrappers(manager.get_device_wrappers())
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, manager.signal_devices_added, _async_add_wrappers
+        )
+    )
 
 
 class WinixDehumidifier(WinixEntity, HumidifierEntity):
@@ -54,31 +68,48 @@ class WinixDehumidifier(WinixEntity, HumidifierEntity):
 
     _attr_supported_features = HumidifierEntityFeature.MODES
 
+    # Volatile values are published by dedicated sensors; keep them out of the
+    # recorder so every humidity tick does not store a new attribute blob.
+    _unrecorded_attributes = frozenset(
+        key
+        for key, policy in HUMIDIFIER_ATTRIBUTE_POLICY.items()
+        if policy == ATTRIBUTE_POLICY_VOLATILE
+    )
+
     def __init__(self, wrapper: WinixDeviceWrapper, coordinator: WinixManager) -> None:
         """Initialize the entity."""
         super().__init__(wrapper, coordinator)
         self._attr_unique_id = f"{HUMIDIFIER_DOMAIN}.{WINIX_DOMAIN}_{self._mac}"
 
-    @property
-    def min_humidity(self) -> int:
-        return 35
-
-    @property
-    def max_humidity(self) -> int:
-        return 70
+        # Limits and modes come from the capability profile of the model
+        profile = wrapper.profile
+        minimum, maximum, step = profile.range(ATTR_TARGET_HUMIDITY) or (
+            DEFAULT_MIN_HUMIDITY,
+            DEFAULT_MAX_HUMIDITY,
+            1,
+        )
+        self._attr_min_humidity = minimum
+        self._attr_max_humidity = maximum
+        self._humidity_step = step
+        self._attr_available_modes = profile.options(ATTR_MODE)
 
     @property
     def humidity_step(self) -> int:
-        return 5
+        """Return the step of the target humidity."""
+        return self._humidity_step
 
     @property
     def extra_state_attributes(self) -> Mapping[str, Any] | None:
-        """Return the state attributes."""
+        """Return the stable state attributes."""
         attributes = {}
         state = self.device_wrapper.get_state()
 
         if state is not None:
-            attributes = {key: value for key, value in state.items()}
+            attributes = {
+                key: value
+                for key, value in state.items()
+                if HUMIDIFIER_ATTRIBUTE_POLICY.get(key) == ATTRIBUTE_POLICY_STABLE
+            }
 
         return attributes
 
@@ -94,9 +125,10 @@ class WinixDehumidifier(WinixEntity, HumidifierEntity):
         return state.get(ATTR_MODE)
 
     @property
-    def available_modes(self) -> list[str]:
-        """Return available operation modes."""
-        return PRESET_MODES
+    def current_humidity(self) -> int | None:
+        """Return the current humidity percentage."""
+        state = self.device_wrapper.get_state()
+        return state.get(ATTR_HUMIDITY, None)
 
     @property
     def target_humidity(self) -> int | None:
@@ -106,18 +138,20 @@ class WinixDehumidifier(WinixEntity, HumidifierEntity):
 
     async def async_set_mode(self, mode: str) -> None:
         """Set the operation mode."""
-        await self.device_wrapper.async_set_mode(mode)
+        try:
+            await self.device_wrapper.async_set_mode(mode)
+        except InvalidCommand as err:
+            LOGGER.warning("%s: %s", self.device_wrapper.device_stub.alias, err)
+            return
         self.async_write_ha_state()
 
     async def async_set_humidity(self, humidity: int) -> None:
         """Set the target humidity level."""
-        if not (35 <= humidity <= 70):
-            LOGGER.warning("Invalid humidity value: %s", humidity)
-            return
-        if humidity % 5 != 0:
-            LOGGER.warning("Humidity must be set in 5%% steps. You passed: %s", humidity)
+        try:
+            await self.device_wrapper.async_set_humidity(humidity)
+        except InvalidCommand as err:
+            LOGGER.warning("%s: %s", self.device_wrapper.device_stub.alias, err)
             return
-        await self.device_wrapper.async_set_humidity(humidity)
         self.async_write_ha_state()
 
     async def async_turn_on(self, mode: str | None = None, humidity: int | None = None, **kwargs: Any) -> None:
@@ -133,23 +167,3 @@ class WinixDehumidifier(WinixEntity, HumidifierEntity):
         """Turn off the dehumidifier."""
         await self.device_wrapper.async_turn_off()
         self.async_write_ha_state()
-
-    async def async_set_fan_speed(self, speed: str) -> None:
-        """Set the fan speed."""
-        await self.device_wrapper.async_set_fan_speed(speed)
-        self.async_write_ha_state()
-
-    async def async_set_timer(self, timer: int) -> None:
-        """Set the timer."""
-        await self.device_wrapper.async_set_timer(timer)
-        self.async_write_ha_state()
-
-    async def async_set_child_lock(self, lock: bool) -> None:
-        """Enable or disable child lock."""
-        await self.device_wrapper.async_set_child_lock(lock)
-        self.async_write_ha_state()
-
-    async def async_set_uv_sterilization(self, uv: bool) -> None:
-        """Enable or disable UV sterilization."""
-        await self.device_wrapper.async_set_uv_sterilization(uv)
-        self.async_write_ha_state()
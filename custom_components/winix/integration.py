@@ -0,0 +1,507 @@
+"""Home Assistant setup of the Winix Dehumidifier component."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Any
+
+from awesomeversion import AwesomeVersion
+import voluptuous as vol
+
+from homeassistant.components import persistent_notification
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_RESTORED,
+    CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+    Platform,
+    __version__,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import (
+    config_validation as cv,
+    device_registry as dr,
+    entity_registry as er,
+)
+from homeassistant.helpers.event import async_track_time_interval
+
+from .const import (
+    ATTR_DRY_RUN,
+    AUTH_RESULT_CODES,
+    CONF_RECORD_TRAFFIC,
+    CONF_REGION,
+    DEFAULT_SCAN_INTERVAL,
+    HUMIDIFIER_SERVICES,
+    LOGGER,
+    REGION_AUTO,
+    SERVICE_CHILD_LOCK,
+    SERVICE_REMOVE_STALE_ENTITIES,
+    SERVICE_SET_FAN_SPEED,
+    SERVICE_SET_HUMIDITY,
+    SERVICE_SET_MODE,
+    SERVICE_SET_TIMER,
+    SERVICE_UV_STERILIZATION,
+    TRAFFIC_CAPTURE_FILE,
+    TRAFFIC_CAPTURE_MAX_BYTES,
+    TRAFFIC_FLUSH_INTERVAL,
+    WINIX_AUTH_RESPONSE,
+    WINIX_DOMAIN,
+    WINIX_NAME,
+    __min_ha_version__,
+)
+from .core.capabilities import InvalidCommand
+from .core.endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+from .core.mobile import parse_auth_response
+from .endpoints import async_resolve_endpoint
+from .helpers import Helpers, WinixException
+from .manager import WinixManager
+from .session import WinixClientSession
+from .traffic import RecordingClient, TrafficRecorder
+
+if TYPE_CHECKING:
+    from winix import auth
+
+    from .device_wrapper import WinixDeviceWrapper
+
+type WinixConfigEntry = ConfigEntry[WinixManager]
+
+SUPPORTED_PLATFORMS = [Platform.HUMIDIFIER, Platform.SENSOR]
+
+# Service -> (service field, wrapper method parameter, validator)
+SERVICE_FIELDS: dict[str, tuple[str, str, Callable[[Any], Any]]] = {
+    SERVICE_SET_HUMIDITY: ("humidity", "target_humidity", vol.Coerce(int)),
+    SERVICE_SET_MODE: ("mode", "mode", cv.string),
+    SERVICE_SET_FAN_SPEED: ("speed", "speed", cv.string),
+    SERVICE_SET_TIMER: ("timer", "timer", vol.Coerce(int)),
+    SERVICE_CHILD_LOCK: ("lock", "lock", cv.boolean),
+    SERVICE_UV_STERILIZATION: ("uv", "uv", cv.boolean),
+}
+
+
+async def async_setup_entry(hass: HomeAssistant, entry: WinixConfigEntry) -> bool:
+    """Set up the Winix component."""
+
+    if not is_valid_ha_version():
+        msg = (
+            "This integration require at least HomeAssistant version "
+            f" {__min_ha_version__}, you are running version {__version__}."
+            " Please upgrade HomeAssistant to continue use this integration."
+        )
+
+        LOGGER.warning(msg)
+        persistent_notification.async_create(
+            hass, msg, WINIX_NAME, f"{WINIX_DOMAIN}.inv_ha_version"
+        )
+        return False
+
+    user_input = entry.data
+
+    auth_response_data = user_input.get(WINIX_AUTH_RESPONSE)
+    if not auth_response_data:
+        raise ConfigEntryAuthFailed(
+            "No authentication data found. Please reconfigure the integration."
+        )
+
+    # The winix login library pulls in boto3, import it off the event loop
+    auth_response = await hass.async_add_import_executor_job(
+        parse_auth_response, auth_response_data
+    )
+
+    # Create the integration-owned connection pool once and pass it around
+    session = WinixClientSession(hass)
+    entry.async_on_unload(session.async_close)
+    client = session.client
+    if entry.options.get(CONF_RECORD_TRAFFIC):
+        client = async_start_recording(hass, entry, client)
+    if user_input.get(CONF_REGION) == REGION_AUTO:
+        endpoint = await async_resolve_auto_region(
+            hass, entry, client, auth_response.access_token
+        )
+    else:
+        endpoint = await async_resolve_endpoint(client, user_input.get(CONF_REGION))
+
+    manager = WinixManager(
+        hass,
+        entry,
+        auth_response,
+        entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+        client,
+        endpoint,
+        session.stats,
+        session.supervisor,
+    )
+    new_auth_response = await async_prepare_devices(
+        hass, manager, user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
+    )
+    if new_auth_response is not None:
+        # Copy over new values
+        LOGGER.debug(
+            "access_token %s",
+            "changed"
+            if auth_response.access_token != new_auth_response.access_token
+            else "unchanged",
+        )
+        LOGGER.debug(
+            "refresh_token %s",
+            "changed"
+            if auth_response.refresh_token != new_auth_response.refresh_token
+            else "unchanged",
+        )
+        LOGGER.debug(
+            "id_token %s",
+            "changed"
+            if auth_response.id_token != new_auth_response.id_token
+            else "unchanged",
+        )
+
+        auth_response.access_token = new_auth_response.access_token
+        auth_response.refresh_token = new_auth_response.refresh_token
+        auth_response.id_token = new_auth_response.id_token
+
+        # Update tokens into entry.data
+        hass.config_entries.async_update_entry(
+            entry,
+            data={**user_input, WINIX_AUTH_RESPONSE: auth_response},
+        )
+
+    await manager.async_config_entry_first_refresh()
+    manager.update_features()  # Update features after the first refresh to ensure we have the latest state
+    
+    entry.runtime_data = manager
+    manager.async_start()
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+    await hass.config_entries.async_forward_entry_setups(entry, SUPPORTED_PLATFORMS)
+    async_register_services(hass, manager)
+    setup_hass_services(hass)
+    return True
+
+async def async_resolve_auto_region(
+    hass: HomeAssistant, entry: WinixConfigEntry, client, access_token: str
+) -> WinixEndpoint:
+    """Resolve the auto region of an entry created before it was resolved in the flow.
+
+    A validated region is saved to the entry so later setups skip the probe;
+    otherwise the US region is used for this setup and the probe is retried
+    on the next one.
+    """
+    endpoint = await async_resolve_endpoint(client, REGION_AUTO)
+    if endpoint == DEFAULT_ENDPOINT or not await Helpers.async_validate_endpoint(
+        client, access_token, endpoint
+    ):
+        return DEFAULT_ENDPOINT
+
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_REGION: endpoint.region}
+    )
+    return endpoint
+
+
+async def async_update_options(hass: HomeAssistant, entry: WinixConfigEntry) -> None:
+    """Apply changed options to the running manager.
+
+    Also called when entry data changes, e.g. refreshed tokens; nothing is
+    applied then. Recording wraps the client of every wrapper, so toggling it
+    reloads the entry.
+    """
+    manager = entry.runtime_data
+    if entry.options == manager.applied_options:
+        return
+
+    if bool(entry.options.get(CONF_RECORD_TRAFFIC)) != manager.recording:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    await manager.async_apply_options(entry.options)
+
+
+@callback
+def async_start_recording(
+    hass: HomeAssistant, entry: WinixConfigEntry, client
+) -> RecordingClient:
+    """Record cloud traffic of this entry to a capture file in the config dir."""
+    recorder = TrafficRecorder(
+        hass.config.path(TRAFFIC_CAPTURE_FILE.format(entry.entry_id)),
+        TRAFFIC_CAPTURE_MAX_BYTES,
+    )
+    LOGGER.info("Recording Winix cloud traffic to %s", recorder.path)
+
+    async def _async_flush(now: datetime | None = None) -> None:
+        await hass.async_add_executor_job(recorder.flush)
+
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, _async_flush, timedelta(seconds=TRAFFIC_FLUSH_INTERVAL)
+        )
+    )
+    entry.async_on_unload(_async_flush)
+    return RecordingClient(client, recorder)
+
+
+async def async_prepare_devices(
+    hass: HomeAssistant, manager: WinixManager, username: str, password: str
+) -> auth.WinixAuthResponse | None:
+    """Prepare devices asynchronously. Returns new auth response if re-login was performed.
+
+    Raises ConfigEntryAuthFailed or ConfigEntryNotReady.
+    """
+    new_auth_response: auth.WinixAuthResponse = None
+
+    try:
+        await manager.prepare_devices_wrappers()
+    except WinixException as err:
+        # 900:MULTI LOGIN: Same credentials were used to login elwsewhere. We need to
+        # login again and get new tokens.
+        # 400:The user is not valid.
+
+        if err.result_code in AUTH_RESULT_CODES:
+            LOGGER.info(
+                f"Failed to get device list (code={err.result_code}, message={err.result_message}), reauthenticating with stored credentials"
+            )
+
+            try:
+                # Avoid blocking the event loop (https://developers.home-assistant.io/docs/asyncio_blocking_operations)
+                async with manager.executor("login"):
+                    new_auth_response = await hass.async_add_executor_job(
+                        Helpers.login, username, password, manager.endpoint
+                    )
+            except WinixException as login_err:
+                raise ConfigEntryAuthFailed("Unable to authenticate.") from login_err
+
+            LOGGER.info("Reauthenticating successful, getting device list again")
+
+            # Try preparing device wrappers again with new auth response
+            try:
+                await manager.prepare_devices_wrappers(new_auth_response.access_token)
+            except WinixException as err_retry:
+                raise ConfigEntryAuthFailed(
+                    "Unable to access device data even after re-login."
+                ) from err_retry
+
+        else:
+            raise ConfigEntryNotReady("Unable to access device data.") from err
+
+    return new_auth_response
+
+
+def async_register_services(hass: HomeAssistant, manager: WinixManager) -> None:
+    """Register services for Winix devices."""
+
+    async def service_handler(call: ServiceCall) -> None:
+        """Handle service calls."""
+        service = call.service
+        field, parameter, _ = SERVICE_FIELDS[service]
+        kwargs = {parameter: call.data[field]}
+
+        entity_ids = call.data.get(ATTR_ENTITY_ID)
+        devices = (
+            async_get_entity_wrappers(hass, manager, entity_ids)
+            if entity_ids
+            else manager.get_device_wrappers()
+        )
+
+        with manager.track(f"service.{service}"):
+            for device in devices:
+                try:
+                    await getattr(device, f"async_{service}")(**kwargs)
+                except InvalidCommand as err:
+                    # Models differ; skip devices that do not support it
+                    LOGGER.warning("%s: %s", device.device_stub.alias, err)
+
+    for service in HUMIDIFIER_SERVICES:
+        if not hass.services.has_service(WINIX_DOMAIN, service):
+            field, _, validator = SERVICE_FIELDS[service]
+            schema = vol.Schema(
+                {
+                    vol.Optional(ATTR_ENTITY_ID): cv.comp_entity_ids,
+                    vol.Required(field): validator,
+                }
+            )
+            hass.services.async_register(
+                WINIX_DOMAIN, service, service_handler, schema
+            )
+
+    LOGGER.info("Winix services registered: %s", ", ".join(HUMIDIFIER_SERVICES))
+
+
+@callback
+def async_get_entity_wrappers(
+    hass: HomeAssistant, manager: WinixManager, entity_ids: Iterable[str]
+) -> list[WinixDeviceWrapper]:
+    """Return the wrappers of the devices the entities belong to.
+
+    Entities are resolved through the entity and device registries to the MAC
+    address that identifies the Winix device.
+    """
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+
+    macs: set[str] = set()
+    for entity_id in entity_ids:
+        entity = entity_registry.async_get(entity_id)
+        if entity is None or entity.device_id is None:
+            continue
+        if (device := device_registry.async_get(entity.device_id)) is None:
+            continue
+        macs.update(
+            identifier
+            for domain, identifier in device.identifiers
+            if domain == WINIX_DOMAIN
+        )
+
+    return [
+        wrapper
+        for wrapper in manager.get_device_wrappers()
+        if wrapper.device_stub.mac.lower() in macs
+    ]
+
+
+def setup_hass_services(hass: HomeAssistant) -> None:
+    """Home Assistant services."""
+
+    @callback
+    def remove_stale_entities(call: ServiceCall) -> ServiceResponse:
+        """Remove stale entities and devices of all loaded Winix entries."""
+        device_registry = dr.async_get(hass)
+        entity_registry = er.async_get(hass)
+
+        entity_ids: list[str] = []
+        device_ids: list[tuple[str, str]] = []
+
+        for entry in hass.config_entries.async_loaded_entries(WINIX_DOMAIN):
+            stale_entities, stale_devices = async_find_stale(
+                hass, entity_registry, device_registry, entry
+            )
+            entity_ids.extend(stale_entities)
+            device_ids.extend(
+                (entry.entry_id, device_id) for device_id in stale_devices
+            )
+
+        dry_run = call.data[ATTR_DRY_RUN]
+        if not dry_run:
+            async_remove(entity_registry, device_registry, entity_ids, device_ids)
+        elif entity_ids or device_ids:
+            LOGGER.info(
+                "Would remove %d entities and %d devices",
+                len(entity_ids),
+                len(device_ids),
+            )
+
+        if not call.return_response:
+            return None
+
+        return {
+            "dry_run": dry_run,
+            "entities": entity_ids,
+            "devices": [device_id for _, device_id in device_ids],
+        }
+
+    hass.services.async_register(
+        WINIX_DOMAIN,
+        SERVICE_REMOVE_STALE_ENTITIES,
+        remove_stale_entities,
+        schema=vol.Schema({vol.Optional(ATTR_DRY_RUN, default=False): cv.boolean}),
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_find_stale(
+    hass: HomeAssistant,
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+    entry: WinixConfigEntry,
+) -> tuple[list[str], list[str]]:
+    """Return the stale entity and device ids of a config entry.
+
+    A device is stale when the account no longer lists it. An entity is stale
+    when its device is stale or gone, or when no platform provides it anymore
+    (its state is only restored from the registry).
+    """
+    macs = {
+        wrapper.device_stub.mac.lower()
+        for wrapper in entry.runtime_data.get_device_wrappers()
+    }
+
+    stale_devices = {
+        device.id
+        for device in dr.async_entries_for_config_entry(
+            device_registry, entry.entry_id
+        )
+        if not any(
+            domain == WINIX_DOMAIN and identifier in macs
+            for domain, identifier in device.identifiers
+        )
+    }
+
+    stale_entities = []
+    for entity in er.async_entries_for_config_entry(entity_registry, entry.entry_id):
+        if entity.device_id is not None and (
+            entity.device_id in stale_devices
+            or device_registry.async_get(entity.device_id) is None
+        ):
+            stale_entities.append(entity.entity_id)
+            continue
+
+        state = hass.states.get(entity.entity_id)
+        if state is not None and state.attributes.get(ATTR_RESTORED):
+            stale_entities.append(entity.entity_id)
+
+    return stale_entities, sorted(stale_devices)
+
+
+@callback
+def async_remove(
+    entity_registry: er.EntityRegistry,
+    device_registry: dr.DeviceRegistry,
+    entity_ids: Iterable[str],
+    device_ids: Iterable[tuple[str, str]],
+) -> None:
+    """Remove entities, and detach devices from their config entries.
+
+    Devices shared with another config entry are kept for that entry.
+    """
+    for entity_id in entity_ids:
+        entity_registry.async_remove(entity_id)
+        LOGGER.debug("Removing entity %s", entity_id)
+
+    for entry_id, device_id in device_ids:
+        device_registry.async_update_device(
+            device_id, remove_config_entry_id=entry_id
+        )
+        LOGGER.debug("Removing device %s", device_id)
+
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry."""
+    unload_ok = await hass.config_entries.async_unload_platforms(
+        entry, SUPPORTED_PLATFORMS
+    )
+
+    other_loaded_entries = [
+        _entry
+        for _entry in hass.config_entries.async_loaded_entries(WINIX_DOMAIN)
+        if _entry.entry_id != entry.entry_id
+    ]
+    if not other_loaded_entries:
+        # If this is the last loaded instance, then unregister services
+        hass.services.async_remove(WINIX_DOMAIN, SERVICE_REMOVE_STALE_ENTITIES)
+
+        for service_name in HUMIDIFIER_SERVICES:
+            hass.services.async_remove(WINIX_DOMAIN, service_name)
+
+    return unload_ok
+
+
+def is_valid_ha_version() -> bool:
+    """Check if HA version is valid for this integration."""
+    return AwesomeVersion(__version__) >= AwesomeVersion(__min_ha_version__)
@@ -2,21 +2,75 @@
 
 from __future__ import annotations
 
-from datetime import timedelta
-
-from winix import WinixAccount, auth
+import asyncio
+from collections.abc import Awaitable, Callable, Mapping
+from contextlib import AbstractAsyncContextManager, AbstractContextManager, nullcontext
+from datetime import datetime, timedelta
+from functools import partial
+import time
+from typing import TYPE_CHECKING, Any, TypeVar
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import (
     CoordinatorEntity,
     DataUpdateCoordinator,
+    UpdateFailed,
+)
+
+from .aggregate import FleetAggregate, FleetSamples, compute_fleet_aggregate
+from .connectivity import ConnectivitySupervisor
+from .const import (
+    ACCESS_TOKEN_LIFETIME,
+    ACCESS_TOKEN_REFRESH_MARGIN,
+    ATTR_HUMIDITY,
+    AUTH_RESULT_CODES,
+    ATTR_MODE,
+    ATTR_TARGET_HUMIDITY,
+    CONF_DEBOUNCE,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_CONCURRENCY,
+    CONF_RECORD_TRAFFIC,
+    CONF_REQUEST_TIMEOUT,
+    CONF_TELEMETRY,
+    CYCLE_DEADLINE_RATIO,
+    CYCLE_MAX_CARRIED,
+    DEFAULT_DEBOUNCE,
+    DEFAULT_MAX_CONCURRENCY,
+    DEFAULT_POST_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEVICE_BACKOFF_MAX,
+    DISCOVERY_INTERVAL,
+    FILTER_ALARM_CACHE_TTL,
+    LOGGER,
+    POLL_JITTER,
+    POLL_SPREAD,
+    SIGNAL_DEVICES_ADDED,
+    TELEMETRY_DIR,
+    TELEMETRY_FLUSH_INTERVAL,
+    WINIX_AUTH_RESPONSE,
+    WINIX_DOMAIN,
 )
+from .core.endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+from .core.mobile import access_token_expiry, get_uuid
+from .device_wrapper import MyWinixDeviceStub, WinixDeviceWrapper
+from .endpoints import async_probe_latency
+from .filter_life import FilterAlarmCache
+from .helpers import Helpers, WinixException
+from .scheduler import PollScheduler
+from .session import ConnectionStats
+from .telemetry import STATUS_ERROR, STATUS_LATE, STATUS_OK, TelemetryWriter
+from .watchdog import LoopLagWatchdog
 
-from .const import LOGGER, WINIX_DOMAIN
-from .device_wrapper import WinixDeviceWrapper
-from .helpers import Helpers
+if TYPE_CHECKING:
+    from winix import auth
+
+_T = TypeVar("_T")
 
 
 class WinixEntity(CoordinatorEntity):
@@ -26,8 +80,8 @@ class WinixEntity(CoordinatorEntity):
     _attr_attribution = "Data provided by Winix"
 
     def __init__(self, wrapper: WinixDeviceWrapper, coordinator: WinixManager) -> None:
-        """Initialize the Winix entity."""
-        super().__init__(coordinator)
+        """Initialize the Winix entity; it listens to its own device only."""
+        super().__init__(coordinator.get_device_coordinator(wrapper))
 
         device_stub = wrapper.device_stub
 
@@ -49,6 +103,121 @@ class WinixEntity(CoordinatorEntity):
         return state is not None
 
 
+class WinixDeviceCoordinator(DataUpdateCoordinator[dict[str, Any]]):
+    """Update channel of a single device.
+
+    It has no interval of its own; the manager refreshes it at the device's
+    phase within each cycle. After a failure the device backs off exponentially
+    without affecting other devices. A poll still running at the cycle deadline
+    leaves the previous state in place and marks the device as late. Polls
+    wait for `limiter`, shared by all devices of the entry, before they start.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry: ConfigEntry,
+        wrapper: WinixDeviceWrapper,
+        scan_interval: int,
+    ) -> None:
+        """Initialize the device coordinator."""
+        self.wrapper = wrapper
+        self.scan_interval = scan_interval
+        self._failures = 0
+        self._retry_at = 0.0
+        self._poll_task: asyncio.Task | None = None
+        self.late_cycles = 0
+        self.limiter: asyncio.Semaphore | None = None
+        self.poll_latency: float | None = None  # Of the last finished poll
+
+        super().__init__(
+            hass,
+            LOGGER,
+            name=f"Winix {wrapper.device_stub.alias}",
+            update_interval=None,
+            config_entry=entry,
+        )
+
+    @property
+    def backing_off(self) -> bool:
+        """Return True while polls are skipped after failures."""
+        return time.monotonic() < self._retry_at
+
+    @property
+    def late(self) -> bool:
+        """Return True if the last poll missed the cycle deadline."""
+        return self.late_cycles > 0
+
+    @callback
+    def async_poll(self, delay: float) -> asyncio.Task | None:
+        """Start a poll after delay and return its task.
+
+        A poll carried over from the previous cycle is returned instead of
+        starting a new one. Returns None while backing off.
+        """
+        if self._poll_task is not None and not self._poll_task.done():
+            return self._poll_task
+
+        if self.backing_off:
+            return None
+
+        self._poll_task = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_poll(delay),
+            f"winix poll {self.wrapper.device_stub.id}",
+        )
+        return self._poll_task
+
+    @callback
+    def reset_backoff(self) -> None:
+        """Allow the next poll right away."""
+        self._failures = 0
+        self._retry_at = 0.0
+
+    @callback
+    def async_mark_late(self) -> None:
+        """Record a missed deadline; give up on polls late for too long."""
+        self.late_cycles += 1
+        LOGGER.debug("%s is late (%d cycles)", self.name, self.late_cycles)
+
+        if self.late_cycles > CYCLE_MAX_CARRIED and self._poll_task is not None:
+            self._poll_task.cancel()
+            self._poll_task = None
+
+    async def _async_poll(self, delay: float) -> None:
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self.limiter is None:
+            await self.async_refresh()
+        else:
+            async with self.limiter:
+                await self.async_refresh()
+        self.late_cycles = 0
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Poll the device."""
+        started = time.perf_counter()
+        try:
+            await self.wrapper.update()
+        except Exception as err:  # pylint: disable=broad-except
+            self.poll_latency = time.perf_counter() - started
+            self._failures += 1
+            backoff = min(
+                DEVICE_BACKOFF_MAX, self.scan_interval * 2 ** (self._failures - 1)
+            )
+            self._retry_at = time.monotonic() + backoff
+            raise UpdateFailed(
+                f"Failed to update {self.wrapper.device_stub.alias}, "
+                f"retrying in {backoff:.0f}s: {err}"
+            ) from err
+
+        self.poll_latency = time.perf_counter() - started
+        self._failures = 0
+        self._retry_at = 0.0
+        return self.wrapper.get_state()
+
+
 class WinixManager(DataUpdateCoordinator):
     """Representation of the Winix device manager."""
 
@@ -59,14 +228,52 @@ class WinixManager(DataUpdateCoordinator):
         auth_response: auth.WinixAuthResponse,
         scan_interval: int,
         client,
+        endpoint: WinixEndpoint = DEFAULT_ENDPOINT,
+        connection_stats: ConnectionStats | None = None,
+        supervisor: ConnectivitySupervisor | None = None,
     ) -> None:
         """Initialize the manager."""
 
         # Always initialize _device_wrappers in case async_prepare_devices_wrappers
         # was not invoked.
         self._device_wrappers: list[WinixDeviceWrapper] = []
+        self._device_coordinators: dict[str, WinixDeviceCoordinator] = {}
+        self._scan_interval = scan_interval
         self._auth_response = auth_response
         self._client = client
+        self._endpoint = endpoint
+        self.connection_stats = connection_stats or ConnectionStats()
+        self.supervisor = supervisor or ConnectivitySupervisor()
+        self.supervisor.probe = partial(async_probe_latency, client, endpoint)
+        self.supervisor.create_task = partial(entry.async_create_background_task, hass)
+        self._access_token = auth_response.access_token
+        self._token_expires_at = 0.0
+        self._uuid = ""
+        self._auth_lock = asyncio.Lock()
+        self._filter_alarms = FilterAlarmCache(client, endpoint)
+        self._scheduler = PollScheduler(scan_interval, POLL_SPREAD, POLL_JITTER)
+        self._staggered = False  # The first refresh polls all devices at once
+        self._cycle_deadline = scan_interval * CYCLE_DEADLINE_RATIO
+        self._fleet: FleetAggregate | None = None
+        self.watchdog: LoopLagWatchdog | None = (
+            LoopLagWatchdog() if entry.options.get(CONF_LOOP_WATCHDOG) else None
+        )
+        self.telemetry: TelemetryWriter | None = (
+            self._create_telemetry(hass, entry)
+            if entry.options.get(CONF_TELEMETRY)
+            else None
+        )
+        # Recording wraps the client and is only set up when the entry loads
+        self.recording = bool(entry.options.get(CONF_RECORD_TRAFFIC))
+        # Options in effect, to tell option changes from entry data updates
+        self.applied_options: dict[str, Any] = dict(entry.options)
+        self._request_timeout: float = entry.options.get(
+            CONF_REQUEST_TIMEOUT, DEFAULT_POST_TIMEOUT
+        )
+        self._debounce: float = entry.options.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE)
+        self._limiter = asyncio.Semaphore(
+            entry.options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        )
 
         super().__init__(
             hass,
@@ -78,7 +285,140 @@ class WinixManager(DataUpdateCoordinator):
 
     async def _async_update_data(self) -> None:
         """Fetch the latest data from the source. This overrides the method in DataUpdateCoordinator."""
-        await self.async_update()
+        with self.track("poll_cycle"):
+            try:
+                await self.async_update()
+            finally:
+                self._fleet = None
+
+    @staticmethod
+    def _create_telemetry(
+        hass: HomeAssistant, entry: ConfigEntry
+    ) -> TelemetryWriter:
+        """Return the telemetry sink of the entry in the config folder."""
+        return TelemetryWriter(
+            hass.config.path(TELEMETRY_DIR.format(entry.entry_id))
+        )
+
+    async def _async_flush_telemetry(self, now: datetime | None = None) -> None:
+        """Write recorded telemetry to disk."""
+        if self.telemetry is not None:
+            await self.hass.async_add_executor_job(self.telemetry.flush)
+
+    def track(self, label: str) -> AbstractContextManager[None]:
+        """Attribute event loop lag to label when the watchdog is enabled."""
+        if self.watchdog is None:
+            return nullcontext()
+        return self.watchdog.track(label)
+
+    def blocking(self, label: str) -> AbstractContextManager[None]:
+        """Time a synchronous block of Winix code when the watchdog is enabled."""
+        if self.watchdog is None:
+            return nullcontext()
+        return self.watchdog.blocking(label)
+
+    def executor(self, label: str) -> AbstractAsyncContextManager[None]:
+        """Time an awaited executor job when the watchdog is enabled."""
+        if self.watchdog is None:
+            return nullcontext()
+        return self.watchdog.executor(label)
+
+    def async_start(self) -> None:
+        """Start background tasks; they are stopped when the entry unloads."""
+        # Entities listen to their device coordinators; keep the cycle running
+        self.config_entry.async_on_unload(self.async_add_listener(lambda: None))
+        self.config_entry.async_on_unload(
+            self.supervisor.add_listener(self._handle_connectivity)
+        )
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self._async_refresh_filter_alarms,
+                timedelta(seconds=FILTER_ALARM_CACHE_TTL),
+            )
+        )
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self.async_rediscover,
+                timedelta(seconds=DISCOVERY_INTERVAL),
+            )
+        )
+        self.config_entry.async_on_unload(
+            async_track_time_interval(
+                self.hass,
+                self._async_flush_telemetry,
+                timedelta(seconds=TELEMETRY_FLUSH_INTERVAL),
+            )
+        )
+        self.config_entry.async_on_unload(self._async_flush_telemetry)
+
+    @callback
+    def _handle_connectivity(self, online: bool) -> None:
+        """Poll every device right away once the cloud is reachable again."""
+        if not online:
+            return
+
+        for coordinator in self._device_coordinators.values():
+            coordinator.reset_backoff()
+        self._staggered = False
+        self.config_entry.async_create_background_task(
+            self.hass, self.async_refresh(), "winix resume"
+        )
+
+    async def async_apply_options(self, options: Mapping[str, Any]) -> None:
+        """Apply the tuning options of the entry while running.
+
+        Takes effect from the next poll cycle, for existing and new devices;
+        the session, login and entities are kept. Polls already waiting for
+        the previous concurrency limit still finish under it.
+        """
+        self.applied_options = dict(options)
+        scan_interval = options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        self._scan_interval = scan_interval
+        self._scheduler.interval = scan_interval
+        self._cycle_deadline = scan_interval * CYCLE_DEADLINE_RATIO
+        self.update_interval = timedelta(seconds=scan_interval)
+
+        self._request_timeout = options.get(CONF_REQUEST_TIMEOUT, DEFAULT_POST_TIMEOUT)
+        self._debounce = options.get(CONF_DEBOUNCE, DEFAULT_DEBOUNCE)
+        self._limiter = asyncio.Semaphore(
+            options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY)
+        )
+        for wrapper in self._device_wrappers:
+            wrapper.set_request_options(self._request_timeout, self._debounce)
+        for coordinator in self._device_coordinators.values():
+            coordinator.scan_interval = scan_interval
+            coordinator.limiter = self._limiter
+
+        if not options.get(CONF_LOOP_WATCHDOG):
+            self.watchdog = None
+        elif self.watchdog is None:
+            self.watchdog = LoopLagWatchdog()
+
+        if not options.get(CONF_TELEMETRY):
+            if (telemetry := self.telemetry) is not None:
+                # Stop recording first, then write what was recorded so far
+                self.telemetry = None
+                await self.hass.async_add_executor_job(telemetry.flush)
+        elif self.telemetry is None:
+            self.telemetry = self._create_telemetry(self.hass, self.config_entry)
+
+        LOGGER.debug(
+            "Applied options: scan interval %ss, timeout %ss, concurrency %s, "
+            "debounce %ss, watchdog %s, telemetry %s",
+            scan_interval,
+            self._request_timeout,
+            options.get(CONF_MAX_CONCURRENCY, DEFAULT_MAX_CONCURRENCY),
+            self._debounce,
+            self.watchdog is not None,
+            self.telemetry is not None,
+        )
+
+    @property
+    def signal_devices_added(self) -> str:
+        """Return the dispatcher signal sent with newly discovered wrappers."""
+        return SIGNAL_DEVICES_ADDED.format(self.config_entry.entry_id)
 
     def update_features(self) -> None:
         """Update the supported features based on the current state."""
@@ -91,28 +431,335 @@ class WinixManager(DataUpdateCoordinator):
         Raises WinixException.
         """
         self._device_wrappers = []  # Reset device_stubs
+        self._device_coordinators = {}
 
         token = access_token or self._auth_response.access_token
-        uuid = WinixAccount(token).get_uuid()
-        device_stubs = await Helpers.get_device_stubs(self._client, token, uuid)
+        uuid = get_uuid(token)
+        device_stubs = await Helpers.get_device_stubs(
+            self._client, token, uuid, self._endpoint
+        )
+        self._set_token(token, uuid)
 
         if device_stubs:
             for device_stub in device_stubs:
-                self._device_wrappers.append(
-                    WinixDeviceWrapper(
-                        self._client, device_stub, LOGGER
-                    )
-                )
+                self._device_wrappers.append(self._create_wrapper(device_stub))
 
             LOGGER.info("%d purifiers found", len(self._device_wrappers))
+            await self._async_refresh_filter_alarms()
         else:
             LOGGER.info("No purifiers found")
 
+    def _set_token(self, access_token: str, uuid: str) -> None:
+        """Use a new access token for account requests."""
+        self._access_token = access_token
+        self._uuid = uuid
+        self._token_expires_at = (
+            access_token_expiry(access_token) or time.time() + ACCESS_TOKEN_LIFETIME
+        )
+
+    async def async_get_credentials(self) -> tuple[str, str]:
+        """Return the access token and uuid, renewing the token near expiry."""
+        if time.time() >= self._token_expires_at - ACCESS_TOKEN_REFRESH_MARGIN:
+            await self.async_renew_auth(self._access_token)
+        return self._access_token, self._uuid
+
+    async def _async_account_request(
+        self, request: Callable[[str, str], Awaitable[_T]]
+    ) -> _T:
+        """Run an account request, renewing a rejected access token once.
+
+        request is called with the access token and uuid.
+        """
+        access_token, uuid = await self.async_get_credentials()
+        try:
+            return await request(access_token, uuid)
+        except WinixException as err:
+            if err.result_code not in AUTH_RESULT_CODES:
+                raise
+            LOGGER.info("Access token rejected (code=%s), renewing", err.result_code)
+            if not await self.async_renew_auth(access_token):
+                raise
+
+        return await request(self._access_token, self._uuid)
+
+    async def async_renew_auth(self, stale_token: str) -> bool:
+        """Replace an expired or rejected access token.
+
+        The refresh token is tried first, then a login with the stored
+        credentials. New tokens are saved to the config entry. Returns False if
+        both failed; the stale token is kept then.
+        """
+        async with self._auth_lock:
+            if self._access_token != stale_token:
+                return True  # Renewed by a concurrent caller
+
+            try:
+                async with self.executor("refresh_auth"):
+                    response = await Helpers.async_refresh_auth(
+                        self.hass, self._auth_response, self._endpoint
+                    )
+            except WinixException as err:
+                LOGGER.info("Token refresh failed (%s), logging in again", err)
+                data = self.config_entry.data
+                try:
+                    async with self.executor("login"):
+                        response = await Helpers.async_login(
+                            self.hass,
+                            data[CONF_USERNAME],
+                            data[CONF_PASSWORD],
+                            self._endpoint,
+                        )
+                except WinixException as login_err:
+                    LOGGER.warning("Unable to renew the Winix login: %s", login_err)
+                    return False
+
+            self._auth_response.access_token = response.access_token
+            self._auth_response.refresh_token = response.refresh_token
+            self._auth_response.id_token = response.id_token
+            self._set_token(response.access_token, get_uuid(response.access_token))
+            data = {**self.config_entry.data, WINIX_AUTH_RESPONSE: self._auth_response}
+            self.hass.config_entries.async_update_entry(self.config_entry, data=data)
+            LOGGER.debug("Winix access token renewed")
+            return True
+
+    def _create_wrapper(self, device_stub: MyWinixDeviceStub) -> WinixDeviceWrapper:
+        """Create the wrapper for a device."""
+        wrapper = WinixDeviceWrapper(
+            self._client, device_stub, LOGGER, self._endpoint, self.supervisor
+        )
+        wrapper.set_request_options(self._request_timeout, self._debounce)
+        wrapper.set_blocking_monitor(self.blocking)
+        return wrapper
+
+    async def async_rediscover(self, now: datetime | None = None) -> None:
+        """Apply changes in the account's device list without a reload.
+
+        New devices get wrappers and entities, removed devices are retired from
+        the device registry and changed devices are updated in place. Wrappers of
+        unchanged devices, and their cached state, are left untouched.
+        """
+        if not self.supervisor.online:
+            return
+
+        try:
+            device_stubs = await self._async_account_request(
+                partial(
+                    Helpers.get_device_stubs, self._client, endpoint=self._endpoint
+                )
+            )
+        except WinixException as err:
+            LOGGER.warning("Device discovery failed: %s", err)
+            return
+
+        current = {
+            wrapper.device_stub.id: wrapper for wrapper in self._device_wrappers
+        }
+        latest = {device_stub.id: device_stub for device_stub in device_stubs}
+        device_registry = dr.async_get(self.hass)
+
+        removed = [
+            wrapper
+            for device_id, wrapper in current.items()
+            if device_id not in latest
+        ]
+        for wrapper in removed:
+            LOGGER.info("Device %s was removed", wrapper.device_stub.alias)
+            self._device_wrappers.remove(wrapper)
+            self._device_coordinators.pop(wrapper.device_stub.id, None)
+            device = device_registry.async_get_device(
+                identifiers={(WINIX_DOMAIN, wrapper.device_stub.mac.lower())}
+            )
+            if device:
+                device_registry.async_remove_device(device.id)
+
+        for device_id, device_stub in latest.items():
+            wrapper = current.get(device_id)
+            if wrapper is None or wrapper.device_stub == device_stub:
+                continue
+
+            LOGGER.info("Device %s was changed", device_stub.alias)
+            wrapper.update_device_stub(device_stub)
+            device = device_registry.async_get_device(
+                identifiers={(WINIX_DOMAIN, device_stub.mac.lower())}
+            )
+            if device:
+                device_registry.async_update_device(
+                    device.id,
+                    name=f"Winix {device_stub.alias}",
+                    model=device_stub.model,
+                    sw_version=device_stub.sw_version,
+                )
+
+        added = [
+            self._create_wrapper(device_stub)
+            for device_id, device_stub in latest.items()
+            if device_id not in current
+        ]
+        if not added:
+            return
+
+        LOGGER.info("%d new devices found", len(added))
+        self._device_wrappers.extend(added)
+        await self._async_refresh_filter_alarms()
+
+        await asyncio.gather(
+            *(self.get_device_coordinator(wrapper).async_refresh() for wrapper in added)
+        )
+
+        async_dispatcher_send(self.hass, self.signal_devices_added, added)
+
+    async def _async_refresh_filter_alarms(self, now: datetime | None = None) -> None:
+        """Refresh the filter alarm durations of all devices concurrently.
+
+        Failures are logged; devices keep their last or default durations.
+        """
+        if not self.supervisor.online:
+            return
+
+        try:
+            await self._async_account_request(
+                partial(
+                    self._filter_alarms.async_refresh,
+                    device_ids=[
+                        wrapper.device_stub.id for wrapper in self._device_wrappers
+                    ],
+                )
+            )
+        except Exception as err:  # pylint: disable=broad-except
+            # Filter alarms are optional and must not block setup
+            LOGGER.warning("Failed to refresh filter alarms: %s", err)
+
+        for wrapper in self._device_wrappers:
+            wrapper.filter_alarm_hours = self._filter_alarms.get_alarm_hours(
+                wrapper.device_stub.id
+            )
+
+    @callback
+    def get_device_coordinator(
+        self, wrapper: WinixDeviceWrapper
+    ) -> WinixDeviceCoordinator:
+        """Return the update channel of a device."""
+        device_id = wrapper.device_stub.id
+        coordinator = self._device_coordinators.get(device_id)
+        if coordinator is None:
+            coordinator = WinixDeviceCoordinator(
+                self.hass, self.config_entry, wrapper, self._scan_interval
+            )
+            coordinator.limiter = self._limiter
+            self._device_coordinators[device_id] = coordinator
+
+        return coordinator
+
     async def async_update(self, now=None) -> None:
-        """Asynchronously update all the devices."""
-        LOGGER.info("Updating devices")
-        for device_wrapper in self._device_wrappers:
-            await device_wrapper.update()
+        """Asynchronously update all the devices.
+
+        Each device is refreshed through its own coordinator at its own phase
+        within the cycle, so its entities are notified as soon as it answered and
+        a failing device only backs off itself. The cycle ends at its deadline;
+        devices that did not answer by then keep their previous state and their
+        request is carried into the next cycle. While the cloud is unreachable
+        no device is polled.
+        """
+        if not self.supervisor.online:
+            LOGGER.debug("Winix cloud unreachable, skipping poll cycle")
+            return
+
+        LOGGER.debug("Updating devices")
+        coordinators = [
+            self.get_device_coordinator(wrapper) for wrapper in self._device_wrappers
+        ]
+
+        tasks: dict[WinixDeviceCoordinator, asyncio.Task] = {}
+        for coordinator in coordinators:
+            delay = (
+                self._scheduler.delay(coordinator.wrapper.device_stub.id)
+                if self._staggered
+                else 0
+            )
+            if task := coordinator.async_poll(delay):
+                tasks[coordinator] = task
+
+        self._staggered = True
+
+        # Parameters refresh in the background, outside the cycle deadline
+        for wrapper in self._device_wrappers:
+            if wrapper.params_due:
+                self.config_entry.async_create_background_task(
+                    self.hass,
+                    wrapper.async_update_params(),
+                    f"winix params {wrapper.device_stub.id}",
+                )
+
+        if not tasks:
+            return
+
+        _, pending = await asyncio.wait(tasks.values(), timeout=self._cycle_deadline)
+
+        for coordinator, task in tasks.items():
+            if task in pending:
+                coordinator.async_mark_late()
+
+        if self.telemetry is not None:
+            self._record_telemetry(self.telemetry, tasks, pending)
+
+        if pending:
+            LOGGER.debug("%d devices missed the cycle deadline", len(pending))
+
+        if not any(coordinator.last_update_success for coordinator in coordinators):
+            raise UpdateFailed("Unable to update any device")
+
+    @staticmethod
+    def _record_telemetry(
+        telemetry: TelemetryWriter,
+        tasks: dict[WinixDeviceCoordinator, asyncio.Task],
+        pending: set[asyncio.Task],
+    ) -> None:
+        """Record the outcome of every poll of the cycle."""
+        now = time.time()
+        for coordinator, task in tasks.items():
+            if task in pending:
+                status, latency = STATUS_LATE, None
+            elif coordinator.last_update_success:
+                status, latency = STATUS_OK, coordinator.poll_latency
+            else:
+                status, latency = STATUS_ERROR, coordinator.poll_latency
+
+            state = coordinator.wrapper.get_state() or {}
+            telemetry.record(
+                now,
+                coordinator.wrapper.device_stub.id,
+                latency,
+                status,
+                state.get(ATTR_HUMIDITY),
+                state.get(ATTR_TARGET_HUMIDITY),
+                state.get(ATTR_MODE),
+            )
+
+    @property
+    def fleet(self) -> FleetAggregate:
+        """Return statistics across all devices as of the last poll cycle.
+
+        They are computed on first access after each cycle, so nothing is
+        done while no fleet sensor is enabled.
+        """
+        if self._fleet is None:
+            samples = FleetSamples()
+            for wrapper in self._device_wrappers:
+                state = wrapper.get_state() or {}
+                samples.append(
+                    wrapper.device_stub.alias,
+                    state.get(ATTR_HUMIDITY),
+                    state.get(ATTR_TARGET_HUMIDITY),
+                    bool(state) and wrapper.is_on,
+                )
+            self._fleet = compute_fleet_aggregate(samples)
+
+        return self._fleet
+
+    @property
+    def endpoint(self) -> WinixEndpoint:
+        """Return the Winix cloud endpoint in use."""
+        return self._endpoint
 
     def get_device_wrappers(self) -> list[WinixDeviceWrapper]:
         """Return the device wrapper objects."""
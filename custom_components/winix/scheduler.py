@@ -0,0 +1,49 @@
+"""Poll scheduling for Winix devices."""
+
+from __future__ import annotations
+
+from collections.abc import Callable
+import random
+import zlib
+
+
+class PollScheduler:
+    """Spread device polls across the scan interval.
+
+    Each device gets a phase offset derived from a hash of its ID, so polls of
+    all devices, across all config entries, are distributed over the interval
+    instead of bursting at the same tick. The offset is stable between cycles;
+    a small random jitter is added on every cycle.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        spread: float,
+        jitter: float,
+        rng: Callable[[], float] = random.random,
+    ) -> None:
+        """Create a scheduler.
+
+        `spread` is the share of the interval used for phases, leaving room for
+        the requests to complete before the next cycle starts.
+        """
+        self.interval = interval
+        self.spread = spread
+        self.jitter = jitter
+        self._rng = rng
+
+    @property
+    def window(self) -> float:
+        """Return the part of the interval over which phases are spread."""
+        return self.interval * self.spread
+
+    def phase(self, device_id: str) -> float:
+        """Return the deterministic offset of a device in seconds."""
+        fraction = zlib.crc32(device_id.encode()) / 0x1_0000_0000
+        return fraction * self.window
+
+    def delay(self, device_id: str) -> float:
+        """Return the delay of a device for the current cycle in seconds."""
+        jitter = self._rng() * self.jitter
+        return min(self.phase(device_id) + jitter, self.window)
@@ -2,50 +2,304 @@
 
 from __future__ import annotations
 
-from collections.abc import Mapping
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import time
 from typing import Any
 
 from homeassistant.components.sensor import (
     ENTITY_ID_FORMAT,
+    SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import PERCENTAGE
-from homeassistant.core import HomeAssistant
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.typing import StateType
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from . import WinixConfigEntry, WINIX_DOMAIN
 from .const import (
     ATTR_HUMIDITY,
     ATTR_TARGET_HUMIDITY,
     LOGGER,
+    PARAM_FILTER_USAGE_HOURS,
+    PARAM_OPERATING_HOURS,
+    PREDICTION_REFRESH_INTERVAL,
+    SENSOR_DRYING_RATE,
+    SENSOR_FILTER_LIFE,
+    SENSOR_FLEET_HUMIDITY_MAX,
+    SENSOR_FLEET_HUMIDITY_MEAN,
+    SENSOR_FLEET_HUMIDITY_MIN,
+    SENSOR_FLEET_HUMIDITY_P50,
+    SENSOR_FLEET_HUMIDITY_P90,
+    SENSOR_FLEET_OFF_TARGET,
+    SENSOR_FLEET_RUNNING,
+    SENSOR_FILTER_USAGE_HOURS,
     SENSOR_HUMIDITY,
+    SENSOR_HUMIDITY_ESTIMATE,
+    SENSOR_HUMIDITY_MAX,
+    SENSOR_HUMIDITY_MEAN,
+    SENSOR_HUMIDITY_MIN,
+    SENSOR_LOOP_LAG,
+    SENSOR_OPERATING_HOURS,
+    SENSOR_RAW,
     SENSOR_TARGET_HUMIDITY,
+    SENSOR_TIME_TO_TARGET,
+    SENSOR_TIMER,
 )
+from .aggregate import FleetAggregate, numpy_module
 from .device_wrapper import WinixDeviceWrapper
+from .filter_life import remaining_filter_life
 from .manager import WinixEntity, WinixManager
 
 
-SENSOR_DESCRIPTIONS: tuple[SensorEntityDescription, ...] = (
-    SensorEntityDescription(
+@dataclass(frozen=True, kw_only=True)
+class WinixSensorEntityDescription(SensorEntityDescription):
+    """Describes a Winix sensor and how often its state is published.
+
+    A new value is written when it moved at least `deadband` away from the last
+    published value and `min_interval` has passed since that write. The value is
+    always re-published once `heartbeat` has elapsed. Sensors with `predicted`
+    set are re-evaluated between polls as their value is extrapolated, and
+    sensors with a `param` make the device fetch its parameters; they are only
+    created for models whose capability profile declares that parameter.
+    """
+
+    value_fn: Callable[[WinixDeviceWrapper], StateType]
+    deadband: float = 0
+    min_interval: timedelta | None = None
+    heartbeat: timedelta | None = None
+    predicted: bool = False
+    param: str | None = None
+
+
+SENSOR_DESCRIPTIONS: tuple[WinixSensorEntityDescription, ...] = (
+    WinixSensorEntityDescription(
         key=SENSOR_HUMIDITY,
         icon="mdi:water-percent",
         name="Current Humidity",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda wrapper: wrapper.get_state().get(ATTR_HUMIDITY),
+        deadband=2,
+        heartbeat=timedelta(minutes=15),
     ),
-    SensorEntityDescription(
+    WinixSensorEntityDescription(
         key=SENSOR_TARGET_HUMIDITY,
         icon="mdi:target",
         name="Target Humidity",
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda wrapper: wrapper.get_state().get(ATTR_TARGET_HUMIDITY),
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_TIMER,
+        icon="mdi:timer-outline",
+        name="Timer",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        value_fn=lambda wrapper: _round(wrapper.predicted_timer_minutes, 0),
+        predicted=True,
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY_ESTIMATE,
+        icon="mdi:water-percent-alert",
+        name="Estimated Humidity",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        value_fn=lambda wrapper: _round(wrapper.estimated_humidity, 1),
+        deadband=0.5,
+        predicted=True,
+    ),
+    # Derived from the in-memory humidity history, never from the recorder
+    WinixSensorEntityDescription(
+        key=SENSOR_DRYING_RATE,
+        icon="mdi:trending-down",
+        name="Drying Rate",
+        native_unit_of_measurement=f"{PERCENTAGE}/h",
+        suggested_display_precision=1,
+        value_fn=lambda wrapper: _round(wrapper.drying_rate, 2),
+        deadband=0.5,
+        heartbeat=timedelta(minutes=15),
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_TIME_TO_TARGET,
+        icon="mdi:timer-sand",
+        name="Time To Target",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MINUTES,
+        suggested_display_precision=0,
+        value_fn=lambda wrapper: _round(wrapper.minutes_to_target, 0),
+        deadband=2,
+        heartbeat=timedelta(minutes=15),
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY_MIN,
+        icon="mdi:water-minus",
+        name="Humidity Minimum",
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda wrapper: wrapper.history.minimum,
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY_MAX,
+        icon="mdi:water-plus",
+        name="Humidity Maximum",
+        native_unit_of_measurement=PERCENTAGE,
+        value_fn=lambda wrapper: wrapper.history.maximum,
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY_MEAN,
+        icon="mdi:water-percent",
+        name="Humidity Mean",
+        native_unit_of_measurement=PERCENTAGE,
+        suggested_display_precision=1,
+        value_fn=lambda wrapper: _round(wrapper.history.mean, 1),
+        deadband=1,
+        heartbeat=timedelta(minutes=15),
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_FILTER_LIFE,
+        icon="mdi:air-filter",
+        name="Filter Life",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda wrapper: _filter_life(wrapper),
+    ),
+    # Device parameters, fetched lazily and much less often than the state.
+    # No profile declares their codes yet, so these are not created until one
+    # does with codes confirmed against a device.
+    WinixSensorEntityDescription(
+        key=SENSOR_FILTER_USAGE_HOURS,
+        icon="mdi:air-filter",
+        name="Filter Usage",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda wrapper: wrapper.get_params().get(PARAM_FILTER_USAGE_HOURS),
+        param=PARAM_FILTER_USAGE_HOURS,
+    ),
+    WinixSensorEntityDescription(
+        key=SENSOR_OPERATING_HOURS,
+        icon="mdi:clock-outline",
+        name="Operating Hours",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.HOURS,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+        value_fn=lambda wrapper: wrapper.get_params().get(PARAM_OPERATING_HOURS),
+        param=PARAM_OPERATING_HOURS,
+    ),
+)
+
+
+@dataclass(frozen=True, kw_only=True)
+class WinixFleetSensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor computed across all devices of an entry."""
+
+    value_fn: Callable[[FleetAggregate], StateType]
+    attributes_fn: Callable[[FleetAggregate], Mapping[str, Any]] | None = None
+
+
+# Aggregates over the whole fleet, computed once per poll cycle by the manager
+FLEET_SENSOR_DESCRIPTIONS: tuple[WinixFleetSensorEntityDescription, ...] = (
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_HUMIDITY_MEAN,
+        icon="mdi:water-percent",
+        name="Fleet Humidity Mean",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: _round(fleet.humidity_mean, 1),
+        attributes_fn=lambda fleet: {
+            "devices": fleet.devices,
+            "reporting": fleet.reporting,
+        },
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_HUMIDITY_MIN,
+        icon="mdi:water-minus",
+        name="Fleet Humidity Minimum",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: fleet.humidity_min,
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_HUMIDITY_MAX,
+        icon="mdi:water-plus",
+        name="Fleet Humidity Maximum",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: fleet.humidity_max,
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_HUMIDITY_P50,
+        icon="mdi:water-percent",
+        name="Fleet Humidity Median",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: _round(fleet.percentiles.get(50), 1),
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_HUMIDITY_P90,
+        icon="mdi:water-percent-alert",
+        name="Fleet Humidity 90th Percentile",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: _round(fleet.percentiles.get(90), 1),
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_RUNNING,
+        icon="mdi:air-humidifier",
+        name="Fleet Running",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: fleet.running,
+    ),
+    WinixFleetSensorEntityDescription(
+        key=SENSOR_FLEET_OFF_TARGET,
+        icon="mdi:target-variant",
+        name="Fleet Largest Target Deviation",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_registry_enabled_default=False,
+        value_fn=lambda fleet: fleet.off_target[0][1] if fleet.off_target else None,
+        attributes_fn=lambda fleet: {
+            "devices": {name: deviation for name, deviation in fleet.off_target}
+        },
     ),
 )
 
 
+def _filter_life(wrapper: WinixDeviceWrapper) -> int | None:
+    """Return the remaining filter life from the cached alarm duration."""
+    if wrapper.filter_alarm_hours is None:
+        return None
+
+    return remaining_filter_life(
+        wrapper.device_stub.filter_replace_date, wrapper.filter_alarm_hours
+    )
+
+
+def _round(value: float | None, digits: int) -> float | None:
+    """Round value unless it is None."""
+    return None if value is None else round(value, digits)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: WinixConfigEntry,
@@ -54,23 +308,61 @@ async def async_setup_entry(
     """Set up the Winix dehumidifier sensors."""
     manager = entry.runtime_data
 
-    entities = [
-        WinixSensor(wrapper, manager, description)
-        for description in SENSOR_DESCRIPTIONS
-        for wrapper in manager.get_device_wrappers()
-    ]
-    async_add_entities(entities)
-    LOGGER.info("Added %s sensors", len(entities))
+    @callback
+    def _async_add_wrappers(wrappers: list[WinixDeviceWrapper]) -> None:
+        entities: list[SensorEntity] = [
+            WinixSensor(wrapper, manager, description)
+            for description in SENSOR_DESCRIPTIONS
+            for wrapper in wrappers
+            if description.param is None
+            or description.param in wrapper.profile.params
+        ]
+        # Codes the model profile does not know, e.g. from newer firmware
+        entities.extend(
+            WinixRawSensor(wrapper, manager, code)
+            for wrapper in wrappers
+            for code in wrapper.raw_attributes.unknown_codes()
+        )
+        async_add_entities(entities)
+        LOGGER.info("Added %s sensors", len(entities))
+
+    _async_add_wrappers(manager.get_device_wrappers())
+    async_add_entities(
+        [
+            WinixFleetSensor(manager, description)
+            for description in FLEET_SENSOR_DESCRIPTIONS
+        ]
+    )
+
+    lag_sensor: list[WinixLoopLagSensor] = []
+
+    @callback
+    def _async_add_lag_sensor() -> None:
+        # The watchdog can be turned on in the options without a reload
+        if manager.watchdog is not None and not lag_sensor:
+            lag_sensor.append(WinixLoopLagSensor(manager))
+            async_add_entities(lag_sensor)
+
+    _async_add_lag_sensor()
+    entry.async_on_unload(manager.async_add_listener(_async_add_lag_sensor))
+
+    entry.async_on_unload(
+        async_dispatcher_connect(
+            hass, manager.signal_devices_added, _async_add_wrappers
+        )
+    )
 
 
 class WinixSensor(WinixEntity, SensorEntity):
     """Representation of a Winix Dehumidifier sensor."""
 
+    entity_description: WinixSensorEntityDescription
+
     def __init__(
         self,
         wrapper: WinixDeviceWrapper,
         coordinator: WinixManager,
-        description: SensorEntityDescription,
+        description: WinixSensorEntityDescription,
     ) -> None:
         """Initialize the sensor."""
         super().__init__(wrapper, coordinator)
@@ -80,18 +372,188 @@ class WinixSensor(WinixEntity, SensorEntity):
             f"{WINIX_DOMAIN}_{description.key.lower()}_{self._mac}"
         )
 
+        self._published_value: StateType = self._read_value()
+        self._published_available: bool | None = None
+        self._published_at: float | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to updates."""
+        await super().async_added_to_hass()
+
+        if self.entity_description.param is not None:
+            self.async_on_remove(self.device_wrapper.request_params())
+
+        if self.entity_description.predicted:
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_refresh_prediction,
+                    timedelta(seconds=PREDICTION_REFRESH_INTERVAL),
+                )
+            )
+
+    @callback
+    def _async_refresh_prediction(self, now: datetime) -> None:
+        """Re-evaluate an extrapolated value between polls."""
+        self._handle_coordinator_update()
+
     @property
     def native_value(self) -> StateType:
-        """Return the state of the sensor."""
-        state = self.device_wrapper.get_state()
+        """Return the last published state of the sensor."""
+        return self._published_value
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Publish the new value only if the publishing policy allows it."""
+        value = self._read_value()
+        available = self.available
+        now = time.monotonic()
+
+        if available != self._published_available or self._should_publish(
+            value, now
+        ):
+            self._published_value = value
+            self._published_available = available
+            self._published_at = now
+            self.async_write_ha_state()
+
+    def _should_publish(self, value: StateType, now: float) -> bool:
+        """Return True if value should be written to the state machine."""
+        description = self.entity_description
+        last_value = self._published_value
+
+        if self._published_at is None:
+            return True
+
+        elapsed = now - self._published_at
+        if description.heartbeat and elapsed >= description.heartbeat.total_seconds():
+            return True
+
+        if value == last_value:
+            return False
+
+        if (
+            description.deadband
+            and isinstance(value, (int, float))
+            and isinstance(last_value, (int, float))
+            and abs(value - last_value) < description.deadband
+        ):
+            return False
 
-        if state is None:
+        if description.min_interval and elapsed < description.min_interval.total_seconds():
+            return False
+
+        return True
+
+    def _read_value(self) -> StateType:
+        """Return the current value of the sensor from the device state."""
+        if self.device_wrapper.get_state() is None:
             return None
 
-        if self.entity_description.key == SENSOR_HUMIDITY:
-            return state.get(ATTR_HUMIDITY)
+        return self.entity_description.value_fn(self.device_wrapper)
 
-        if self.entity_description.key == SENSOR_TARGET_HUMIDITY:
-            return state.get(ATTR_TARGET_HUMIDITY)
 
-        return None
+class WinixRawSensor(WinixEntity, SensorEntity):
+    """Passthrough of a payload code the model profile does not decode."""
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self, wrapper: WinixDeviceWrapper, coordinator: WinixManager, code: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(wrapper, coordinator)
+        self._code = code
+        self._attr_name = f"Raw {code}"
+        self._attr_unique_id = ENTITY_ID_FORMAT.format(
+            f"{WINIX_DOMAIN}_{SENSOR_RAW}_{code.lower()}_{self._mac}"
+        )
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value of the code from the last poll."""
+        return self.device_wrapper.raw_attributes.get(self._code)
+
+
+class WinixLoopLagSensor(CoordinatorEntity[WinixManager], SensorEntity):
+    """Event loop time blocked by Winix code during the last poll cycle.
+
+    Lag measured over the whole cycle includes everything else running on the
+    loop, so it is only reported as an attribute.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(self, coordinator: WinixManager) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_name = "Winix event loop lag"
+        self._attr_unique_id = f"{WINIX_DOMAIN}_{SENSOR_LOOP_LAG}_{entry_id}"
+
+    @property
+    def available(self) -> bool:
+        """Return False while the watchdog is turned off in the options."""
+        return super().available and self.coordinator.watchdog is not None
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the longest Winix blocking block of the last poll cycle."""
+        if (watchdog := self.coordinator.watchdog) is None:
+            return None
+        stats = watchdog.stats.get("poll_cycle")
+        return None if stats is None else round(stats.last_max_blocked * 1000, 1)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any]:
+        """Return the cycle-wide loop lag and Winix blocking per code path, in ms."""
+        if (watchdog := self.coordinator.watchdog) is None:
+            return {}
+        attributes: dict[str, Any] = {}
+        if (cycle := watchdog.stats.get("poll_cycle")) is not None:
+            # Any code on the loop can cause this, not only Winix
+            attributes["loop_lag_during_poll"] = round(cycle.last_max_lag * 1000, 1)
+        attributes["blocked"] = {
+            label: round(stats.max_blocked * 1000, 1)
+            for label, stats in watchdog.stats.items()
+        }
+        return attributes
+
+
+class WinixFleetSensor(CoordinatorEntity[WinixManager], SensorEntity):
+    """Statistic across all devices of an entry, updated once per poll cycle."""
+
+    entity_description: WinixFleetSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: WinixManager,
+        description: WinixFleetSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator)
+        self.entity_description = description
+        entry_id = coordinator.config_entry.entry_id
+        self._attr_name = f"Winix {description.name}"
+        self._attr_unique_id = f"{WINIX_DOMAIN}_{description.key}_{entry_id}"
+
+    async def async_added_to_hass(self) -> None:
+        """Import numpy, if installed, before the first aggregate is computed."""
+        await self.hass.async_add_import_executor_job(numpy_module)
+        await super().async_added_to_hass()
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the statistic of the last poll cycle."""
+        return self.entity_description.value_fn(self.coordinator.fleet)
+
+    @property
+    def extra_state_attributes(self) -> Mapping[str, Any] | None:
+        """Return additional details of the statistic."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator.fleet)
@@ -0,0 +1,133 @@
+"""HTTP connection pool dedicated to the Winix cloud."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import asdict, dataclass
+from types import SimpleNamespace
+
+import aiohttp
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant
+from homeassistant.util.ssl import get_default_context
+
+from .connectivity import ConnectivitySupervisor
+from .const import (
+    CONNECT_TIMEOUT,
+    CONNECTION_LIMIT,
+    CONNECTION_LIMIT_PER_HOST,
+    DEFAULT_POST_TIMEOUT,
+    DNS_CACHE_TTL,
+    KEEPALIVE_TIMEOUT,
+)
+
+
+@dataclass
+class ConnectionStats:
+    """Counters collected from aiohttp request tracing."""
+
+    requests: int = 0
+    request_errors: int = 0
+    connections_created: int = 0
+    connections_reused: int = 0
+    dns_lookups: int = 0
+    dns_cache_hits: int = 0
+
+    @property
+    def reuse_ratio(self) -> float | None:
+        """Return the share of requests served by a pooled connection."""
+        total = self.connections_created + self.connections_reused
+        return None if total == 0 else self.connections_reused / total
+
+    def as_dict(self) -> dict[str, float | int | None]:
+        """Return the counters for diagnostics."""
+        return {**asdict(self), "reuse_ratio": self.reuse_ratio}
+
+
+def _build_trace_config(
+    stats: ConnectionStats, supervisor: ConnectivitySupervisor | None = None
+) -> aiohttp.TraceConfig:
+    """Build a TraceConfig updating stats and reporting to the supervisor."""
+    trace_config = aiohttp.TraceConfig()
+
+    async def on_request_start(session, context: SimpleNamespace, params) -> None:
+        stats.requests += 1
+
+    async def on_request_end(session, context: SimpleNamespace, params) -> None:
+        if supervisor is not None:
+            supervisor.record_success()
+
+    async def on_request_exception(session, context: SimpleNamespace, params) -> None:
+        stats.request_errors += 1
+        if supervisor is not None and isinstance(
+            params.exception, (aiohttp.ClientConnectionError, asyncio.TimeoutError)
+        ):
+            supervisor.record_failure()
+
+    async def on_connection_create_end(session, context, params) -> None:
+        stats.connections_created += 1
+
+    async def on_connection_reuseconn(session, context, params) -> None:
+        stats.connections_reused += 1
+
+    async def on_dns_resolvehost_end(session, context, params) -> None:
+        stats.dns_lookups += 1
+
+    async def on_dns_cache_hit(session, context, params) -> None:
+        stats.dns_cache_hits += 1
+
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    trace_config.on_connection_create_end.append(on_connection_create_end)
+    trace_config.on_connection_reuseconn.append(on_connection_reuseconn)
+    trace_config.on_dns_resolvehost_end.append(on_dns_resolvehost_end)
+    trace_config.on_dns_cache_hit.append(on_dns_cache_hit)
+    return trace_config
+
+
+class WinixClientSession:
+    """Client session tuned for the Winix hosts.
+
+    Connections are kept alive between polls and DNS answers are cached, so a
+    poll cycle rarely pays for a TLS handshake or a lookup. The session is closed
+    on unload, or when Home Assistant closes.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Create the connection pool."""
+        self.stats = ConnectionStats()
+        self.supervisor = ConnectivitySupervisor()
+
+        connector = aiohttp.TCPConnector(
+            limit=CONNECTION_LIMIT,
+            limit_per_host=CONNECTION_LIMIT_PER_HOST,
+            ttl_dns_cache=DNS_CACHE_TTL,
+            keepalive_timeout=KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+            ssl=get_default_context(),
+        )
+        self.client = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(
+                total=DEFAULT_POST_TIMEOUT, connect=CONNECT_TIMEOUT
+            ),
+            trace_configs=[_build_trace_config(self.stats, self.supervisor)],
+        )
+
+        self._unsub_close = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, self._async_handle_close
+        )
+
+    async def _async_handle_close(self, event: Event) -> None:
+        self._unsub_close = None
+        await self.client.close()
+
+    async def async_close(self) -> None:
+        """Close the pooled connections."""
+        await self.supervisor.async_close()
+        if self._unsub_close is not None:
+            self._unsub_close()
+            self._unsub_close = None
+        await self.client.close()
@@ -0,0 +1,433 @@
+"""Append-only binary log of poll timings and humidity samples.
+
+Each poll of a device is one fixed-width little-endian record:
+
+    timestamp  float64  unix time of the poll cycle
+    latency    float32  seconds until the device answered, NaN when late
+    device     uint16   index into "devices" of index.json
+    status     uint8    STATUS_OK, STATUS_ERROR or STATUS_LATE
+    humidity   uint8    percent, MISSING when not reported
+    target     uint8    percent, MISSING when not reported
+    mode       uint8    index into "modes" of index.json, MISSING when unknown
+    (2 bytes padding)
+
+Records are appended to numbered files in a directory; a file is closed
+after `file_records` records and the oldest files beyond `max_files` are
+deleted. The reader memory-maps the files, using NumPy when it is installed
+and struct otherwise, so summaries over millions of records need neither
+parsing nor a copy of the files.
+"""
+
+from __future__ import annotations
+
+from collections import Counter
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+import json
+import math
+import mmap
+import os
+from pathlib import Path
+import struct
+import threading
+from types import ModuleType
+from typing import Any
+
+from .aggregate import numpy_module, percentile_of
+from .const import TELEMETRY_FILE_RECORDS, TELEMETRY_MAX_FILES, TELEMETRY_PERCENTILES
+
+RECORD = struct.Struct("<dfHBBBBxx")
+MISSING = 0xFF
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+STATUS_LATE = 2
+
+INDEX_FILE = "index.json"
+FILE_SUFFIX = ".bin"
+
+NAN = float("nan")
+
+# Records unpacked per slice of a map when NumPy is not installed
+READ_BLOCK = 65536
+
+
+def record_dtype(np: ModuleType) -> Any:
+    """Return the NumPy dtype of a record."""
+    return np.dtype(
+        [
+            ("timestamp", "<f8"),
+            ("latency", "<f4"),
+            ("device", "<u2"),
+            ("status", "u1"),
+            ("humidity", "u1"),
+            ("target", "u1"),
+            ("mode", "u1"),
+            ("padding", "V2"),
+        ]
+    )
+
+
+def _percent(value: Any) -> int:
+    """Return value as a stored percentage."""
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return MISSING
+    return number if 0 <= number < MISSING else MISSING
+
+
+def data_files(directory: Path) -> list[Path]:
+    """Return the record files of a directory, oldest first."""
+    return sorted(directory.glob(f"*{FILE_SUFFIX}"))
+
+
+def load_index(directory: Path) -> dict[str, list[str]]:
+    """Return the device and mode names records refer to by index."""
+    try:
+        data = json.loads((directory / INDEX_FILE).read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        data = {}
+    return {"devices": data.get("devices", []), "modes": data.get("modes", [])}
+
+
+class TelemetryWriter:
+    """Collect poll samples and append them to the record files.
+
+    Recording is cheap and happens on the event loop; `flush()` packs and
+    writes the records and should run in an executor. Flushes are serialized,
+    so records reach the files in the order they were recorded.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        file_records: int = TELEMETRY_FILE_RECORDS,
+        max_files: int = TELEMETRY_MAX_FILES,
+    ) -> None:
+        """Write into directory, continuing an existing log."""
+        self.directory = Path(directory)
+        self.file_records = file_records
+        self.max_files = max_files
+        self._pending: list[tuple[Any, ...]] = []
+        self._devices: dict[str, int] | None = None  # Loaded on first flush
+        self._modes: dict[str, int] = {}
+        self._flush_lock = threading.Lock()
+
+    def record(
+        self,
+        timestamp: float,
+        device_id: str,
+        latency: float | None,
+        status: int,
+        humidity: Any,
+        target: Any,
+        mode: str | None,
+    ) -> None:
+        """Queue the sample of one device poll."""
+        self._pending.append(
+            (timestamp, device_id, latency, status, humidity, target, mode)
+        )
+
+    def flush(self) -> int:
+        """Append queued records and return how many were written."""
+        with self._flush_lock:
+            return self._flush()
+
+    def _flush(self) -> int:
+        samples, self._pending = self._pending, []
+        if not samples:
+            return 0
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self._devices is None:
+            index = load_index(self.directory)
+            self._devices = {name: i for i, name in enumerate(index["devices"])}
+            self._modes = {name: i for i, name in enumerate(index["modes"])}
+        known = (len(self._devices), len(self._modes))
+
+        buffer = bytearray(RECORD.size * len(samples))
+        for index, sample in enumerate(samples):
+            timestamp, device_id, latency, status, humidity, target, mode = sample
+            RECORD.pack_into(
+                buffer,
+                index * RECORD.size,
+                timestamp,
+                NAN if latency is None else latency,
+                self._devices.setdefault(device_id, len(self._devices)),
+                status,
+                _percent(humidity),
+                _percent(target),
+                MISSING if mode is None else self._mode_index(mode),
+            )
+
+        if known != (len(self._devices), len(self._modes)):
+            self._save_index()
+        self._append(buffer)
+        return len(samples)
+
+    def _mode_index(self, mode: str) -> int:
+        index = self._modes.setdefault(mode, len(self._modes))
+        return index if index < MISSING else MISSING
+
+    def _save_index(self) -> None:
+        path = self.directory / INDEX_FILE
+        temp = path.with_suffix(".tmp")
+        index = {"devices": list(self._devices or {}), "modes": list(self._modes)}
+        temp.write_text(json.dumps(index), encoding="utf-8")
+        os.replace(temp, path)
+
+    def _append(self, buffer: bytearray) -> None:
+        """Write whole records, starting a new file when the current one is full."""
+        limit = self.file_records * RECORD.size
+        files = data_files(self.directory)
+        view = memoryview(buffer)
+        while view:
+            size = files[-1].stat().st_size if files else limit
+            if size < limit:
+                path = files[-1]
+                if torn := size % RECORD.size:
+                    # Drop a partial record left by an interrupted write
+                    os.truncate(path, size - torn)
+                room = limit - size + torn
+            else:
+                number = int(files[-1].stem) + 1 if files else 1
+                path = self.directory / f"{number:06d}{FILE_SUFFIX}"
+                files.append(path)
+                room = limit
+
+            with path.open("ab") as file:
+                file.write(view[:room])
+            view = view[room:]
+
+        for path in files[: -self.max_files]:
+            path.unlink(missing_ok=True)
+
+
+@dataclass(frozen=True, slots=True)
+class TelemetrySummary:
+    """Statistics over the records of a telemetry log.
+
+    Latency percentiles are in seconds and cover successful polls only.
+    """
+
+    records: int
+    errors: int
+    late: int
+    first: float | None = None
+    last: float | None = None
+    latency: dict[int, float] = field(default_factory=dict)
+    humidity: dict[int, float] = field(default_factory=dict)
+    devices: dict[str, int] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the summary as JSON serializable data."""
+        return asdict(self)
+
+
+class TelemetryReader:
+    """Memory-mapped access to the record files of a telemetry log."""
+
+    def __init__(self, directory: str | os.PathLike) -> None:
+        """Read the log in directory."""
+        self.directory = Path(directory)
+        index = load_index(self.directory)
+        self.devices: list[str] = index["devices"]
+        self.modes: list[str] = index["modes"]
+
+    def __iter__(self) -> Iterator[tuple[Any, ...]]:
+        """Iterate over all records as tuples in RECORD order, oldest first."""
+        block = READ_BLOCK * RECORD.size
+        for path in data_files(self.directory):
+            with _map_records(path) as mapped:
+                if mapped is None:
+                    continue
+                end = len(mapped) - len(mapped) % RECORD.size
+                for offset in range(0, end, block):
+                    chunk = mapped[offset : min(end, offset + block)]  # A copy
+                    yield from RECORD.iter_unpack(chunk)
+
+    def summary(
+        self,
+        percentiles: Sequence[int] = TELEMETRY_PERCENTILES,
+        since: float | None = None,
+        device: str | None = None,
+    ) -> TelemetrySummary:
+        """Summarize records from `since` (unix time) on, of one or all devices."""
+        device_index: int | None = None
+        if device is not None:
+            if device not in self.devices:
+                return TelemetrySummary(records=0, errors=0, late=0)
+            device_index = self.devices.index(device)
+
+        if (numpy := numpy_module()) is not None:
+            return self._summary_numpy(numpy, percentiles, since, device_index)
+        return self._summary_python(percentiles, since, device_index)
+
+    def _summary_numpy(
+        self,
+        np: ModuleType,
+        percentiles: Sequence[int],
+        since: float | None,
+        device_index: int | None,
+    ) -> TelemetrySummary:
+        dtype = record_dtype(np)
+        latencies: list[Any] = []
+        humidities: list[Any] = []
+        devices: Counter[int] = Counter()
+        errors = late = 0
+        first: float | None = None
+        last: float | None = None
+
+        for path in data_files(self.directory):
+            with _map_records(path) as mapped:
+                if mapped is None:
+                    continue
+                # Views of the map must be gone before it is closed, so each
+                # file is reduced to copies in a function of its own.
+                count = len(mapped) // RECORD.size
+                part = _reduce_numpy(
+                    np,
+                    np.frombuffer(mapped, dtype=dtype, count=count),
+                    since,
+                    device_index,
+                )
+            if part is None:
+                continue
+
+            span, status_counts, latency, humidity, device_counts = part
+            first = span[0] if first is None else first
+            last = span[1]
+            errors += status_counts[STATUS_ERROR]
+            late += status_counts[STATUS_LATE]
+            latencies.append(latency)
+            humidities.append(humidity)
+            devices.update(device_counts)
+
+        if not devices:
+            return TelemetrySummary(records=0, errors=0, late=0)
+
+        return TelemetrySummary(
+            records=sum(devices.values()),
+            errors=errors,
+            late=late,
+            first=first,
+            last=last,
+            latency=_numpy_percentiles(np, np.concatenate(latencies), percentiles),
+            humidity=_numpy_percentiles(np, np.concatenate(humidities), percentiles),
+            devices={
+                self._device_name(index): count
+                for index, count in sorted(devices.items())
+            },
+        )
+
+    def _summary_python(
+        self,
+        percentiles: Sequence[int],
+        since: float | None,
+        device_index: int | None,
+    ) -> TelemetrySummary:
+        latencies: list[float] = []
+        humidities: list[float] = []
+        devices: Counter[int] = Counter()
+        errors = late = 0
+        first: float | None = None
+        last: float | None = None
+
+        for timestamp, latency, device, status, humidity, _, _ in self:
+            if since is not None and timestamp < since:
+                continue
+            if device_index is not None and device != device_index:
+                continue
+
+            first = timestamp if first is None else first
+            last = timestamp
+            devices[device] += 1
+            if status == STATUS_OK:
+                latencies.append(latency)
+            elif status == STATUS_ERROR:
+                errors += 1
+            elif status == STATUS_LATE:
+                late += 1
+            if humidity != MISSING:
+                humidities.append(humidity)
+
+        return TelemetrySummary(
+            records=sum(devices.values()),
+            errors=errors,
+            late=late,
+            first=first,
+            last=last,
+            latency=_python_percentiles(latencies, percentiles),
+            humidity=_python_percentiles(humidities, percentiles),
+            devices={
+                self._device_name(index): count
+                for index, count in sorted(devices.items())
+            },
+        )
+
+    def _device_name(self, index: int) -> str:
+        return self.devices[index] if index < len(self.devices) else str(index)
+
+
+@contextmanager
+def _map_records(path: Path) -> Iterator[mmap.mmap | None]:
+    """Map a record file read-only; None when it holds no full record."""
+    if path.stat().st_size < RECORD.size:
+        yield None
+        return
+
+    with path.open("rb") as file, mmap.mmap(
+        file.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mapped:
+        yield mapped
+
+
+def _reduce_numpy(
+    np: ModuleType, records: Any, since: float | None, device_index: int | None
+) -> tuple[tuple[float, float], Counter[int], Any, Any, dict[int, int]] | None:
+    """Reduce the records of one file to copies of what a summary needs."""
+    if since is not None:
+        records = records[records["timestamp"] >= since]
+    if device_index is not None:
+        records = records[records["device"] == device_index]
+    if not len(records):
+        return None
+
+    status = records["status"]
+    humidity = records["humidity"]
+    devices = np.bincount(records["device"])
+    return (
+        (float(records["timestamp"][0]), float(records["timestamp"][-1])),
+        Counter(dict(enumerate(np.bincount(status, minlength=3).tolist()))),
+        records["latency"][status == STATUS_OK].astype(np.float64),
+        humidity[humidity != MISSING].astype(np.float64),
+        {index: int(count) for index, count in enumerate(devices) if count},
+    )
+
+
+def _numpy_percentiles(
+    np: ModuleType, values: Any, percentiles: Sequence[int]
+) -> dict[int, float]:
+    values = values[~np.isnan(values)]
+    if not values.size:
+        return {}
+    return dict(
+        zip(
+            percentiles,
+            (float(value) for value in np.percentile(values, percentiles)),
+            strict=True,
+        )
+    )
+
+
+def _python_percentiles(
+    values: list[float], percentiles: Sequence[int]
+) -> dict[int, float]:
+    ordered = sorted(value for value in values if not math.isnan(value))
+    if not ordered:
+        return {}
+    return {
+        percentile: percentile_of(ordered, percentile) for percentile in percentiles
+    }
@@ -0,0 +1,283 @@
+"""Record and replay Winix cloud traffic.
+
+A capture is a gzip file of JSON lines, one per request:
+{"m": method, "u": url, "h": request hash, "s": status, "t": elapsed seconds,
+"x": text body} with "b" (base64) instead of "x" for binary bodies such as
+encrypted mobile RPC responses. Request bodies are not stored since they carry
+access tokens; "h" is a hash of the body without its credentials, so requests
+to the same URL for different devices replay their own responses.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+from collections import defaultdict, deque
+from collections.abc import Iterable
+import gzip
+import hashlib
+import json
+import os
+import time
+from typing import Any
+
+import aiohttp
+
+from .core import codec
+
+# Request fields that change with the login and are left out of request hashes
+CREDENTIAL_FIELDS = frozenset({"accessToken", "uuid", "refreshToken", "idToken"})
+
+
+class TrafficNotRecorded(aiohttp.ClientError):
+    """Raised on replay when a request is not in the capture."""
+
+
+class TrafficResponse:
+    """Response served from a buffered body.
+
+    Supports the subset of aiohttp.ClientResponse used by the integration.
+    """
+
+    def __init__(self, method: str, url: str, status: int, body: bytes) -> None:
+        """Create a response with an already read body."""
+        self.method = method
+        self.url = url
+        self.status = status
+        self._body = body
+        self.content = _BufferedContent(body)
+
+    async def read(self) -> bytes:
+        """Return the response body."""
+        return self._body
+
+    async def text(self, encoding: str = "utf-8") -> str:
+        """Return the response body as text."""
+        return self._body.decode(encoding)
+
+    async def json(self, **kwargs: Any) -> Any:
+        """Return the response body decoded as JSON."""
+        return json.loads(self._body)
+
+    def raise_for_status(self) -> None:
+        """Raise aiohttp.ClientResponseError for error statuses."""
+        if self.status >= 400:
+            raise aiohttp.ClientResponseError(
+                None,  # type: ignore[arg-type]
+                (),
+                status=self.status,
+                message=f"{self.method} {self.url} returned {self.status}",
+            )
+
+    def release(self) -> None:
+        """Nothing to release, the body is buffered."""
+
+
+class _BufferedContent:
+    """Stand-in for ClientResponse.content."""
+
+    def __init__(self, body: bytes) -> None:
+        self._body = body
+
+    async def read(self, n: int = -1) -> bytes:
+        return self._body
+
+
+def request_hash(request: dict[str, Any]) -> str:
+    """Return a stable hash of the body of request kwargs, "" without a body.
+
+    Encrypted mobile RPC bodies are decrypted and hashed without credentials.
+    """
+    body = request.get("data", request.get("json"))
+    if body is None:
+        return ""
+
+    if isinstance(body, str):
+        body = body.encode("utf-8")
+    if isinstance(body, (bytes, bytearray)):
+        try:
+            fields = json.loads(codec.decrypt(bytes(body)))
+        except (ImportError, ValueError):
+            fields = base64.b64encode(body).decode("ascii")
+    else:
+        fields = body
+
+    if isinstance(fields, dict):
+        fields = {k: v for k, v in fields.items() if k not in CREDENTIAL_FIELDS}
+    canonical = json.dumps(fields, sort_keys=True, default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:16]
+
+
+def encode_record(
+    method: str,
+    url: str,
+    status: int,
+    body: bytes,
+    elapsed: float,
+    digest: str = "",
+) -> dict[str, Any]:
+    """Return the compact capture record of one request."""
+    record: dict[str, Any] = {
+        "m": method,
+        "u": url,
+        "s": status,
+        "t": round(elapsed, 4),
+    }
+    if digest:
+        record["h"] = digest
+    try:
+        record["x"] = body.decode("utf-8")
+    except UnicodeDecodeError:
+        record["b"] = base64.b64encode(body).decode("ascii")
+    return record
+
+
+def decode_body(record: dict[str, Any]) -> bytes:
+    """Return the response body stored in a capture record."""
+    if "b" in record:
+        return base64.b64decode(record["b"])
+    return record.get("x", "").encode("utf-8")
+
+
+def load_records(path: str | os.PathLike) -> list[dict[str, Any]]:
+    """Read all records of a capture file."""
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        return [json.loads(line) for line in file if line.strip()]
+
+
+class TrafficRecorder:
+    """Collect capture records and append them to a file.
+
+    Recording is cheap and happens on the event loop; `flush()` does the file
+    I/O and should run in an executor. Once the capture reaches `max_bytes` it
+    is rotated to `<path>.1`, replacing the previous rotation.
+    """
+
+    def __init__(self, path: str | os.PathLike, max_bytes: int | None = None) -> None:
+        """Record into path, appending to an existing capture."""
+        self.path = path
+        self.max_bytes = max_bytes
+        self._pending: list[dict[str, Any]] = []
+
+    def record(
+        self,
+        method: str,
+        url: str,
+        status: int,
+        body: bytes,
+        elapsed: float,
+        digest: str = "",
+    ) -> None:
+        """Queue one request/response pair."""
+        self._pending.append(encode_record(method, url, status, body, elapsed, digest))
+
+    def flush(self) -> int:
+        """Write queued records and return how many were written."""
+        records, self._pending = self._pending, []
+        if not records:
+            return 0
+
+        if self.max_bytes is not None:
+            try:
+                if os.path.getsize(self.path) >= self.max_bytes:
+                    os.replace(self.path, f"{os.fspath(self.path)}.1")
+            except FileNotFoundError:
+                pass
+
+        # gzip allows appending members, so captures can grow across restarts
+        with gzip.open(self.path, "at", encoding="utf-8") as file:
+            for record in records:
+                file.write(json.dumps(record, separators=(",", ":")) + "\n")
+        return len(records)
+
+
+class RecordingClient:
+    """Wrap an aiohttp session and record every GET and POST."""
+
+    def __init__(self, client: aiohttp.ClientSession, recorder: TrafficRecorder) -> None:
+        """Record requests made through client."""
+        self._client = client
+        self.recorder = recorder
+
+    async def get(self, url: str, **kwargs: Any) -> TrafficResponse:
+        """Perform and record a GET request."""
+        return await self._request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> TrafficResponse:
+        """Perform and record a POST request."""
+        return await self._request("POST", url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> TrafficResponse:
+        raise_for_status = kwargs.pop("raise_for_status", False)
+        started = time.perf_counter()
+        async with self._client.request(method, url, **kwargs) as resp:
+            body = await resp.read()
+        elapsed = time.perf_counter() - started
+
+        self.recorder.record(
+            method, url, resp.status, body, elapsed, request_hash(kwargs)
+        )
+        response = TrafficResponse(method, url, resp.status, body)
+        if raise_for_status:
+            response.raise_for_status()
+        return response
+
+
+class ReplayClient:
+    """Serve captured responses in place of an aiohttp session.
+
+    Requests are matched by method, URL and request hash; records without a
+    hash, from older captures, match on method and URL. Repeated requests get
+    the captured
+    responses in order and the last one is repeated once they run out. Each
+    response is delayed by its recorded latency multiplied by `speed`, so
+    `speed=0` replays as fast as possible.
+    """
+
+    def __init__(self, records: Iterable[dict[str, Any]], speed: float = 1.0) -> None:
+        """Replay the given capture records."""
+        self.speed = speed
+        self.requests = 0
+        self._responses: dict[tuple[str, str, str], deque[dict[str, Any]]] = (
+            defaultdict(deque)
+        )
+        for record in records:
+            key = (record["m"], record["u"], record.get("h", ""))
+            self._responses[key].append(record)
+
+    @classmethod
+    def from_file(cls, path: str | os.PathLike, speed: float = 1.0) -> ReplayClient:
+        """Replay a capture file."""
+        return cls(load_records(path), speed)
+
+    async def get(self, url: str, **kwargs: Any) -> TrafficResponse:
+        """Replay a GET request."""
+        return await self._request("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs: Any) -> TrafficResponse:
+        """Replay a POST request."""
+        return await self._request("POST", url, **kwargs)
+
+    async def close(self) -> None:
+        """Nothing to close."""
+
+    async def _request(self, method: str, url: str, **kwargs: Any) -> TrafficResponse:
+        digest = request_hash(kwargs)
+        queue = self._responses.get((method, url, digest)) or self._responses.get(
+            (method, url, "")
+        )
+        if not queue:
+            raise TrafficNotRecorded(f"{method} {url} is not in the capture")
+
+        record = queue.popleft() if len(queue) > 1 else queue[0]
+        self.requests += 1
+        if self.speed and record["t"]:
+            await asyncio.sleep(record["t"] * self.speed)
+
+        response = TrafficResponse(method, url, record["s"], decode_body(record))
+        if kwargs.get("raise_for_status"):
+            response.raise_for_status()
+        return response
@@ -0,0 +1,183 @@
+"""Event loop lag watchdog for Winix code paths."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import asdict, dataclass
+import time
+
+from .const import LOGGER, LOOP_LAG_INTERVAL, LOOP_LAG_THRESHOLD
+
+
+class LoopLagExceeded(Exception):
+    """Raised in strict mode when a tracked code path lagged the event loop."""
+
+
+@dataclass
+class LagStats:
+    """Loop lag observed while one code path was running, in seconds."""
+
+    sections: int = 0
+    samples: int = 0
+    max_lag: float = 0.0
+    last_max_lag: float = 0.0  # Of the last completed section
+    total_lag: float = 0.0
+
+    # Longest blocking() block run inside the section; unlike the lag above,
+    # this is time the loop spent in Winix code
+    max_blocked: float = 0.0
+    last_max_blocked: float = 0.0  # Of the last completed section
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the statistics for diagnostics."""
+        return asdict(self)
+
+
+@dataclass
+class JobStats:
+    """Duration of a job run in the executor, in seconds."""
+
+    runs: int = 0
+    last: float = 0.0
+    max: float = 0.0
+
+    def as_dict(self) -> dict[str, float | int]:
+        """Return the statistics for diagnostics."""
+        return asdict(self)
+
+
+class LoopLagWatchdog:
+    """Measure event loop lag while integration code paths run.
+
+    While at least one section is tracked, a heartbeat is scheduled every
+    `interval` seconds; how late it fires is the loop lag. Lag is attributed to
+    every section active at that moment, which includes lag caused by anything
+    else on the loop. Blocking Winix code is timed directly with `blocking()`;
+    its duration is also kept apart as the blocked time of every enclosing
+    section. Executor jobs are timed with `executor()` and do not count as lag.
+    With `strict` set, a section whose lag exceeds `threshold` raises
+    LoopLagExceeded, which is meant for tests.
+    """
+
+    def __init__(
+        self,
+        interval: float = LOOP_LAG_INTERVAL,
+        threshold: float = LOOP_LAG_THRESHOLD,
+        strict: bool = False,
+    ) -> None:
+        """Create an idle watchdog."""
+        self.interval = interval
+        self.threshold = threshold
+        self.strict = strict
+        self.stats: dict[str, LagStats] = {}
+        self.jobs: dict[str, JobStats] = {}
+
+        self._active: Counter[str] = Counter()
+        self._section_max: dict[str, float] = {}
+        self._section_blocked: dict[str, float] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._expected = 0.0
+
+    @contextmanager
+    def track(self, label: str) -> Iterator[None]:
+        """Attribute loop lag to label while the block runs."""
+        self._enter(label)
+        try:
+            yield
+        finally:
+            self._exit(label)
+
+    @contextmanager
+    def blocking(self, label: str) -> Iterator[None]:
+        """Time a synchronous block; all of its duration blocks the loop."""
+        self._enter(label)
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            self._record(duration, (label,))
+            for active in self._active:
+                self._section_blocked[active] = max(
+                    self._section_blocked[active], duration
+                )
+            self._exit(label)
+
+    @asynccontextmanager
+    async def executor(self, label: str) -> AsyncIterator[None]:
+        """Time an awaited executor job; it runs off the loop, so it is no lag."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - started
+            stats = self.jobs.setdefault(label, JobStats())
+            stats.runs += 1
+            stats.last = duration
+            stats.max = max(stats.max, duration)
+
+    def as_dict(self) -> dict[str, dict[str, float | int]]:
+        """Return the statistics of all code paths."""
+        return {label: stats.as_dict() for label, stats in self.stats.items()}
+
+    def _enter(self, label: str) -> None:
+        if not self._active[label]:
+            self._section_max[label] = 0.0
+            self._section_blocked[label] = 0.0
+        self._active[label] += 1
+
+        if self._handle is None:
+            self._schedule()
+
+    def _exit(self, label: str) -> None:
+        self._active[label] -= 1
+        if self._active[label]:
+            return
+
+        del self._active[label]
+        section_max = self._section_max.pop(label, 0.0)
+        section_blocked = self._section_blocked.pop(label, 0.0)
+        stats = self.stats.setdefault(label, LagStats())
+        stats.sections += 1
+        stats.last_max_lag = section_max
+        stats.last_max_blocked = section_blocked
+        stats.max_blocked = max(stats.max_blocked, section_blocked)
+
+        if not self._active and self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+        if section_max > self.threshold:
+            LOGGER.warning(
+                "Event loop lagged %.0f ms during %s", section_max * 1000, label
+            )
+            if self.strict:
+                raise LoopLagExceeded(
+                    f"{label} lagged the event loop {section_max * 1000:.0f} ms"
+                )
+
+    def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._expected = loop.time() + self.interval
+        self._handle = loop.call_at(self._expected, self._beat)
+
+    def _beat(self) -> None:
+        lag = max(0.0, asyncio.get_running_loop().time() - self._expected)
+        self._record(lag, tuple(self._active))
+
+        if self._active:
+            self._schedule()
+        else:
+            self._handle = None
+
+    def _record(self, lag: float, labels: tuple[str, ...]) -> None:
+        for label in labels:
+            stats = self.stats.setdefault(label, LagStats())
+            stats.samples += 1
+            stats.total_lag += lag
+            stats.max_lag = max(stats.max_lag, lag)
+            if label in self._section_max:
+                self._section_max[label] = max(self._section_max[label], lag)
@@ -1,14 +1,22 @@
 """Tests for Winix component."""
 
-from unittest.mock import MagicMock, Mock
+from contextlib import AbstractContextManager, nullcontext
+from unittest.mock import MagicMock, Mock, patch
 
 from voluptuous.validators import Number
 
 from custom_components.winix.device_wrapper import WinixDeviceWrapper
-from custom_components.winix.fan import WinixPurifier
+from custom_components.winix.humidifier import WinixDehumidifier
 from custom_components.winix.manager import WinixManager
 
 
+def without_numpy(module: str, enabled: bool) -> AbstractContextManager:
+    """Return a context that makes module fall back to pure Python."""
+    if not enabled:
+        return nullcontext()
+    return patch(f"{module}.numpy_module", return_value=None)
+
+
 def build_mock_wrapper(index: Number = 0) -> WinixDeviceWrapper:
     """Return a mocked WinixDeviceWrapper instance."""
     client = Mock()
@@ -16,7 +24,7 @@ def build_mock_wrapper(index: Number = 0) -> WinixDeviceWrapper:
     device_stub = Mock()
 
     device_stub.mac = f"f190d35456d{index}"
-    device_stub.alias = f"Purifier{index}"
+    device_stub.alias = f"Dehumidifier{index}"
 
     logger = Mock()
     logger.debug = Mock()
@@ -37,10 +45,12 @@ def build_fake_manager(wrapper_count) -> WinixManager:
     return manager
 
 
-def build_purifier(hass, device_wrapper: WinixDeviceWrapper) -> WinixPurifier:
-    """Return a WinixPurifier instance."""
+def build_dehumidifier(
+    hass, device_wrapper: WinixDeviceWrapper
+) -> WinixDehumidifier:
+    """Return a WinixDehumidifier instance."""
 
-    device = WinixPurifier(device_wrapper, Mock())
+    device = WinixDehumidifier(device_wrapper, Mock())
     device.add_to_platform_start(hass, None, None)
 
     # Use unique_id as entity_id, this is required for async_update_ha_state
@@ -0,0 +1 @@
+"""Benchmarks for Winix hot paths."""
@@ -0,0 +1,171 @@
+"""Benchmark fixtures and regression gate.
+
+Benchmarks are marked `benchmark` and only run with WINIX_BENCH=1.
+
+Each benchmark is timed with time.perf_counter over several rounds, with the
+garbage collector paused and each round repeating the operation for at least
+MIN_ROUND_TIME. The best time per operation is divided by the time of a fixed
+reference workload measured the same way in the same run, so the gate compares
+ratios that carry over between machines rather than seconds. A run fails when
+a ratio exceeds its entry in tests/benchmarks/baselines.json by more than
+WINIX_BENCH_THRESHOLD (default 1.0, i.e. twice as slow). Set
+WINIX_BENCH_UPDATE=1 to store new baselines.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from functools import cache
+import gc
+import json
+import os
+from pathlib import Path
+import time
+from typing import Any
+
+import pytest
+
+BASELINES_PATH = Path(__file__).with_name("baselines.json")
+DEFAULT_THRESHOLD = 1.0
+ROUNDS = 7
+MIN_ROUND_TIME = 0.05
+
+FLEET_SIZES = (1, 10, 100, 1000)
+
+REFERENCE_DATA = {
+    f"key_{index}": [index, str(index), index / 3] for index in range(200)
+}
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    """Register the benchmark marker."""
+    config.addinivalue_line("markers", "benchmark: opt-in timing benchmark")
+
+
+def pytest_collection_modifyitems(
+    config: pytest.Config, items: list[pytest.Item]
+) -> None:
+    """Skip benchmarks unless WINIX_BENCH=1."""
+    if os.environ.get("WINIX_BENCH") == "1":
+        return
+
+    skip = pytest.mark.skip(reason="benchmarks run with WINIX_BENCH=1")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip)
+
+
+def _load_baselines() -> dict[str, float]:
+    if BASELINES_PATH.exists():
+        return json.loads(BASELINES_PATH.read_text())
+    return {}
+
+
+_baselines = _load_baselines()
+_updated: dict[str, float] = {}
+
+
+class Benchmark:
+    """Time a callable and gate the result against its stored baseline."""
+
+    def __init__(self, name: str) -> None:
+        """Create a benchmark stored under name."""
+        self.name = name
+        self.threshold = float(
+            os.environ.get("WINIX_BENCH_THRESHOLD", DEFAULT_THRESHOLD)
+        )
+        self.update = os.environ.get("WINIX_BENCH_UPDATE") == "1"
+        self.best: float | None = None
+
+    def __call__(self, func: Callable[[], Any]) -> float:
+        """Time func and return the best time per call."""
+        return self._check(_time(func))
+
+    async def async_run(self, func: Callable[[], Awaitable[Any]]) -> float:
+        """Time the coroutine function func and return the best time per call."""
+
+        async def run(number: int) -> float:
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+            return time.perf_counter() - started
+
+        with _gc_paused():
+            number = _calibrate(await run(1))
+            best = min([await run(number) for _ in range(ROUNDS)]) / number
+        return self._check(best)
+
+    def _check(self, best: float) -> float:
+        self.best = best
+        ratio = best / _reference_time()
+        if self.update:
+            _updated[self.name] = ratio
+            return best
+
+        baseline = _baselines.get(self.name)
+        if baseline is not None and ratio > baseline * (1 + self.threshold):
+            pytest.fail(
+                f"{self.name} regressed: {ratio:.2f}x the reference workload, "
+                f"baseline {baseline:.2f}x (+{self.threshold:.0%} allowed)"
+            )
+        return best
+
+
+def _reference_workload() -> Any:
+    """Do fixed work that the benchmarks are expressed relative to."""
+    return json.loads(json.dumps(REFERENCE_DATA))
+
+
+@cache
+def _reference_time() -> float:
+    """Return the best time of the reference workload in this run."""
+    return _time(_reference_workload)
+
+
+def _time(func: Callable[[], Any]) -> float:
+    """Return the best time per call of func over ROUNDS rounds."""
+
+    def run(number: int) -> float:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        return time.perf_counter() - started
+
+    with _gc_paused():
+        number = _calibrate(run(1))
+        return min(run(number) for _ in range(ROUNDS)) / number
+
+
+def _calibrate(single: float) -> int:
+    """Return how many calls make a round last at least MIN_ROUND_TIME."""
+    return max(1, int(MIN_ROUND_TIME / max(single, 1e-9)) + 1)
+
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+@pytest.fixture
+def benchmark(request: pytest.FixtureRequest) -> Benchmark:
+    """Return a Benchmark named after the running test."""
+    return Benchmark(request.node.name)
+
+
+def pytest_sessionfinish(session: pytest.Session, exitstatus: int) -> None:
+    """Store updated baselines."""
+    if not _updated:
+        return
+
+    baselines = {**_baselines, **_updated}
+    BASELINES_PATH.write_text(
+        json.dumps(dict(sorted(baselines.items())), indent=2) + "\n"
+    )
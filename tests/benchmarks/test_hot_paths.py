@@ -0,0 +1,225 @@
+"""Benchmark integration hot paths at several fleet sizes."""
+
+import asyncio
+from unittest.mock import MagicMock, Mock
+
+import pytest
+
+from custom_components import winix
+from custom_components.winix.const import (
+    ATTR_CHILD_LOCK,
+    ATTR_FAN_SPEED,
+    ATTR_HUMIDITY,
+    ATTR_MODE,
+    ATTR_POWER,
+    ATTR_TARGET_HUMIDITY,
+    ATTR_TIMER,
+    ATTR_UV_STERILIZATION,
+    LOGGER,
+    SERVICE_SET_MODE,
+)
+from custom_components.winix.device_wrapper import MyWinixDeviceStub, WinixDeviceWrapper
+from custom_components.winix.driver import WinixDriver
+from custom_components.winix.helpers import Helpers
+from custom_components.winix.sensor import SENSOR_DESCRIPTIONS, WinixSensor
+from tests import build_dehumidifier, build_mock_wrapper
+
+from .conftest import FLEET_SIZES
+
+pytestmark = pytest.mark.benchmark
+
+STATE_PAYLOAD = {
+    "D02": "1",
+    "D03": "01",
+    "D04": "02",
+    "D05": "50",
+    "D08": "0",
+    "D10": "63",
+    "D13": "1",
+    "D15": "2",
+}
+
+DECODED_STATE = {
+    ATTR_POWER: "on",
+    ATTR_MODE: "auto",
+    ATTR_FAN_SPEED: "low",
+    ATTR_TARGET_HUMIDITY: 50,
+    ATTR_CHILD_LOCK: "off",
+    ATTR_HUMIDITY: 63,
+    ATTR_UV_STERILIZATION: "on",
+    ATTR_TIMER: 2,
+}
+
+
+def build_device_list(count: int) -> dict:
+    """Return a getDeviceInfoList response with count devices."""
+    return {
+        "resultCode": "200",
+        "resultMessage": "SUCCESS",
+        "deviceInfoList": [
+            {
+                "deviceId": f"847207352CE0_{index:04d}",
+                "mac": f"847207352c{index:04x}",
+                "deviceAlias": f"Dehumidifier {index}",
+                "deviceLocCode": "KR",
+                "filterReplaceDate": "2024-01-01 00:00:00",
+                "modelName": "DXSH",
+                "mcuVer": "0.0.1",
+            }
+            for index in range(count)
+        ],
+    }
+
+
+def build_drivers(count: int) -> list[WinixDriver]:
+    """Return drivers answering get_state from a canned response."""
+    # Plain coroutines rather than AsyncMock, which slows down as it records calls
+    async def get(url, **kwargs):
+        return response
+
+    async def json():
+        return {"body": {"data": [{"attributes": STATE_PAYLOAD}]}}
+
+    response = Mock(json=json)
+    client = Mock(get=get)
+
+    drivers = [WinixDriver(f"device_{index}", client) for index in range(count)]
+    for driver in drivers:
+        driver.state_cache_ttl = 0  # Measure decoding, not the cache
+    return drivers
+
+
+def build_wrappers(count: int) -> list:
+    """Return device wrappers holding a decoded state."""
+    wrappers = [build_mock_wrapper(index) for index in range(count)]
+    for wrapper in wrappers:
+        wrapper._state = dict(DECODED_STATE)
+        wrapper._on = True
+    return wrappers
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+async def test_get_state_decode(benchmark, fleet_size):
+    """Benchmark one poll cycle of get_state over the fleet."""
+    drivers = build_drivers(fleet_size)
+
+    async def poll():
+        return await asyncio.gather(*(driver.get_state() for driver in drivers))
+
+    assert (await poll())[0] == DECODED_STATE
+    await benchmark.async_run(poll)
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+def test_encrypt_decrypt(benchmark, fleet_size):
+    """Benchmark the AES round trip of a device list payload."""
+    payload = build_device_list(fleet_size)
+
+    def round_trip():
+        return Helpers.json_loads(Helpers.decrypt(Helpers.encrypt(payload)))
+
+    assert round_trip() == payload
+    benchmark(round_trip)
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+async def test_get_device_stubs(benchmark, fleet_size):
+    """Benchmark decrypting and parsing getDeviceInfoList."""
+    ciphertext = Helpers.encrypt(build_device_list(fleet_size))
+
+    async def post(url, **kwargs):
+        return response
+
+    async def read():
+        return ciphertext
+
+    response = Mock(status=200)
+    response.content.read = read
+    client = Mock(post=post)
+
+    async def get_device_stubs():
+        return await Helpers.get_device_stubs(client, "token", "uuid")
+
+    assert len(await get_device_stubs()) == fleet_size
+    await benchmark.async_run(get_device_stubs)
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+def test_dehumidifier_properties(benchmark, fleet_size):
+    """Benchmark the properties read when dehumidifier states are written."""
+    entities = [build_dehumidifier(Mock(), wrapper) for wrapper in build_wrappers(fleet_size)]
+
+    def read_properties():
+        for entity in entities:
+            entity.is_on
+            entity.mode
+            entity.current_humidity
+            entity.target_humidity
+            entity.extra_state_attributes
+
+    benchmark(read_properties)
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+def test_sensor_values(benchmark, fleet_size):
+    """Benchmark evaluating every sensor of the fleet after a poll."""
+    sensors = [
+        WinixSensor(wrapper, Mock(), description)
+        for wrapper in build_wrappers(fleet_size)
+        for description in SENSOR_DESCRIPTIONS
+    ]
+    for sensor in sensors:
+        sensor.async_write_ha_state = lambda: None
+
+    def update_sensors():
+        for sensor in sensors:
+            sensor._handle_coordinator_update()
+
+    benchmark(update_sensors)
+
+
+@pytest.mark.parametrize("fleet_size", FLEET_SIZES)
+async def test_service_fan_out(benchmark, fleet_size):
+    """Benchmark dispatching a service call to every device."""
+    calls = []
+
+    async def get(url, **kwargs):
+        calls.append(url)
+        return response
+
+    async def text():
+        return "OK"
+
+    response = Mock(text=text)
+    client = Mock(get=get)
+    wrappers = [
+        WinixDeviceWrapper(
+            client,
+            MyWinixDeviceStub(
+                id=f"device_{index}",
+                mac=f"847207352c{index:04x}",
+                alias=f"Dehumidifier {index}",
+                location_code="KR",
+                filter_replace_date="2024-01-01 00:00:00",
+                model="DXSH",
+                sw_version="0.0.1",
+            ),
+            LOGGER,
+        )
+        for index in range(fleet_size)
+    ]
+
+    manager = Mock()
+    manager.get_device_wrappers = Mock(return_value=wrappers)
+    manager.track = Mock(return_value=MagicMock())
+
+    hass = Mock()
+    hass.services.has_service = Mock(return_value=False)
+    winix.async_register_services(hass, manager)
+    handler = hass.services.async_register.call_args_list[0][0][2]
+
+    call = Mock(service=SERVICE_SET_MODE, data={"mode": "auto"})
+
+    await handler(call)
+    assert len(calls) == fleet_size
+    await benchmark.async_run(lambda: handler(call))
@@ -4,9 +4,18 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
 
-from custom_components.winix.const import SENSOR_AIR_QVALUE, SENSOR_FILTER_LIFE
+from custom_components.winix.const import (
+    ATTR_HUMIDITY,
+    SENSOR_FILTER_LIFE,
+    SENSOR_HUMIDITY,
+)
+from custom_components.winix.core.capabilities import DEFAULT_PROFILE
 from custom_components.winix.device_wrapper import WinixDeviceWrapper
 from custom_components.winix.driver import WinixDriver
+from custom_components.winix.sensor import (
+    SENSOR_DESCRIPTIONS,
+    WinixSensorEntityDescription,
+)
 from homeassistant.components.sensor import SensorEntityDescription, SensorStateClass
 from homeassistant.const import PERCENTAGE
 
@@ -17,12 +26,12 @@ def mock_device_wrapper() -> WinixDeviceWrapper:
 
     device_wrapper = MagicMock()
     device_wrapper.device_stub.mac = "f190d35456d0"
-    device_wrapper.device_stub.alias = "Purifier1"
+    device_wrapper.device_stub.alias = "Dehumidifier1"
+    device_wrapper.profile = DEFAULT_PROFILE
 
-    device_wrapper.async_plasmawave_off = AsyncMock()
-    device_wrapper.async_plasmawave_on = AsyncMock()
-    device_wrapper.async_set_preset_mode = AsyncMock()
-    device_wrapper.async_set_speed = AsyncMock()
+    device_wrapper.async_set_humidity = AsyncMock()
+    device_wrapper.async_set_mode = AsyncMock()
+    device_wrapper.async_set_fan_speed = AsyncMock()
     device_wrapper.async_turn_on = AsyncMock()
 
     return device_wrapper
@@ -40,26 +49,26 @@ def mock_sensor_description(sensor_key) -> SensorEntityDescription:
 
 
 @pytest.fixture
-def mock_qvalue_description() -> SensorEntityDescription:
-    """Return a mocked qValue SensorEntityDescription instance."""
+def mock_humidity_description() -> WinixSensorEntityDescription:
+    """Return a mocked humidity WinixSensorEntityDescription instance."""
 
-    return SensorEntityDescription(
-        key=SENSOR_AIR_QVALUE,
-        name="Air QValue",
-        native_unit_of_measurement="qv",
+    return WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY,
+        name="Current Humidity",
+        native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda wrapper: wrapper.get_state().get(ATTR_HUMIDITY),
     )
 
 
 @pytest.fixture
-def mock_filter_life_description() -> SensorEntityDescription:
-    """Return a mocked SensorEntityDescription instance."""
+def mock_filter_life_description() -> WinixSensorEntityDescription:
+    """Return the filter life WinixSensorEntityDescription."""
 
-    return SensorEntityDescription(
-        key=SENSOR_FILTER_LIFE,
-        name="Filter Life",
-        native_unit_of_measurement=PERCENTAGE,
-        state_class=SensorStateClass.MEASUREMENT,
+    return next(
+        description
+        for description in SENSOR_DESCRIPTIONS
+        if description.key == SENSOR_FILTER_LIFE
     )
 
 
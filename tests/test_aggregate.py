@@ -0,0 +1,56 @@
+"""Test fleet aggregates."""
+
+import pytest
+
+from custom_components.winix.aggregate import FleetSamples, compute_fleet_aggregate
+
+from . import without_numpy
+
+AGGREGATE_MODULE = "custom_components.winix.aggregate"
+
+
+def build_samples() -> FleetSamples:
+    """Return samples of a small fleet."""
+    samples = FleetSamples()
+    samples.append("Basement", 72, 50, True)
+    samples.append("Kitchen", 55, 50, True)
+    samples.append("Office", 40, 50, True)
+    samples.append("Attic", 80, 50, False)  # Off, never an outlier
+    samples.append("Garage", None, None, False)  # No state
+    return samples
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_fleet_aggregate(use_numpy: bool):
+    """Test that both implementations reduce the fleet the same way."""
+    with without_numpy(AGGREGATE_MODULE, not use_numpy):
+        fleet = compute_fleet_aggregate(build_samples(), (50, 90), 2)
+
+    assert fleet.devices == 5
+    assert fleet.reporting == 4
+    assert fleet.running == 3
+    assert fleet.humidity_mean == pytest.approx(61.75)
+    assert fleet.humidity_min == 40
+    assert fleet.humidity_max == 80
+    assert fleet.percentiles == {
+        50: pytest.approx(63.5),
+        90: pytest.approx(77.6),
+    }
+    assert fleet.off_target == [("Basement", 22), ("Office", -10)]
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_empty_fleet(use_numpy: bool):
+    """Test the aggregate of a fleet without any readings."""
+    samples = FleetSamples()
+    samples.append("Garage", None, None, False)
+
+    with without_numpy(AGGREGATE_MODULE, not use_numpy):
+        fleet = compute_fleet_aggregate(samples)
+
+    assert fleet.devices == 1
+    assert fleet.reporting == 0
+    assert fleet.running == 0
+    assert fleet.humidity_mean is None
+    assert fleet.percentiles == {}
+    assert fleet.off_target == []
@@ -0,0 +1,124 @@
+"""Test TTLCache."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from custom_components.winix.core.cache import TTLCache
+
+
+class FakeClock:
+    """Manually advanced clock."""
+
+    def __init__(self) -> None:
+        """Start at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_expiry():
+    """Test that entries expire after the ttl but stay readable."""
+    clock = FakeClock()
+    cache = TTLCache(10, clock)
+
+    cache.set("a", 1)
+    assert "a" in cache
+    assert cache.get("a") == 1
+
+    clock.now = 10
+    assert "a" not in cache
+    assert cache.get("a") == 1
+
+    cache.invalidate("a")
+    assert cache.get("a") is None
+
+
+async def test_async_get_shares_load():
+    """Test that concurrent callers share one load."""
+    clock = FakeClock()
+    cache = TTLCache(10, clock)
+
+    async def load():
+        await asyncio.sleep(0)
+        return 42
+
+    loader = AsyncMock(side_effect=load)
+    results = await asyncio.gather(*(cache.async_get("a", loader) for _ in range(5)))
+
+    assert results == [42] * 5
+    assert loader.call_count == 1
+
+    # Served from the cache until it expires
+    await cache.async_get("a", loader)
+    assert loader.call_count == 1
+
+    clock.now = 11
+    await cache.async_get("a", loader)
+    assert loader.call_count == 2
+
+
+async def test_async_get_keeps_value_on_error():
+    """Test that a failed load keeps the previous value."""
+    clock = FakeClock()
+    cache = TTLCache(10, clock)
+    cache.set("a", 1)
+    clock.now = 11
+
+    with pytest.raises(RuntimeError):
+        await cache.async_get("a", AsyncMock(side_effect=RuntimeError))
+
+    assert cache.get("a") == 1
+
+
+async def test_async_get_survives_cancelled_loader():
+    """Test that a waiter reloads when the caller running the load is cancelled."""
+    cache = TTLCache(10, FakeClock())
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return 42
+
+    loader = AsyncMock(side_effect=load)
+    owner = asyncio.create_task(cache.async_get("a", loader))
+    await asyncio.sleep(0)
+    waiter = asyncio.create_task(cache.async_get("a", loader))
+    await asyncio.sleep(0)
+
+    owner.cancel()
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await waiter == 42
+    assert owner.cancelled()
+    assert loader.call_count == 2
+
+
+async def test_invalidate_discards_load_in_flight():
+    """Test that a load started before invalidate is not stored or joined."""
+    cache = TTLCache(10, FakeClock())
+    release = asyncio.Event()
+    values = iter(["stale", "fresh"])
+
+    async def load():
+        value = next(values)
+        if value == "stale":
+            await release.wait()
+        return value
+
+    loader = AsyncMock(side_effect=load)
+    old = asyncio.create_task(cache.async_get("a", loader))
+    await asyncio.sleep(0)
+
+    cache.invalidate("a")
+    assert await cache.async_get("a", loader) == "fresh"
+
+    release.set()
+    assert await old == "stale"
+    assert cache.get("a") == "fresh"
+    assert await cache.async_get("a", loader) == "fresh"
+    assert loader.call_count == 2
@@ -0,0 +1,116 @@
+"""Test model capability profiles."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from custom_components.winix.core.capabilities import (
+    DEFAULT_PROFILE,
+    InvalidCommand,
+    ProfileRegistry,
+    RawAttributes,
+    get_profile,
+)
+
+
+def write_profile(path: Path, name: str, data: dict) -> None:
+    """Write a profile data file."""
+    (path / f"{name}.json").write_text(json.dumps(data), encoding="utf-8")
+
+
+def test_unknown_model_uses_default():
+    """Test that models without a profile fall back to the default."""
+    assert get_profile("unknown model") is DEFAULT_PROFILE
+    assert get_profile(None) is DEFAULT_PROFILE
+
+
+def test_encode():
+    """Test command encoding against the default profile."""
+    assert DEFAULT_PROFILE.encode("mode", "laundry_dry") == ("D03", "03")
+    assert DEFAULT_PROFILE.encode("child_lock", True) == ("D08", "1")
+    assert DEFAULT_PROFILE.encode("target_humidity", 45) == ("D05", "45")
+
+    with pytest.raises(InvalidCommand):
+        DEFAULT_PROFILE.encode("current_humidity", 40)  # Read only
+    with pytest.raises(InvalidCommand):
+        DEFAULT_PROFILE.encode("target_humidity", "high")
+
+
+def test_model_profile_extends_default(tmp_path: Path):
+    """Test that a model data file overrides and removes inherited attributes."""
+    write_profile(tmp_path, "default", {"attributes": {}})
+    write_profile(
+        tmp_path,
+        "base",
+        {
+            "attributes": {
+                "mode": {"code": "D03", "values": {"auto": "01", "manual": "02"}},
+                "target_humidity": {"code": "D05", "range": [35, 70, 5]},
+                "uv_sterilization": {"code": "D13", "values": {"off": "0", "on": "1"}},
+            },
+            "params": {"operating_hours": "D22"},
+        },
+    )
+    write_profile(
+        tmp_path,
+        "compact",
+        {
+            "extends": "base",
+            "models": ["DXSH"],
+            "attributes": {
+                "target_humidity": {"code": "D05", "range": [40, 60, 10]},
+                "uv_sterilization": None,
+            },
+        },
+    )
+
+    registry = ProfileRegistry.from_directory(tmp_path)
+    profile = registry.get("DXSH")
+
+    assert profile.name == "compact"
+    assert profile.options("mode") == ["auto", "manual"]
+    assert profile.range("target_humidity") == (40, 60, 10)
+    assert not profile.supports("uv_sterilization")
+    assert profile.params == {"operating_hours": "D22"}
+    assert profile.decode({"D03": "02", "D05": "50", "D13": "1"}) == {
+        "mode": "manual",
+        "target_humidity": 50,
+    }
+
+    with pytest.raises(InvalidCommand):
+        profile.encode("target_humidity", 45)
+    with pytest.raises(InvalidCommand):
+        profile.encode("uv_sterilization", True)
+
+    assert registry.get("other").name == "default"
+
+
+def test_raw_attributes_decode_lazily(tmp_path: Path):
+    """Test that raw attributes are decoded on access and memoized."""
+    write_profile(
+        tmp_path,
+        "default",
+        {
+            "attributes": {
+                "power": {"code": "D02", "values": {"off": "0", "on": "1"}},
+                "timer": {"code": "D15", "lazy": True},
+            }
+        },
+    )
+    profile = ProfileRegistry.from_directory(tmp_path).default
+    payload = {"D02": "1", "D15": "3", "D40": "12", "D41": "v2"}
+
+    assert profile.decode(payload) == {"power": "on"}
+
+    raw = RawAttributes(profile, payload)
+    assert raw.unknown_codes() == ["D40", "D41"]
+    assert raw["D15"] == 3
+    assert raw["D40"] == 12
+    assert raw["D41"] == "v2"
+    assert raw.get("D99") is None
+
+    with patch.object(profile, "decode_value") as decode_value:
+        assert raw["D40"] == 12
+    assert decode_value.call_count == 0
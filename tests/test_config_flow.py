@@ -1,12 +1,26 @@
 """Test config flow."""
 
-from unittest.mock import AsyncMock, patch
-
-from custom_components.winix.const import WINIX_DOMAIN
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.winix.const import (
+    CONF_DEBOUNCE,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_CONCURRENCY,
+    CONF_RECORD_TRAFFIC,
+    CONF_REGION,
+    CONF_REQUEST_TIMEOUT,
+    REGION_AUTO,
+    WINIX_DOMAIN,
+)
+from custom_components.winix.core.endpoints import WinixEndpoint
 from custom_components.winix.helpers import WinixException
 from homeassistant import data_entry_flow
 from homeassistant.config_entries import SOURCE_USER
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
 from homeassistant.core import HomeAssistant
 
 TEST_USER_DATA = {
@@ -81,3 +95,61 @@ async def test_create_entry(hass: HomeAssistant, enable_custom_integrations) ->
         )
 
         assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+
+
+@pytest.mark.parametrize(("validated", "region"), [(True, "kr"), (False, "us")])
+async def test_create_entry_auto_region(
+    hass: HomeAssistant, enable_custom_integrations, validated: bool, region: str
+) -> None:
+    """Test that the auto region is resolved once and saved as a concrete region."""
+    login = AsyncMock(return_value=Mock(access_token="AccessToken"))
+    validate = AsyncMock(return_value=validated)
+    with patch(
+        "custom_components.winix.endpoints.async_select_endpoint",
+        AsyncMock(return_value=WinixEndpoint.for_region("kr")),
+    ), patch("custom_components.winix.Helpers.async_login", login), patch(
+        "custom_components.winix.Helpers.async_validate_endpoint", validate
+    ), patch(
+        "custom_components.winix.async_setup_entry", return_value=True
+    ):
+        result = await hass.config_entries.flow.async_init(
+            WINIX_DOMAIN,
+            context={"source": SOURCE_USER},
+            data={**TEST_USER_DATA, CONF_REGION: REGION_AUTO},
+        )
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_REGION] == region
+    kr = WinixEndpoint.for_region("kr")
+    assert validate.call_args.args[1:] == ("AccessToken", kr)
+    assert login.call_args.args[-1] == WinixEndpoint.for_region(region)
+    assert login.call_count == (1 if validated else 2)
+
+
+async def test_options_flow(hass: HomeAssistant, enable_custom_integrations) -> None:
+    """Test that options default to the current ones and are saved."""
+    entry = MockConfigEntry(
+        domain=WINIX_DOMAIN, data=TEST_USER_DATA, options={CONF_SCAN_INTERVAL: 60}
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "init"
+    assert result["data_schema"]({})[CONF_SCAN_INTERVAL] == 60
+
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        user_input={
+            CONF_SCAN_INTERVAL: 15,
+            CONF_REQUEST_TIMEOUT: 4.5,
+            CONF_MAX_CONCURRENCY: 2,
+            CONF_DEBOUNCE: 0,
+            CONF_LOOP_WATCHDOG: True,
+            CONF_RECORD_TRAFFIC: False,
+        },
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options[CONF_SCAN_INTERVAL] == 15
+    assert entry.options[CONF_MAX_CONCURRENCY] == 2
+    assert entry.options[CONF_LOOP_WATCHDOG] is True
@@ -0,0 +1,90 @@
+"""Test the connectivity supervisor."""
+
+import asyncio
+from unittest.mock import AsyncMock, Mock
+
+from custom_components.winix.connectivity import ConnectivitySupervisor
+from custom_components.winix.driver import WinixDriver
+
+
+async def test_goes_offline_after_consecutive_failures():
+    """Test that only uninterrupted transport failures count."""
+    supervisor = ConnectivitySupervisor(failure_threshold=3)
+    listener = Mock()
+    supervisor.add_listener(listener)
+
+    supervisor.record_failure()
+    supervisor.record_failure()
+    supervisor.record_success()
+    supervisor.record_failure()
+    supervisor.record_failure()
+    assert supervisor.online
+
+    supervisor.record_failure()
+    assert not supervisor.online
+    assert supervisor.outages == 1
+    listener.assert_called_once_with(False)
+
+
+async def test_probe_backs_off_then_resumes():
+    """Test that one probe at a time runs until the cloud answers."""
+    probe = AsyncMock(side_effect=[None, None, 0.05])
+    supervisor = ConnectivitySupervisor(
+        probe, failure_threshold=1, probe_interval=0.001, probe_max_interval=0.004
+    )
+    states = []
+    supervisor.add_listener(states.append)
+
+    sent = []
+
+    async def command(value):
+        sent.append(value)
+
+    supervisor.record_failure()
+    supervisor.queue(("device_1", "D03"), lambda: command("01"))
+    supervisor.queue(("device_1", "D03"), lambda: command("03"))  # Replaces
+    supervisor.queue(("device_2", "D02"), lambda: command("1"))
+    assert supervisor.queued_commands == 2
+
+    while not supervisor.online:
+        await asyncio.sleep(0.001)
+
+    assert probe.call_count == 3
+    assert sent == ["03", "1"]
+    assert supervisor.queued_commands == 0
+    assert states == [False, True]
+
+
+async def test_probe_errors_count_as_unreachable():
+    """Test that a failing probe keeps backing off in the injected task."""
+    probe = AsyncMock(side_effect=[RuntimeError("boom"), None, 0.05])
+    supervisor = ConnectivitySupervisor(
+        probe, failure_threshold=1, probe_interval=0.001, probe_max_interval=0.004
+    )
+    loop = asyncio.get_running_loop()
+    supervisor.create_task = Mock(
+        side_effect=lambda coro, name: loop.create_task(coro, name=name)
+    )
+
+    supervisor.record_failure()
+    assert supervisor.create_task.call_count == 1
+
+    while not supervisor.online:
+        await asyncio.sleep(0.001)
+
+    assert probe.call_count == 3
+
+
+async def test_driver_queues_commands_while_offline():
+    """Test that commands are held instead of sent while offline."""
+    supervisor = ConnectivitySupervisor(failure_threshold=1)
+    client = Mock()
+    client.get = AsyncMock()
+    driver = WinixDriver("device_1", client, supervisor=supervisor)
+
+    supervisor.record_failure()
+    await driver.set_mode("auto")
+
+    assert client.get.call_count == 0
+    assert supervisor.queued_commands == 1
+    await supervisor.async_close()
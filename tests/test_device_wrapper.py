@@ -5,78 +5,44 @@ from unittest.mock import AsyncMock, Mock, patch
 import pytest
 
 from custom_components.winix.const import (
-    AIRFLOW_HIGH,
-    AIRFLOW_LOW,
-    AIRFLOW_SLEEP,
-    ATTR_AIRFLOW,
+    ATTR_CHILD_LOCK,
+    ATTR_FAN_SPEED,
+    ATTR_HUMIDITY,
     ATTR_MODE,
-    ATTR_PLASMA,
     ATTR_POWER,
+    ATTR_TARGET_HUMIDITY,
+    ATTR_TIMER,
+    ATTR_UV_STERILIZATION,
+    DEFAULT_POST_TIMEOUT,
+    HUMIDITY_EXTRAPOLATION_LIMIT,
     MODE_AUTO,
-    MODE_MANUAL,
+    MODE_LAUNDRY,
     OFF_VALUE,
     ON_VALUE,
-    PRESET_MODE_AUTO,
-    PRESET_MODE_AUTO_PLASMA_OFF,
-    PRESET_MODE_MANUAL,
-    PRESET_MODE_MANUAL_PLASMA_OFF,
-    PRESET_MODE_SLEEP,
-    NumericPresetModes,
 )
-from custom_components.winix.device_wrapper import WinixDeviceWrapper
+from custom_components.winix.core.capabilities import InvalidCommand
 
 from . import build_mock_wrapper
 
 WinixDriver_TypeName = "custom_components.winix.driver.WinixDriver"
 
 
+def serve_state(wrapper, state: dict) -> None:
+    """Answer the state requests of wrapper with state."""
+    driver = wrapper._driver
+    driver._client.get = AsyncMock(return_value=Mock(json=AsyncMock()))
+    driver._decode_state = Mock(return_value=state)
+
+
 @pytest.mark.parametrize(
-    ("mock_state", "is_auto", "is_manual", "is_on", "is_plasma_on", "is_sleep"),
+    ("mock_state", "is_on"),
     [
-        # On
-        ({}, False, False, False, False, False),
-        # On, plasma on
-        ({ATTR_POWER: ON_VALUE}, False, False, True, False, False),
-        (
-            {ATTR_POWER: ON_VALUE, ATTR_PLASMA: ON_VALUE},
-            False,
-            False,
-            True,
-            True,
-            False,
-        ),
-        # On, auto
-        (
-            {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_AUTO},
-            True,
-            False,
-            True,
-            False,
-            False,
-        ),
-        # On, manual
-        (
-            {ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_MANUAL},
-            False,
-            True,
-            True,
-            False,
-            False,
-        ),
-        # On, sleep
-        (
-            {ATTR_POWER: ON_VALUE, ATTR_AIRFLOW: AIRFLOW_SLEEP},
-            False,
-            False,
-            True,
-            False,
-            True,
-        ),
+        ({}, False),
+        ({ATTR_POWER: OFF_VALUE}, False),
+        ({ATTR_POWER: ON_VALUE, ATTR_MODE: MODE_AUTO}, True),
     ],
 )
-async def test_wrapper_update(
-    mock_state, is_auto, is_manual, is_on, is_plasma_on, is_sleep
-) -> None:
+async def test_wrapper_update(mock_state, is_on) -> None:
     """Tests device wrapper states."""
 
     with patch(
@@ -87,245 +53,152 @@ async def test_wrapper_update(
         await wrapper.update()
         assert get_state.call_count == 1
         assert wrapper.get_state() == mock_state
-
-        assert wrapper.is_auto == is_auto
-        assert wrapper.is_manual == is_manual
         assert wrapper.is_on == is_on
-        assert wrapper.is_plasma_on == is_plasma_on
-        assert wrapper.is_sleep == is_sleep
-
 
-async def test_async_ensure_on() -> None:
-    """Test ensuring device is on."""
-    with patch(f"{WinixDriver_TypeName}.turn_on") as turn_on:
-        wrapper = build_mock_wrapper()
-        assert not wrapper.is_on  # initially off
 
-        await wrapper.async_ensure_on()
-        assert wrapper.is_on
-        assert turn_on.call_count == 1
-
-        await wrapper.async_ensure_on()  # Test turning it on again
-        assert turn_on.call_count == 1  # Should not do anything
-
-
-async def test_async_turn_off() -> None:
-    """Test turning off."""
+async def test_async_turn_on_off() -> None:
+    """Test turning on and off only sends commands on change."""
     with patch(f"{WinixDriver_TypeName}.turn_on") as turn_on, patch(
         f"{WinixDriver_TypeName}.turn_off"
     ) as turn_off:
         wrapper = build_mock_wrapper()
         assert not wrapper.is_on  # initially off
 
-        await wrapper.async_ensure_on()
+        await wrapper.async_turn_on()
+        await wrapper.async_turn_on()  # Test turning it on again
         assert wrapper.is_on
         assert turn_on.call_count == 1
-        assert turn_off.call_count == 0
-
-        await wrapper.async_ensure_on()  # Test turning it on again
-        assert turn_on.call_count == 1  # Should not do anything
-        assert turn_off.call_count == 0
 
-        await wrapper.async_turn_off()  # Turn it off
-        assert turn_on.call_count == 1
+        await wrapper.async_turn_off()
+        await wrapper.async_turn_off()  # Test turning it off again
+        assert not wrapper.is_on
         assert turn_off.call_count == 1
 
-        await wrapper.async_turn_off()  # Test turning it off agian
-
-        assert turn_on.call_count == 1
-        assert turn_off.call_count == 1  # Should not do anything
-
-
-async def test_async_turn_on() -> None:
-    """Test turning on."""
-    wrapper = build_mock_wrapper()
-
-    wrapper.async_ensure_on = AsyncMock()
-    wrapper.async_auto = AsyncMock()
-
-    await wrapper.async_turn_on()
-
-    assert wrapper.async_ensure_on.call_count == 1
-    assert wrapper.async_auto.call_count == 1
-
-
-async def test_async_auto() -> None:
-    """Test setting auto mode."""
 
-    # async_auto does not need the device to be turned on
-    with patch(f"{WinixDriver_TypeName}.auto") as auto:
-        wrapper = build_mock_wrapper()
-
-        await wrapper.async_auto()
-        assert auto.call_count == 1
-
-        assert wrapper.is_auto
-        assert not wrapper.is_manual
-        assert not wrapper.is_plasma_on  # unchanged
-        assert not wrapper.is_sleep
-        assert wrapper.get_state().get(ATTR_AIRFLOW) == AIRFLOW_LOW
-
-        await wrapper.async_auto()  # Calling again should not do anything
-        assert auto.call_count == 1
-
-
-async def test_async_plasmawave_on_off() -> None:
-    """Test turning plasmawave on."""
-
-    # async_plasmawave does not need the device to be turned on
-    with patch(f"{WinixDriver_TypeName}.plasmawave_on") as plasmawave_on, patch(
-        f"{WinixDriver_TypeName}.plasmawave_off"
-    ) as plasmawave_off:
+@pytest.mark.parametrize(
+    ("method", "value", "driver_method", "attribute", "expected"),
+    [
+        ("async_set_mode", MODE_LAUNDRY, "set_mode", ATTR_MODE, MODE_LAUNDRY),
+        ("async_set_humidity", 45, "set_humidity", ATTR_TARGET_HUMIDITY, 45),
+        ("async_set_fan_speed", "turbo", "set_fan_speed", ATTR_FAN_SPEED, "turbo"),
+        ("async_set_timer", 4, "set_timer", ATTR_TIMER, 4),
+        ("async_set_child_lock", True, "set_child_lock", ATTR_CHILD_LOCK, ON_VALUE),
+        (
+            "async_set_uv_sterilization",
+            False,
+            "set_uv_sterilization",
+            ATTR_UV_STERILIZATION,
+            OFF_VALUE,
+        ),
+    ],
+)
+async def test_commands_update_state(
+    method, value, driver_method, attribute, expected
+) -> None:
+    """Test that commands are sent and reflected in the local state."""
+    with patch(f"{WinixDriver_TypeName}.{driver_method}") as command:
         wrapper = build_mock_wrapper()
 
-        await wrapper.async_plasmawave_on()
-        assert plasmawave_on.call_count == 1
-        assert plasmawave_off.call_count == 0
-
-        assert wrapper.is_plasma_on
-        assert wrapper.get_state().get(ATTR_PLASMA) == ON_VALUE
-
-        await wrapper.async_plasmawave_on()  # Calling again should not do anything
-        assert plasmawave_on.call_count == 1
-        assert plasmawave_off.call_count == 0
+        await getattr(wrapper, method)(value)
+        assert command.call_count == 1
+        assert command.call_args[0] == (value,)
+        assert wrapper.get_state()[attribute] == expected
 
-        await wrapper.async_plasmawave_off()  # Turn plasma off
-        assert not wrapper.is_plasma_on
-        assert wrapper.get_state().get(ATTR_PLASMA) == OFF_VALUE
-        assert plasmawave_on.call_count == 1
-        assert plasmawave_off.call_count == 1
-
-        await wrapper.async_plasmawave_off()  # Calling again should not do anything
-        assert plasmawave_on.call_count == 1
-        assert plasmawave_off.call_count == 1
-
-
-async def test_async_manual() -> None:
-    """Test setting manual mode."""
-
-    # async_manual does not need the device to be turned on
-    with patch(f"{WinixDriver_TypeName}.manual") as manual:
-        wrapper = build_mock_wrapper()
 
-        await wrapper.async_manual()
-        assert manual.call_count == 1
-
-        assert not wrapper.is_auto
-        assert wrapper.is_manual
-        assert not wrapper.is_plasma_on  # unchanged
-        assert not wrapper.is_sleep
-        assert wrapper.get_state().get(ATTR_MODE) == MODE_MANUAL
-        assert wrapper.get_state().get(ATTR_AIRFLOW) == AIRFLOW_LOW
+async def test_invalid_command_keeps_state() -> None:
+    """Test that a command rejected by the model profile leaves the state alone."""
+    wrapper = build_mock_wrapper()
+    wrapper._state = {ATTR_MODE: MODE_LAUNDRY}
 
-        await wrapper.async_manual()  # Calling again should not do anything
-        assert manual.call_count == 1
+    with pytest.raises(InvalidCommand):
+        await wrapper.async_set_mode("turbo")
+    assert wrapper.get_state() == {ATTR_MODE: MODE_LAUNDRY}
 
 
-async def test_async_sleep() -> None:
-    """Test setting sleep mode."""
+async def test_predicted_timer_minutes() -> None:
+    """Test that the timer counts down between polls and re-anchors."""
+    monotonic = "custom_components.winix.device_wrapper.time.monotonic"
 
-    # async_sleep does not need the device to be turned on
-    with patch(f"{WinixDriver_TypeName}.sleep") as sleep:
+    with patch(
+        f"{WinixDriver_TypeName}.get_state",
+        AsyncMock(return_value={ATTR_TIMER: 2}),
+    ):
         wrapper = build_mock_wrapper()
+        assert wrapper.predicted_timer_minutes is None
 
-        await wrapper.async_sleep()
-        assert sleep.call_count == 1
+        with patch(monotonic, return_value=1000):
+            await wrapper.update()
+            assert wrapper.predicted_timer_minutes == 120
 
-        assert not wrapper.is_auto
-        assert not wrapper.is_manual
-        assert not wrapper.is_plasma_on
-        assert wrapper.is_sleep
-        assert wrapper.get_state().get(ATTR_MODE) == MODE_MANUAL
-        assert wrapper.get_state().get(ATTR_AIRFLOW) == AIRFLOW_SLEEP
+        with patch(monotonic, return_value=1000 + 30 * 60):
+            assert wrapper.predicted_timer_minutes == 90
 
-        await wrapper.async_sleep()  # Calling again should not do anything
-        assert sleep.call_count == 1
+            # Same reported value keeps the original anchor
+            await wrapper.update()
+            assert wrapper.predicted_timer_minutes == 90
 
+        # Never drops below the range implied by the reported value
+        with patch(monotonic, return_value=1000 + 90 * 60):
+            assert wrapper.predicted_timer_minutes == 60
 
-async def test_async_set_speed() -> None:
-    """Test setting speed."""
 
-    with patch(f"{WinixDriver_TypeName}.turn_on"), patch(
-        f"{WinixDriver_TypeName}.manual"
-    ), patch(f"{WinixDriver_TypeName}.high") as high_speed, patch(
-        f"{WinixDriver_TypeName}.low"
-    ) as low_speed:
-        wrapper = build_mock_wrapper()
+async def test_estimated_humidity() -> None:
+    """Test that humidity is extrapolated from the trend within limits."""
+    monotonic = "custom_components.winix.device_wrapper.time.monotonic"
+    wrapper = build_mock_wrapper()
 
-        await wrapper.async_set_speed(AIRFLOW_LOW)
-        assert high_speed.call_count == 0
-        assert low_speed.call_count == 1
-        assert wrapper.is_on
-        assert not wrapper.is_auto
-        assert wrapper.is_manual
+    wrapper.set_request_options(DEFAULT_POST_TIMEOUT, 0)
 
-        # Calling again at same speed does nothing
-        await wrapper.async_set_speed(AIRFLOW_LOW)
-        assert high_speed.call_count == 0
-        assert low_speed.call_count == 1
-        assert wrapper.is_on
-        assert not wrapper.is_auto
-        assert wrapper.is_manual
+    for minute, humidity in enumerate([60, 59, 58, 57]):
+        serve_state(wrapper, {ATTR_HUMIDITY: humidity})
+        with patch(monotonic, return_value=minute * 60.0):
+            await wrapper.update()
 
-        # Setting a different speed
-        await wrapper.async_set_speed(AIRFLOW_HIGH)
-        assert high_speed.call_count == 1
-        assert low_speed.call_count == 1
-        assert wrapper.is_on
-        assert not wrapper.is_auto
-        assert wrapper.is_manual
+    with patch(monotonic, return_value=4 * 60.0):
+        assert wrapper.estimated_humidity == pytest.approx(56)
 
+    with patch(monotonic, return_value=60 * 60.0):
+        assert wrapper.estimated_humidity == pytest.approx(57 - HUMIDITY_EXTRAPOLATION_LIMIT)
 
-@pytest.mark.parametrize(
-    ("preset_mode", "sleep", "auto", "manual", "plasmawave_off", "plasmawave_on"),
-    [
-        (PRESET_MODE_SLEEP, 1, 0, 0, 0, 0),
-        (PRESET_MODE_AUTO, 0, 1, 0, 0, 1),
-        (PRESET_MODE_AUTO_PLASMA_OFF, 0, 1, 0, 1, 0),
-        (PRESET_MODE_MANUAL, 0, 0, 1, 0, 1),
-        (PRESET_MODE_MANUAL_PLASMA_OFF, 0, 0, 1, 1, 0),
-        (NumericPresetModes.PRESET_MODE_SLEEP, 1, 0, 0, 0, 0),
-        (NumericPresetModes.PRESET_MODE_AUTO, 0, 1, 0, 0, 1),
-        (NumericPresetModes.PRESET_MODE_AUTO_PLASMA_OFF, 0, 1, 0, 1, 0),
-        (NumericPresetModes.PRESET_MODE_MANUAL, 0, 0, 1, 0, 1),
-        (NumericPresetModes.PRESET_MODE_MANUAL_PLASMA_OFF, 0, 0, 1, 1, 0),
-    ],
-)
-async def test_async_set_preset_mode(
-    preset_mode, sleep, auto, manual, plasmawave_off, plasmawave_on
-) -> None:
-    """Test setting preset mode."""
 
+async def test_cached_state_adds_no_sample() -> None:
+    """Test that updates within the debounce window add one history sample."""
     wrapper = build_mock_wrapper()
+    serve_state(wrapper, {ATTR_HUMIDITY: 60})
 
-    wrapper.async_ensure_on = AsyncMock()
-    wrapper.async_sleep = AsyncMock()
-    wrapper.async_auto = AsyncMock()
-    wrapper.async_manual = AsyncMock()
-    wrapper.async_plasmawave_off = AsyncMock()
-    wrapper.async_plasmawave_on = AsyncMock()
-
-    await wrapper.async_set_preset_mode(preset_mode)
-    assert wrapper.async_ensure_on.call_count == 1
-
-    assert wrapper.async_sleep.call_count == sleep
-    assert wrapper.async_auto.call_count == auto
-    assert wrapper.async_manual.call_count == manual
-    assert wrapper.async_plasmawave_off.call_count == plasmawave_off
-    assert wrapper.async_plasmawave_on.call_count == plasmawave_on
+    await wrapper.update()
+    await wrapper.update()
 
+    assert wrapper._driver._client.get.call_count == 1
+    assert len(wrapper.history) == 1
 
-async def test_async_set_preset_mode_invalid() -> None:
-    """Test invalid preset mode."""
 
-    client = Mock()
-    device_stub = Mock()
-
-    logger = Mock()
-    logger.debug = Mock()
-    logger.warning = Mock()
-
-    wrapper = WinixDeviceWrapper(client, device_stub, logger)
+async def test_params_fetched_on_demand() -> None:
+    """Test that parameters are only fetched while requested."""
+    with patch(
+        f"{WinixDriver_TypeName}.get_state", AsyncMock(return_value={})
+    ), patch(
+        f"{WinixDriver_TypeName}.get_params",
+        AsyncMock(return_value={"operating_hours": 10}),
+    ) as get_params:
+        wrapper = build_mock_wrapper()
 
-    with pytest.raises(ValueError):
-        await wrapper.async_set_preset_mode("INVALID_PRESET")
+        await wrapper.update()
+        assert not wrapper.params_due
+        assert get_params.call_count == 0
+        assert wrapper.get_params() == {}
+
+        release = wrapper.request_params()
+        await wrapper.update()  # The state poll never fetches parameters
+        assert get_params.call_count == 0
+        assert wrapper.params_due
+
+        await wrapper.async_update_params()
+        await wrapper.async_update_params()  # Served from the cache
+        assert get_params.call_count == 1
+        assert wrapper.get_params() == {"operating_hours": 10}
+        assert not wrapper.params_due
+
+        release()
+        wrapper._params_cache.invalidate()
+        assert not wrapper.params_due
@@ -1,53 +1,198 @@
 """Test WinixDevice component."""
 
-from unittest.mock import patch
+import asyncio
+from contextlib import contextmanager
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
+from custom_components.winix.core.capabilities import (
+    DEFAULT_PROFILE,
+    InvalidCommand,
+    compile_profile,
+)
+from custom_components.winix.core.endpoints import DEFAULT_ENDPOINT
 from custom_components.winix.driver import WinixDriver
 
 
 @patch("custom_components.winix.driver.WinixDriver._rpc_attr")
 @pytest.mark.parametrize(
-    ("method", "category", "value"),
+    ("method", "args", "category", "value"),
     [
-        ("turn_off", "power", "off"),
-        ("turn_on", "power", "on"),
-        ("auto", "mode", "auto"),
-        ("manual", "mode", "manual"),
-        ("plasmawave_off", "plasma", "off"),
-        ("plasmawave_on", "plasma", "on"),
-        ("low", "airflow", "low"),
-        ("medium", "airflow", "medium"),
-        ("high", "airflow", "high"),
-        ("turbo", "airflow", "turbo"),
-        ("sleep", "airflow", "sleep"),
+        ("turn_off", (), "power", "off"),
+        ("turn_on", (), "power", "on"),
+        ("set_mode", ("auto",), "mode", "auto"),
+        ("set_mode", ("laundry_dry",), "mode", "laundry_dry"),
+        ("set_fan_speed", ("low",), "fan_speed", "low"),
+        ("set_fan_speed", ("turbo",), "fan_speed", "turbo"),
+        ("set_child_lock", (True,), "child_lock", "on"),
+        ("set_uv_sterilization", (False,), "uv_sterilization", "off"),
     ],
 )
-async def test_turn_off(mock_rpc_attr, mock_driver, method, category, value):
+async def test_turn_off(mock_rpc_attr, mock_driver, method, args, category, value):
     """Test various driver methods."""
 
-    await getattr(mock_driver, method)()
+    await getattr(mock_driver, method)(*args)
     assert mock_rpc_attr.call_count == 1
-    assert mock_rpc_attr.call_args[0] == (
-        WinixDriver.category_keys[category],
-        WinixDriver.state_keys[category][value],
-    )
+    spec = DEFAULT_PROFILE.attributes[category]
+    assert mock_rpc_attr.call_args[0] == (spec.code, spec.values[value])
+
+
+@patch("custom_components.winix.driver.WinixDriver._rpc_attr")
+@pytest.mark.parametrize(
+    ("method", "args"),
+    [
+        ("set_mode", ("turbo",)),
+        ("set_fan_speed", ("medium",)),
+        ("set_humidity", (47,)),
+        ("set_humidity", (80,)),
+        ("set_timer", (13,)),
+    ],
+)
+async def test_invalid_command(mock_rpc_attr, mock_driver, method, args):
+    """Test that commands outside the model profile are not sent."""
+
+    with pytest.raises(InvalidCommand):
+        await getattr(mock_driver, method)(*args)
+    assert mock_rpc_attr.call_count == 0
 
 
 @pytest.mark.parametrize(
     ("mock_driver_with_payload", "expected"),
     [
-        ({"A02": "0"}, {"power": "off"}),
-        ({"A02": "1"}, {"power": "on"}),
-        ({"S08": "79"}, {"air_qvalue": 79}),  # air_qvalue
+        ({"D02": "0"}, {"power": "off"}),
+        ({"D02": "1"}, {"power": "on"}),
+        ({"D10": "55"}, {"current_humidity": 55}),
+        ({"D03": "99", "D10": "x", "Z01": "1"}, {}),  # Unknown values and codes
     ],
     indirect=["mock_driver_with_payload"],
 )
 async def test_get_state(mock_driver_with_payload, expected):
     """Test get_state."""
 
-    # payload = {"A02": "0"}  # "A02" represents "power" and "0" means "off"
+    # payload = {"D02": "0"}  # "D02" represents "power" and "0" means "off"
 
     state = await mock_driver_with_payload.get_state()
     assert state == expected
+
+
+@pytest.mark.parametrize(
+    ("mock_driver_with_payload", "expected"),
+    [
+        ({"D21": "120", "D22": "4000"}, {"filter_usage_hours": 120, "operating_hours": 4000}),
+        ({"D21": "x", "D99": "1"}, {}),  # Non-numeric and unknown codes are ignored
+    ],
+    indirect=["mock_driver_with_payload"],
+)
+async def test_get_params(mock_driver_with_payload, expected):
+    """Test get_params with a profile that declares parameter codes."""
+
+    mock_driver_with_payload.profile = compile_profile(
+        "with_params",
+        {"params": {"filter_usage_hours": "D21", "operating_hours": "D22"}},
+        DEFAULT_PROFILE,
+    )
+    params = await mock_driver_with_payload.get_params()
+    assert params == expected
+    assert mock_driver_with_payload._client.get.call_args[0][0] == (
+        WinixDriver.PARAM_URL.format(
+            base=DEFAULT_ENDPOINT.api_url, deviceid="device_1"
+        )
+    )
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload", [{"D02": "1"}], indirect=["mock_driver_with_payload"]
+)
+async def test_get_state_single_flight(mock_driver_with_payload):
+    """Test that concurrent and back-to-back get_state calls share one request."""
+    driver = mock_driver_with_payload
+
+    states = await asyncio.gather(*(driver.get_state() for _ in range(5)))
+    assert states == [{"power": "on"}] * 5
+    assert driver._client.get.call_count == 1
+
+    # Answered by the micro-cache
+    await driver.get_state()
+    assert driver._client.get.call_count == 1
+
+    # Callers get their own copy
+    states[0]["power"] = "off"
+    assert (await driver.get_state()) == {"power": "on"}
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload", [{"D02": "1"}], indirect=["mock_driver_with_payload"]
+)
+async def test_get_state_after_command(mock_driver_with_payload):
+    """Test that a command invalidates the cached state."""
+    driver = mock_driver_with_payload
+    driver.state_cache_ttl = 60
+    driver._client.get.return_value.text = AsyncMock(return_value="ok")
+
+    await driver.get_state()
+    await driver.turn_on()
+    await driver.get_state()
+
+    # Two state requests and one control request
+    assert driver._client.get.call_count == 3
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload",
+    [{"D02": "1", "D77": "5"}],
+    indirect=["mock_driver_with_payload"],
+)
+async def test_get_state_keeps_raw_attributes(mock_driver_with_payload):
+    """Test that codes outside the profile stay available from the last poll."""
+    driver = mock_driver_with_payload
+
+    assert await driver.get_state() == {"power": "on"}
+    assert driver.raw_attributes.unknown_codes() == ["D77"]
+    assert driver.raw_attributes["D77"] == 5
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload", [{"D77": "5"}], indirect=["mock_driver_with_payload"]
+)
+@pytest.mark.parametrize("body", [{"body": {"data": []}}, {"body": "unexpected"}])
+async def test_get_state_without_data_clears_raw_attributes(
+    mock_driver_with_payload, body
+):
+    """Test that a response without data leaves no stale raw attributes."""
+    driver = mock_driver_with_payload
+    driver.state_cache_ttl = 0
+    await driver.get_state()
+    assert driver.raw_attributes["D77"] == 5
+
+    driver._client.get.return_value.json.return_value = body
+    assert await driver.get_state() == {}
+    assert driver.raw_attributes.get("D77") is None
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload", [{"D02": "1"}], indirect=["mock_driver_with_payload"]
+)
+async def test_get_state_decode_is_timed(mock_driver_with_payload):
+    """Test that only the synchronous decode is reported as blocking."""
+    driver = mock_driver_with_payload
+    labels = []
+
+    @contextmanager
+    def blocking(label):
+        labels.append(label)
+        driver._client.get.assert_awaited_once()
+        yield
+
+    driver.blocking = blocking
+    assert await driver.get_state() == {"power": "on"}
+    assert labels == ["get_state_decode"]
+
+
+@pytest.mark.parametrize(
+    "mock_driver_with_payload", [{"D21": "120"}], indirect=["mock_driver_with_payload"]
+)
+async def test_get_params_without_codes(mock_driver_with_payload):
+    """Test that no request is made when the profile declares no parameters."""
+    assert await mock_driver_with_payload.get_params() == {}
+    mock_driver_with_payload._client.get.assert_not_called()
@@ -0,0 +1,59 @@
+"""Test Winix endpoint selection."""
+
+from unittest.mock import AsyncMock, Mock, patch
+
+from custom_components.winix.const import REGION_AUTO
+from custom_components.winix.core.endpoints import DEFAULT_ENDPOINT, WinixEndpoint
+from custom_components.winix.endpoints import (
+    async_resolve_endpoint,
+    async_select_endpoint,
+)
+
+
+def test_endpoint_for_region():
+    """Test that endpoints are built from the region templates."""
+    endpoint = WinixEndpoint.for_region("kr")
+
+    assert endpoint.api_url == "https://kr.api.winix-iot.com"
+    assert endpoint.mobile_url == "https://kr.mobile.winix-iot.com"
+    assert DEFAULT_ENDPOINT.api_url == "https://us.api.winix-iot.com"
+
+
+async def test_select_fastest_endpoint():
+    """Test that the endpoint with the lowest latency wins."""
+    latencies = {"us": 0.2, "eu": None, "kr": 0.03}
+
+    async def probe(client, endpoint):
+        return latencies[endpoint.region]
+
+    with patch(
+        "custom_components.winix.endpoints.async_probe_latency", side_effect=probe
+    ):
+        endpoint = await async_select_endpoint(Mock())
+
+    assert endpoint.region == "kr"
+
+
+async def test_select_falls_back_to_default():
+    """Test that the default endpoint is used when nothing answers."""
+    with patch(
+        "custom_components.winix.endpoints.async_probe_latency",
+        AsyncMock(return_value=None),
+    ):
+        endpoint = await async_select_endpoint(Mock())
+
+    assert endpoint == DEFAULT_ENDPOINT
+
+
+async def test_resolve_endpoint():
+    """Test resolving configured regions."""
+    assert await async_resolve_endpoint(Mock(), None) == DEFAULT_ENDPOINT
+    assert (await async_resolve_endpoint(Mock(), "eu")).region == "eu"
+
+    with patch(
+        "custom_components.winix.endpoints.async_select_endpoint",
+        AsyncMock(return_value=DEFAULT_ENDPOINT),
+    ) as select:
+        await async_resolve_endpoint(Mock(), REGION_AUTO)
+
+    assert select.call_count == 1
@@ -0,0 +1,71 @@
+"""Test filter life tracking."""
+
+from datetime import datetime
+from unittest.mock import AsyncMock, Mock, patch
+
+import pytest
+
+from custom_components.winix.core.endpoints import DEFAULT_ENDPOINT
+from custom_components.winix.filter_life import (
+    DEFAULT_FILTER_ALARM_HOURS,
+    FilterAlarmCache,
+    remaining_filter_life,
+)
+from custom_components.winix.helpers import WinixException
+
+
+@pytest.mark.parametrize(
+    ("replace_date", "alarm_hours", "expected"),
+    [
+        (None, 100, None),
+        ("not a date", 100, None),
+        ("2024-01-01 00:00:00", 100, 100),
+        ("2023-12-31 23:00:00", 100, 99),
+        ("2023-12-31 00:00:00", 96, 75),
+        ("2023-01-01 00:00:00", 100, 0),  # Overdue filter
+    ],
+)
+def test_remaining_filter_life(replace_date, alarm_hours, expected):
+    """Test remaining filter life calculation."""
+    now = datetime(2024, 1, 1)
+    assert remaining_filter_life(replace_date, alarm_hours, now) == expected
+
+
+async def test_alarm_cache_fetches_concurrently_once():
+    """Test that alarm durations are fetched once per device and cached."""
+    cache = FilterAlarmCache(Mock(), DEFAULT_ENDPOINT)
+
+    with patch(
+        "custom_components.winix.filter_life.Helpers.get_filter_alarm_duration",
+        AsyncMock(return_value=24),
+    ) as get_duration:
+        await cache.async_refresh("token", "uuid", ["a", "b"])
+        await cache.async_refresh("token", "uuid", ["a", "b"])
+
+    assert get_duration.call_count == 2
+    assert cache.get_alarm_hours("a") == 24
+    assert cache.get_alarm_hours("b") == 24
+
+
+async def test_alarm_cache_falls_back_to_default():
+    """Test that a failing device falls back to the default duration."""
+    cache = FilterAlarmCache(Mock(), DEFAULT_ENDPOINT)
+
+    with patch(
+        "custom_components.winix.filter_life.Helpers.get_filter_alarm_duration",
+        AsyncMock(side_effect=WinixException({"message": "failed"})),
+    ):
+        await cache.async_refresh("token", "uuid", ["a"])
+
+    assert cache.get_alarm_hours("a") == DEFAULT_FILTER_ALARM_HOURS
+
+
+async def test_alarm_cache_raises_rejected_token():
+    """Test that a rejected access token is raised for the caller to renew."""
+    cache = FilterAlarmCache(Mock(), DEFAULT_ENDPOINT)
+
+    with patch(
+        "custom_components.winix.filter_life.Helpers.get_filter_alarm_duration",
+        AsyncMock(side_effect=WinixException({"result_code": "900"})),
+    ), pytest.raises(WinixException):
+        await cache.async_refresh("token", "uuid", ["a"])
@@ -0,0 +1,53 @@
+"""Test HumidityHistory."""
+
+import pytest
+
+from custom_components.winix.history import HumidityHistory
+
+
+def test_empty_history():
+    """Test statistics of an empty history."""
+    history = HumidityHistory(4)
+
+    assert len(history) == 0
+    assert history.latest is None
+    assert history.mean is None
+    assert history.minimum is None
+    assert history.maximum is None
+    assert history.rate_per_hour() is None
+    assert history.seconds_to_reach(50) is None
+
+
+def test_rolling_statistics_after_wrap_around():
+    """Test that statistics only cover the retained samples."""
+    history = HumidityHistory(3)
+    for index, value in enumerate([80, 40, 60, 50, 70]):
+        history.append(index * 30.0, value)
+
+    assert len(history) == 3
+    assert list(history.samples()) == [(60.0, 60), (90.0, 50), (120.0, 70)]
+    assert history.latest == (120.0, 70)
+    assert history.mean == pytest.approx(60)
+    assert history.minimum == 50
+    assert history.maximum == 70
+
+
+def test_trend_and_time_to_target():
+    """Test the least squares trend and target estimate."""
+    history = HumidityHistory(10)
+    for minute in range(30):
+        history.append(minute * 60.0, 70 - minute * 0.5)
+
+    assert history.rate_per_hour() == pytest.approx(-30)
+    assert history.seconds_to_reach(50) == pytest.approx(660)
+    assert history.seconds_to_reach(80) is None  # Moving away from target
+    assert history.seconds_to_reach(55.5) == 0.0  # At the target
+
+    # Already below 60 and still falling: past the target, not reaching it
+    assert history.seconds_to_reach(60) is None
+
+
+def test_invalid_capacity():
+    """Test that a too small capacity is rejected."""
+    with pytest.raises(ValueError):
+        HumidityHistory(1)
@@ -0,0 +1,46 @@
+"""Test WinixDehumidifier component."""
+
+from unittest.mock import MagicMock, Mock
+
+from custom_components.winix.const import (
+    ATTR_CHILD_LOCK,
+    ATTR_FAN_SPEED,
+    ATTR_HUMIDITY,
+    ATTR_MODE,
+    ATTR_TIMER,
+    FAN_SPEED_HIGH,
+    MODE_AUTO,
+    OFF_VALUE,
+)
+from custom_components.winix.humidifier import WinixDehumidifier
+
+
+def test_extra_state_attributes_are_stable(mock_device_wrapper):
+    """Test that only stable attributes are exposed on the entity."""
+    mock_device_wrapper.get_state = MagicMock(
+        return_value={
+            ATTR_MODE: MODE_AUTO,
+            ATTR_FAN_SPEED: FAN_SPEED_HIGH,
+            ATTR_CHILD_LOCK: OFF_VALUE,
+            ATTR_HUMIDITY: 55,
+            ATTR_TIMER: 3,
+        }
+    )
+
+    entity = WinixDehumidifier(mock_device_wrapper, Mock())
+
+    assert entity.extra_state_attributes == {
+        ATTR_FAN_SPEED: FAN_SPEED_HIGH,
+        ATTR_CHILD_LOCK: OFF_VALUE,
+    }
+    assert entity.current_humidity == 55
+    assert entity.mode == MODE_AUTO
+
+
+def test_volatile_attributes_are_unrecorded(mock_device_wrapper):
+    """Test that volatile attributes are excluded from the recorder."""
+    entity = WinixDehumidifier(mock_device_wrapper, Mock())
+
+    assert ATTR_HUMIDITY in entity._unrecorded_attributes
+    assert ATTR_TIMER in entity._unrecorded_attributes
+    assert ATTR_FAN_SPEED not in entity._unrecorded_attributes
@@ -0,0 +1,56 @@
+"""Test that importing the integration stays cheap."""
+
+import json
+import subprocess
+import sys
+
+HEAVY_MODULES = {"Crypto", "jose", "winix"}
+CORE_FORBIDDEN_MODULES = HEAVY_MODULES | {"aiohttp", "boto3", "homeassistant", "requests"}
+
+
+def import_in_subprocess(*modules: str) -> set[str]:
+    """Import modules in a fresh interpreter and return the loaded modules."""
+    code = (
+        "import json, sys\n"
+        + "".join(f"import {module}\n" for module in modules)
+        + "print(json.dumps(sorted(sys.modules)))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    )
+    return set(json.loads(result.stdout))
+
+
+def top_level(modules: set[str]) -> set[str]:
+    """Return the top level packages of modules."""
+    return {name.split(".")[0] for name in modules}
+
+
+def test_core_has_no_heavy_imports():
+    """Test that the protocol layer loads without its heavy dependencies."""
+    loaded = import_in_subprocess(
+        "custom_components.winix.core.codec",
+        "custom_components.winix.core.driver",
+        "custom_components.winix.core.mobile",
+        "custom_components.winix.core.models",
+    )
+
+    assert not top_level(loaded) & CORE_FORBIDDEN_MODULES
+    # The core does not depend on the integration modules around it
+    assert not {
+        name
+        for name in loaded
+        if name.startswith("custom_components.winix.")
+        and not name.startswith("custom_components.winix.core")
+    }
+
+
+def test_integration_import_budget():
+    """Test that loading the integration defers login and crypto libraries."""
+    loaded = import_in_subprocess(
+        "custom_components.winix.integration",
+        "custom_components.winix.humidifier",
+        "custom_components.winix.sensor",
+    )
+
+    assert not top_level(loaded) & HEAVY_MODULES
@@ -1 +1,149 @@
 """Test component setup."""
+
+from unittest.mock import AsyncMock, MagicMock, Mock
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.winix.const import (
+    CONF_MAX_CONCURRENCY,
+    SERVICE_REMOVE_STALE_ENTITIES,
+    SERVICE_SET_HUMIDITY,
+    WINIX_DOMAIN,
+)
+from custom_components.winix.integration import (
+    async_register_services,
+    async_update_options,
+    setup_hass_services,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import ATTR_ENTITY_ID, ATTR_RESTORED, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+from . import build_mock_wrapper
+
+
+def add_device(
+    hass: HomeAssistant, entry: MockConfigEntry, mac: str
+) -> tuple[str, str]:
+    """Register a device with one sensor, return the device and entity ids."""
+    device = dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id, identifiers={(WINIX_DOMAIN, mac)}
+    )
+    entity = er.async_get(hass).async_get_or_create(
+        "sensor",
+        WINIX_DOMAIN,
+        f"sensor.{WINIX_DOMAIN}_humidity_{mac}",
+        config_entry=entry,
+        device_id=device.id,
+    )
+    return device.id, entity.entity_id
+
+
+async def test_remove_stale_entities(hass: HomeAssistant) -> None:
+    """Test that only stale registry entries of Winix entries are removed."""
+    entry = MockConfigEntry(domain=WINIX_DOMAIN, data={}, entry_id="id1")
+    entry.add_to_hass(hass)
+    entry.mock_state(hass, ConfigEntryState.LOADED)
+    entry.runtime_data = Mock()
+    entry.runtime_data.get_device_wrappers.return_value = [
+        Mock(device_stub=Mock(mac="F190D35456D0"))
+    ]
+
+    current_device, current_entity = add_device(hass, entry, "f190d35456d0")
+    removed_device, removed_entity = add_device(hass, entry, "f190d35456d1")
+
+    # Still registered for a current device, but no platform provides it
+    orphan = er.async_get(hass).async_get_or_create(
+        "sensor",
+        WINIX_DOMAIN,
+        f"sensor.{WINIX_DOMAIN}_timer_f190d35456d0",
+        config_entry=entry,
+        device_id=current_device,
+    )
+    hass.states.async_set(
+        orphan.entity_id, STATE_UNAVAILABLE, {ATTR_RESTORED: True}
+    )
+
+    other_entry = MockConfigEntry(domain="other", data={})
+    other_entry.add_to_hass(hass)
+    other_device, other_entity = add_device(hass, other_entry, "f190d35456d2")
+
+    setup_hass_services(hass)
+
+    response = await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_REMOVE_STALE_ENTITIES,
+        {"dry_run": True},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["dry_run"] is True
+    assert set(response["entities"]) == {removed_entity, orphan.entity_id}
+    assert response["devices"] == [removed_device]
+    assert er.async_get(hass).async_get(removed_entity)
+
+    await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_REMOVE_STALE_ENTITIES, blocking=True
+    )
+
+    entity_registry = er.async_get(hass)
+    device_registry = dr.async_get(hass)
+    assert entity_registry.async_get(current_entity)
+    assert entity_registry.async_get(other_entity)
+    assert not entity_registry.async_get(removed_entity)
+    assert not entity_registry.async_get(orphan.entity_id)
+    assert device_registry.async_get(current_device)
+    assert device_registry.async_get(other_device)
+    assert not device_registry.async_get(removed_device)
+
+
+async def test_humidifier_service_targets_entity_devices(hass: HomeAssistant) -> None:
+    """Test that a service call reaches the devices of the given entities."""
+    entry = MockConfigEntry(domain=WINIX_DOMAIN, data={}, entry_id="id1")
+    entry.add_to_hass(hass)
+
+    wrappers = [build_mock_wrapper(index) for index in range(2)]
+    for wrapper in wrappers:
+        wrapper.async_set_humidity = AsyncMock()
+    _, entity_id = add_device(hass, entry, wrappers[0].device_stub.mac)
+    add_device(hass, entry, wrappers[1].device_stub.mac)
+
+    manager = Mock(track=MagicMock())
+    manager.get_device_wrappers.return_value = wrappers
+    async_register_services(hass, manager)
+
+    await hass.services.async_call(
+        WINIX_DOMAIN,
+        SERVICE_SET_HUMIDITY,
+        {ATTR_ENTITY_ID: entity_id, "humidity": "45"},
+        blocking=True,
+    )
+    wrappers[0].async_set_humidity.assert_awaited_once_with(target_humidity=45)
+    wrappers[1].async_set_humidity.assert_not_awaited()
+
+    # Without entities the call goes to every device
+    await hass.services.async_call(
+        WINIX_DOMAIN, SERVICE_SET_HUMIDITY, {"humidity": 50}, blocking=True
+    )
+    wrappers[1].async_set_humidity.assert_awaited_once_with(target_humidity=50)
+
+
+async def test_update_listener_ignores_data_updates(hass: HomeAssistant) -> None:
+    """Test that options are only applied again when they changed."""
+    entry = MockConfigEntry(
+        domain=WINIX_DOMAIN, data={}, options={CONF_MAX_CONCURRENCY: 4}
+    )
+    entry.runtime_data = manager = Mock(
+        recording=False,
+        applied_options={CONF_MAX_CONCURRENCY: 4},
+        async_apply_options=AsyncMock(),
+    )
+
+    # e.g. a refreshed access token
+    await async_update_options(hass, entry)
+    manager.async_apply_options.assert_not_awaited()
+
+    manager.applied_options = {}
+    await async_update_options(hass, entry)
+    manager.async_apply_options.assert_awaited_once_with(entry.options)
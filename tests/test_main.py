@@ -0,0 +1,152 @@
+"""Test the command line interface."""
+
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from custom_components.winix.__main__ import FleetRunner, build_parser, main
+from custom_components.winix.core.endpoints import DEFAULT_ENDPOINT
+from custom_components.winix.device_wrapper import MyWinixDeviceStub
+from custom_components.winix.driver import WinixDriver
+from custom_components.winix.telemetry import STATUS_OK, TelemetryWriter
+from custom_components.winix.traffic import ReplayClient
+
+
+def build_stub(index: int) -> MyWinixDeviceStub:
+    """Return a device stub."""
+    return MyWinixDeviceStub(
+        id=f"device_{index}",
+        mac=f"f190d35456d{index}",
+        alias=f"Dehumidifier{index}",
+        location_code="",
+        filter_replace_date="",
+        model="",
+        sw_version="",
+    )
+
+
+def build_replay(count: int) -> ReplayClient:
+    """Return a replay client answering state and power requests."""
+    records = []
+    for index in range(count):
+        device_id = f"device_{index}"
+        records.append(
+            {
+                "m": "GET",
+                "u": WinixDriver.STATE_URL.format(
+                    base=DEFAULT_ENDPOINT.api_url, deviceid=device_id
+                ),
+                "s": 200,
+                "t": 0,
+                "x": json.dumps(
+                    {"body": {"data": [{"attributes": {"D02": "1", "D10": "60"}}]}}
+                ),
+            }
+        )
+        records.append(
+            {
+                "m": "GET",
+                "u": WinixDriver.CTRL_URL.format(
+                    base=DEFAULT_ENDPOINT.api_url,
+                    deviceid=device_id,
+                    attribute="D02",
+                    value="0",
+                ),
+                "s": 200,
+                "t": 0,
+                "x": "",
+            }
+        )
+    return ReplayClient(records)
+
+
+async def test_poll_streams_json_lines():
+    """Test that each device state is written as one JSON line."""
+    output = io.StringIO()
+    runner = FleetRunner(
+        build_replay(3),
+        DEFAULT_ENDPOINT,
+        [build_stub(index) for index in range(3)],
+        2,
+        output,
+    )
+
+    await runner.async_poll(0)
+
+    lines = [json.loads(line) for line in output.getvalue().splitlines()]
+    assert {line["device_id"] for line in lines} == {"device_0", "device_1", "device_2"}
+    assert lines[0]["state"] == {"power": "on", "current_humidity": 60}
+    assert runner.errors == 0
+    assert "3 requests, 0 errors" in runner.summary()
+
+
+async def test_command_fans_out():
+    """Test that a command is sent to every device."""
+    output = io.StringIO()
+    client = build_replay(2)
+    runner = FleetRunner(
+        client,
+        DEFAULT_ENDPOINT,
+        [build_stub(index) for index in range(2)],
+        8,
+        output,
+    )
+
+    await runner.async_command("power", "off")
+
+    assert client.requests == 2
+    assert all("error" not in json.loads(line) for line in output.getvalue().splitlines())
+
+
+def test_parser():
+    """Test argument parsing."""
+    args = build_parser().parse_args(
+        ["-u", "user", "-p", "pass", "poll", "--interval", "0", "--count", "5"]
+    )
+    assert args.action == "poll"
+    assert args.interval == 0
+    assert args.count == 5
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["-c", "0", "poll"],
+        ["-c", "many", "poll"],
+        ["poll", "--interval", "-1"],
+        ["poll", "--count", "-1"],
+    ],
+)
+def test_parser_rejects_out_of_range(args):
+    """Test that counts and intervals outside their range are rejected."""
+    with pytest.raises(SystemExit):
+        build_parser().parse_args(args)
+
+
+def test_cli_does_not_import_home_assistant():
+    """Test that the CLI module loads without Home Assistant."""
+    code = (
+        "import sys, custom_components.winix.__main__; "
+        "sys.exit(any(m.startswith('homeassistant') for m in sys.modules))"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_telemetry_summary(tmp_path):
+    """Test that a telemetry log is summarized without credentials."""
+    writer = TelemetryWriter(tmp_path / "log")
+    for index in range(10):
+        writer.record(1000.0 + index, "device_0", 0.1, STATUS_OK, 50, 50, "auto")
+    writer.flush()
+
+    output = tmp_path / "summary.jsonl"
+    argv = ["-o", str(output), "telemetry", str(tmp_path / "log"), "-P", "50"]
+    assert main(argv) == 0
+
+    summary = json.loads(output.read_text())
+    assert summary["records"] == 10
+    assert summary["latency"] == {"50": pytest.approx(0.1)}
+    assert summary["devices"] == {"device_0": 10}
@@ -0,0 +1,419 @@
+"""Test WinixManager."""
+
+import asyncio
+import base64
+import json
+import time
+from unittest.mock import AsyncMock, Mock, patch
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.winix.const import (
+    CONF_DEBOUNCE,
+    CONF_LOOP_WATCHDOG,
+    CONF_MAX_CONCURRENCY,
+    CONF_REQUEST_TIMEOUT,
+    CONF_TELEMETRY,
+    WINIX_AUTH_RESPONSE,
+    WINIX_DOMAIN,
+)
+from custom_components.winix.device_wrapper import MyWinixDeviceStub
+from custom_components.winix.filter_life import DEFAULT_FILTER_ALARM_HOURS
+from custom_components.winix.helpers import WinixException
+from custom_components.winix.manager import WinixManager
+from custom_components.winix.telemetry import (
+    STATUS_ERROR,
+    STATUS_OK,
+    TelemetryReader,
+)
+from homeassistant.const import CONF_PASSWORD, CONF_SCAN_INTERVAL, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+
+def build_token(expires_at: float) -> str:
+    """Return an unsigned access token expiring at expires_at."""
+    claims = json.dumps({"exp": int(expires_at)}).encode()
+    payload = base64.urlsafe_b64encode(claims).decode().rstrip("=")
+    return f"header.{payload}.signature"
+
+
+def build_stub(index: int, alias: str | None = None) -> MyWinixDeviceStub:
+    """Return a device stub."""
+    return MyWinixDeviceStub(
+        id=f"device_{index}",
+        mac=f"f190d35456d{index}",
+        alias=alias or f"Dehumidifier{index}",
+        location_code="",
+        filter_replace_date="2024-01-01 00:00:00",
+        model="DXJH120",
+        sw_version="1.0",
+    )
+
+
+async def build_manager(
+    hass: HomeAssistant, stubs: list[MyWinixDeviceStub]
+) -> WinixManager:
+    """Return a manager holding wrappers for stubs."""
+    entry = MockConfigEntry(domain=WINIX_DOMAIN, data={}, entry_id="id1")
+    entry.add_to_hass(hass)
+
+    manager = WinixManager(hass, entry, Mock(access_token="token"), 30, Mock())
+    with patch(
+        "custom_components.winix.manager.get_uuid", return_value="uuid"
+    ), patch(
+        "custom_components.winix.manager.Helpers.get_device_stubs",
+        AsyncMock(return_value=stubs),
+    ), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh",
+        AsyncMock(),
+    ):
+        await manager.prepare_devices_wrappers()
+
+    return manager
+
+
+async def test_rediscover_applies_diff(hass: HomeAssistant) -> None:
+    """Test that rediscovery adds, removes and updates devices in place."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    kept = manager.get_device_wrappers()[0]
+
+    device_registry = dr.async_get(hass)
+    for wrapper in manager.get_device_wrappers():
+        device_registry.async_get_or_create(
+            config_entry_id="id1",
+            identifiers={(WINIX_DOMAIN, wrapper.device_stub.mac)},
+            name=wrapper.device_stub.alias,
+        )
+
+    added = []
+    async_dispatcher_connect(hass, manager.signal_devices_added, added.extend)
+
+    with patch(
+        "custom_components.winix.manager.Helpers.get_device_stubs",
+        AsyncMock(return_value=[build_stub(0, "Renamed"), build_stub(2)]),
+    ), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh",
+        AsyncMock(),
+    ), patch(
+        "custom_components.winix.device_wrapper.WinixDeviceWrapper.update",
+        AsyncMock(),
+    ):
+        await manager.async_rediscover()
+        await hass.async_block_till_done()
+
+    wrappers = manager.get_device_wrappers()
+    assert [wrapper.device_stub.id for wrapper in wrappers] == ["device_0", "device_2"]
+    assert wrappers[0] is kept
+    assert kept.device_stub.alias == "Renamed"
+    assert [wrapper.device_stub.id for wrapper in added] == ["device_2"]
+
+    assert (
+        device_registry.async_get_device(identifiers={(WINIX_DOMAIN, build_stub(1).mac)})
+        is None
+    )
+    renamed = device_registry.async_get_device(
+        identifiers={(WINIX_DOMAIN, build_stub(0).mac)}
+    )
+    assert renamed.name == "Winix Renamed"
+
+
+async def test_failing_device_backs_off_alone(hass: HomeAssistant) -> None:
+    """Test that a failing device does not hold up or fail the others."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    good, bad = manager.get_device_wrappers()
+    good.update = AsyncMock()
+    bad.update = AsyncMock(side_effect=RuntimeError("timeout"))
+
+    await manager.async_update()
+
+    good_coordinator = manager.get_device_coordinator(good)
+    bad_coordinator = manager.get_device_coordinator(bad)
+    assert good_coordinator.last_update_success
+    assert not bad_coordinator.last_update_success
+    assert bad_coordinator.backing_off
+
+    # The failing device is skipped while backing off
+    with patch("custom_components.winix.manager.asyncio.sleep", AsyncMock()):
+        await manager.async_update()
+
+    assert good.update.call_count == 2
+    assert bad.update.call_count == 1
+
+
+async def test_cycle_deadline_carries_late_device(hass: HomeAssistant) -> None:
+    """Test that a slow device is marked late, carried over, then cancelled."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    manager._cycle_deadline = 0.01
+    manager._scheduler.delay = Mock(return_value=0)
+
+    fast, slow = manager.get_device_wrappers()
+    fast.update = AsyncMock()
+    slow.update = AsyncMock(side_effect=asyncio.Event().wait)
+
+    await manager.async_update()
+
+    slow_coordinator = manager.get_device_coordinator(slow)
+    assert slow_coordinator.late
+    assert not manager.get_device_coordinator(fast).late
+
+    # The pending request is carried into the next cycle, not duplicated
+    await manager.async_update()
+    assert slow.update.call_count == 1
+    assert fast.update.call_count == 2
+    assert slow_coordinator.late_cycles == 2
+
+    # It was given up on, so the next cycle starts a new request
+    await manager.async_update()
+    assert slow.update.call_count == 2
+
+
+async def test_fleet_recomputed_per_cycle(hass: HomeAssistant) -> None:
+    """Test that fleet statistics are cached until the next poll cycle."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    first, second = manager.get_device_wrappers()
+    for wrapper, humidity in ((first, 60), (second, 70)):
+        wrapper._state = {"power": "on", "current_humidity": humidity}
+        wrapper._on = True
+        wrapper.update = AsyncMock()
+
+    fleet = manager.fleet
+    assert fleet.humidity_mean == 65
+    assert fleet.running == 2
+    assert manager.fleet is fleet
+
+    second._on = False
+    await manager._async_update_data()
+
+    assert manager.fleet is not fleet
+    assert manager.fleet.running == 1
+
+
+async def test_offline_pauses_polling_and_resume_polls_all(
+    hass: HomeAssistant,
+) -> None:
+    """Test that no device is polled offline and all are polled on resume."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    manager.supervisor.add_listener(manager._handle_connectivity)
+    wrappers = manager.get_device_wrappers()
+    for wrapper in wrappers:
+        wrapper.update = AsyncMock()
+
+    manager.supervisor.online = False
+    await manager.async_update()
+    assert all(wrapper.update.call_count == 0 for wrapper in wrappers)
+
+    # A device backing off from failures before the outage was detected
+    manager.get_device_coordinator(wrappers[1])._retry_at = float("inf")
+    manager._staggered = True
+
+    manager.supervisor.online = True
+    manager.supervisor._notify()
+    await hass.async_block_till_done()
+
+    assert all(wrapper.update.call_count == 1 for wrapper in wrappers)
+
+
+async def test_apply_options_live(hass: HomeAssistant) -> None:
+    """Test that options reach wrappers, coordinators and new devices."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    wrapper = manager.get_device_wrappers()[0]
+    coordinator = manager.get_device_coordinator(wrapper)
+    assert manager.watchdog is None
+
+    await manager.async_apply_options(
+        {
+            CONF_SCAN_INTERVAL: 60,
+            CONF_REQUEST_TIMEOUT: 4.0,
+            CONF_MAX_CONCURRENCY: 1,
+            CONF_DEBOUNCE: 0.5,
+            CONF_LOOP_WATCHDOG: True,
+        }
+    )
+
+    assert manager.update_interval.total_seconds() == 60
+    assert coordinator.scan_interval == 60
+    assert wrapper._driver.request_timeout == 4.0
+    assert wrapper._driver.state_cache_ttl == 0.5
+    assert manager.watchdog is not None
+
+    # One poll at a time
+    running = 0
+    peak = 0
+
+    async def update() -> None:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0)
+        running -= 1
+
+    for device in manager.get_device_wrappers():
+        device.update = update
+    await manager.async_update()
+    assert peak == 1
+
+    added = manager._create_wrapper(build_stub(2))
+    assert added._driver.request_timeout == 4.0
+    assert manager.get_device_coordinator(added).limiter is coordinator.limiter
+
+    await manager.async_apply_options({})
+    assert manager.update_interval.total_seconds() == 30
+    assert manager.watchdog is None
+
+
+async def test_telemetry_records_each_poll(hass: HomeAssistant, tmp_path) -> None:
+    """Test that every poll of a cycle is logged once telemetry is enabled."""
+    manager = await build_manager(hass, [build_stub(0), build_stub(1)])
+    good, bad = manager.get_device_wrappers()
+    good.update = AsyncMock()
+    good.get_state = Mock(return_value={"current_humidity": 55, "mode": "auto"})
+    bad.update = AsyncMock(side_effect=RuntimeError("timeout"))
+
+    with patch.object(hass.config, "path", return_value=str(tmp_path)):
+        await manager.async_apply_options({CONF_TELEMETRY: True})
+    await manager.async_update()
+    await manager._async_flush_telemetry()
+
+    reader = TelemetryReader(tmp_path)
+    records = {record[2]: record for record in reader}
+    assert reader.devices == ["device_0", "device_1"]
+    assert records[0][3:5] == (STATUS_OK, 55)
+    assert records[1][3] == STATUS_ERROR
+
+    await manager.async_apply_options({})
+    assert manager.telemetry is None
+
+
+async def test_params_refresh_outside_poll(hass: HomeAssistant) -> None:
+    """Test that a slow parameter request does not hold up the poll cycle."""
+    manager = await build_manager(hass, [build_stub(0)])
+    wrapper = manager.get_device_wrappers()[0]
+    wrapper.update = AsyncMock()
+    wrapper.request_params()
+
+    release = asyncio.Event()
+
+    async def get_params() -> dict[str, int]:
+        await release.wait()
+        return {"operating_hours": 10}
+
+    with patch.object(wrapper._driver, "get_params", get_params):
+        await manager.async_update()
+        assert wrapper.update.call_count == 1
+        assert wrapper.get_params() == {}
+
+        release.set()
+        await hass.async_block_till_done()
+
+    assert wrapper.get_params() == {"operating_hours": 10}
+
+
+async def test_filter_alarms_refresh_expired_token(hass: HomeAssistant) -> None:
+    """Test that an expired access token is renewed before filter alarm requests."""
+    manager = await build_manager(hass, [build_stub(0)])
+    manager._set_token(build_token(time.time() - 60), "uuid")
+
+    fresh = build_token(time.time() + 3600)
+    refresh_auth = AsyncMock(
+        return_value=Mock(access_token=fresh, refresh_token="r2", id_token="i2")
+    )
+    alarms = AsyncMock()
+    with patch(
+        "custom_components.winix.manager.Helpers.async_refresh_auth", refresh_auth
+    ), patch(
+        "custom_components.winix.manager.get_uuid", return_value="uuid2"
+    ), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh", alarms
+    ):
+        await manager._async_refresh_filter_alarms()
+
+    refresh_auth.assert_awaited_once()
+    alarms.assert_awaited_once_with(fresh, "uuid2", device_ids=["device_0"])
+    auth_response = manager.config_entry.data[WINIX_AUTH_RESPONSE]
+    assert auth_response.access_token == fresh
+    assert auth_response.refresh_token == "r2"
+
+
+async def test_filter_alarms_renew_rejected_token(hass: HomeAssistant) -> None:
+    """Test that a filter alarm request rejected with code 900 is retried."""
+    manager = await build_manager(hass, [build_stub(0)])
+
+    fresh = build_token(time.time() + 3600)
+    alarms = AsyncMock(side_effect=[WinixException({"result_code": "900"}), None])
+    with patch(
+        "custom_components.winix.manager.Helpers.async_refresh_auth",
+        AsyncMock(return_value=Mock(access_token=fresh)),
+    ), patch("custom_components.winix.manager.get_uuid", return_value="uuid2"), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh", alarms
+    ):
+        await manager._async_refresh_filter_alarms()
+
+    assert alarms.call_count == 2
+    assert alarms.call_args.args == (fresh, "uuid2")
+
+
+async def test_filter_alarm_failure_is_logged(hass: HomeAssistant, caplog) -> None:
+    """Test that a failed filter alarm refresh keeps the default durations."""
+    manager = await build_manager(hass, [build_stub(0)])
+
+    with patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh",
+        AsyncMock(side_effect=RuntimeError("boom")),
+    ):
+        await manager._async_refresh_filter_alarms()
+
+    assert "Failed to refresh filter alarms: boom" in caplog.text
+    wrapper = manager.get_device_wrappers()[0]
+    assert wrapper.filter_alarm_hours == DEFAULT_FILTER_ALARM_HOURS
+
+
+async def test_rediscover_refreshes_expired_token(hass: HomeAssistant) -> None:
+    """Test that rediscovery renews an expired token before listing devices."""
+    manager = await build_manager(hass, [build_stub(0)])
+    manager._set_token(build_token(time.time() - 60), "uuid")
+
+    fresh = build_token(time.time() + 3600)
+    get_device_stubs = AsyncMock(return_value=[build_stub(0)])
+    with patch(
+        "custom_components.winix.manager.Helpers.async_refresh_auth",
+        AsyncMock(return_value=Mock(access_token=fresh)),
+    ), patch("custom_components.winix.manager.get_uuid", return_value="uuid2"), patch(
+        "custom_components.winix.manager.Helpers.get_device_stubs", get_device_stubs
+    ), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh", AsyncMock()
+    ):
+        await manager.async_rediscover()
+
+    assert get_device_stubs.call_args.args[1:3] == (fresh, "uuid2")
+
+
+async def test_rediscover_logs_in_after_rejected_token(hass: HomeAssistant) -> None:
+    """Test that a token rejected with code 900 is replaced by a new login."""
+    manager = await build_manager(hass, [build_stub(0)])
+    hass.config_entries.async_update_entry(
+        manager.config_entry, data={CONF_USERNAME: "user", CONF_PASSWORD: "pass"}
+    )
+
+    fresh = build_token(time.time() + 3600)
+    login = AsyncMock(return_value=Mock(access_token=fresh))
+    get_device_stubs = AsyncMock(
+        side_effect=[WinixException({"result_code": "900"}), [build_stub(0)]]
+    )
+    with patch(
+        "custom_components.winix.manager.Helpers.async_refresh_auth",
+        AsyncMock(side_effect=WinixException({"result_code": "NotAuthorized"})),
+    ), patch("custom_components.winix.manager.Helpers.async_login", login), patch(
+        "custom_components.winix.manager.get_uuid", return_value="uuid2"
+    ), patch(
+        "custom_components.winix.manager.Helpers.get_device_stubs", get_device_stubs
+    ), patch(
+        "custom_components.winix.manager.FilterAlarmCache.async_refresh", AsyncMock()
+    ):
+        await manager.async_rediscover()
+
+    assert login.call_args.args[1:3] == ("user", "pass")
+    assert get_device_stubs.call_count == 2
+    assert get_device_stubs.call_args.args[1:3] == (fresh, "uuid2")
+    assert manager.config_entry.data[WINIX_AUTH_RESPONSE].access_token == fresh
@@ -0,0 +1,33 @@
+"""Test PollScheduler."""
+
+import pytest
+
+from custom_components.winix.scheduler import PollScheduler
+
+
+def test_phase_is_deterministic_and_within_window():
+    """Test that phases are stable and inside the spread window."""
+    scheduler = PollScheduler(30, 0.5, 1.0)
+
+    for index in range(100):
+        device_id = f"device_{index}"
+        phase = scheduler.phase(device_id)
+        assert 0 <= phase < 15
+        assert phase == PollScheduler(30, 0.5, 1.0).phase(device_id)
+
+
+def test_phases_are_spread():
+    """Test that many devices cover the window instead of one tick."""
+    scheduler = PollScheduler(30, 0.5, 0)
+    phases = [scheduler.phase(f"device_{index}") for index in range(200)]
+
+    buckets = {int(phase // 3) for phase in phases}
+    assert buckets == {0, 1, 2, 3, 4}
+
+
+def test_delay_adds_bounded_jitter():
+    """Test that jitter is added and the delay stays within the window."""
+    scheduler = PollScheduler(30, 0.5, 1.0, rng=lambda: 0.5)
+    phase = scheduler.phase("device_1")
+
+    assert scheduler.delay("device_1") == pytest.approx(min(phase + 0.5, 15))
@@ -1,122 +1,184 @@
-"""Test WinixAirQualitySensor component."""
+"""Test WinixSensor component."""
 
-from unittest.mock import MagicMock, Mock
+from datetime import timedelta
+from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.winix.const import (
-    ATTR_AIR_AQI,
-    ATTR_AIR_QUALITY,
-    ATTR_AIR_QVALUE,
-    ATTR_FILTER_HOUR,
-    SENSOR_AIR_QVALUE,
-    SENSOR_AQI,
-    WINIX_DATA_COORDINATOR,
-    WINIX_DOMAIN,
-)
+from custom_components.winix.const import ATTR_HUMIDITY, SENSOR_HUMIDITY, WINIX_DOMAIN
+from custom_components.winix.core.capabilities import DEFAULT_PROFILE, RawAttributes
+from custom_components.winix.filter_life import remaining_filter_life
 from custom_components.winix.sensor import (
-    TOTAL_FILTER_LIFE,
+    FLEET_SENSOR_DESCRIPTIONS,
+    SENSOR_DESCRIPTIONS,
+    WinixRawSensor,
     WinixSensor,
+    WinixSensorEntityDescription,
     async_setup_entry,
 )
-from tests import build_fake_manager
+from tests import build_fake_manager, build_mock_wrapper
 
 
 async def test_setup_platform():
     """Test platform setup."""
 
     manager = build_fake_manager(3)
+    manager.watchdog = None
     hass = Mock()
     config = MockConfigEntry(domain=WINIX_DOMAIN, data={}, entry_id="id1")
-    hass.data = {WINIX_DOMAIN: {"id1": {WINIX_DATA_COORDINATOR: manager}}}
+    config.runtime_data = manager
 
     async_add_entities = Mock()
-    await async_setup_entry(hass, config, async_add_entities)
-    assert async_add_entities.called
-    assert len(async_add_entities.call_args[0][0]) == 9  # 3 sensors per device
+    with patch("custom_components.winix.sensor.async_dispatcher_connect"):
+        await async_setup_entry(hass, config, async_add_entities)
+    device_sensors, fleet_sensors = async_add_entities.call_args_list
+    # Parameter sensors need codes the default profile does not declare
+    assert len(device_sensors[0][0]) == 3 * len(
+        [description for description in SENSOR_DESCRIPTIONS if description.param is None]
+    )
+    assert len(fleet_sensors[0][0]) == len(FLEET_SENSOR_DESCRIPTIONS)
 
 
-def test_sensor_construction(mock_qvalue_description):
+def test_sensor_construction(mock_humidity_description):
     """Test sensor construction."""
     device_wrapper = Mock()
     device_wrapper.get_state = MagicMock(return_value={})
     coordinator = Mock()
 
-    sensor = WinixSensor(device_wrapper, coordinator, mock_qvalue_description)
+    sensor = WinixSensor(device_wrapper, coordinator, mock_humidity_description)
     assert sensor.unique_id is not None
     assert sensor.device_info is not None
     assert sensor.name is not None
-    assert sensor.unit_of_measurement == "qv"
+    assert sensor.unit_of_measurement == "%"
 
 
-def test_sensor_availability(mock_qvalue_description):
+def test_sensor_availability(mock_humidity_description):
     """Test sensor availability."""
     device_wrapper = Mock()
     device_wrapper.get_state = MagicMock(return_value=None)
     coordinator = Mock()
 
-    sensor = WinixSensor(device_wrapper, coordinator, mock_qvalue_description)
+    sensor = WinixSensor(device_wrapper, coordinator, mock_humidity_description)
     assert not sensor.available
 
     device_wrapper.get_state = MagicMock(return_value={})
     assert sensor.available
 
 
-def test_sensor_attributes(mock_device_wrapper, mock_qvalue_description):
-    """Test sensor attributes."""
-    mock_device_wrapper.get_state = MagicMock(return_value=None)
-    coordinator = Mock()
-
-    sensor = WinixSensor(mock_device_wrapper, coordinator, mock_qvalue_description)
-
-    # Initially we will have no value
-    assert sensor.extra_state_attributes is not None
-    assert sensor.extra_state_attributes[ATTR_AIR_QUALITY] is None
-
-    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_AIR_QUALITY: 12})
-    assert sensor.extra_state_attributes[ATTR_AIR_QUALITY] == 12
-
-
-@pytest.mark.parametrize(
-    ("sensor_key", "state_key", "state_value", "expected"),
-    [
-        (SENSOR_AIR_QVALUE, ATTR_AIR_QVALUE, 100, 100),
-        (SENSOR_AQI, ATTR_AIR_AQI, 100, 100),
-    ],
-)
-def test_sensor_native_value(
-    state_key, state_value, expected, mock_sensor_description, mock_device_wrapper
-):
+def test_sensor_native_value(mock_device_wrapper, mock_humidity_description):
     """Test sensor native state values."""
     mock_device_wrapper.get_state = MagicMock(return_value=None)
     coordinator = Mock()
 
-    sensor = WinixSensor(mock_device_wrapper, coordinator, mock_sensor_description)
-    assert sensor.state is None
+    sensor = WinixSensor(mock_device_wrapper, coordinator, mock_humidity_description)
+    sensor.async_write_ha_state = Mock()
+    assert sensor.native_value is None
 
-    mock_device_wrapper.get_state = MagicMock(return_value={state_key: state_value})
-    assert sensor.native_value == expected
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 55})
+    sensor._handle_coordinator_update()
+    assert sensor.native_value == 55
 
 
 @pytest.mark.parametrize(
-    ("filter_hour", "expected"),
+    ("alarm_hours", "replace_date"),
     [
-        (None, None),
-        (100, 98),  # 100 hour
-        (TOTAL_FILTER_LIFE + 1, None),  # Overbound filter life
+        (None, "2024-01-01 00:00:00"),  # Alarm duration not fetched yet
+        (6480, None),  # Unknown replacement date
+        (6480, "2024-01-01 00:00:00"),
     ],
 )
 def test_filter_life_sensor_native_value(
-    filter_hour, expected, mock_device_wrapper, mock_filter_life_description
+    alarm_hours, replace_date, mock_device_wrapper, mock_filter_life_description
 ):
     """Test filter life sensor state."""
-    mock_device_wrapper.get_state = MagicMock(return_value=None)
-    coordinator = Mock()
+    mock_device_wrapper.get_state = MagicMock(return_value={})
+    mock_device_wrapper.filter_alarm_hours = alarm_hours
+    mock_device_wrapper.device_stub.filter_replace_date = replace_date
 
-    sensor = WinixSensor(mock_device_wrapper, coordinator, mock_filter_life_description)
+    sensor = WinixSensor(mock_device_wrapper, Mock(), mock_filter_life_description)
 
-    mock_device_wrapper.get_state = MagicMock(
-        return_value={} if filter_hour is None else {ATTR_FILTER_HOUR: filter_hour}
+    expected = (
+        None
+        if alarm_hours is None
+        else remaining_filter_life(replace_date, alarm_hours)
     )
     assert sensor.native_value == expected
+
+
+def test_sensor_deadband_and_heartbeat(mock_device_wrapper):
+    """Test that small changes are held back until the heartbeat."""
+    description = WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY,
+        name="Current Humidity",
+        value_fn=lambda wrapper: wrapper.get_state().get(ATTR_HUMIDITY),
+        deadband=2,
+        heartbeat=timedelta(minutes=15),
+    )
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 50})
+
+    sensor = WinixSensor(mock_device_wrapper, Mock(), description)
+    sensor.async_write_ha_state = Mock()
+
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=0):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+    assert sensor.native_value == 50
+
+    # Wobble within the deadband is not published
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 51})
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=30):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+    assert sensor.native_value == 50
+
+    # A meaningful change is published immediately
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 48})
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=60):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.native_value == 48
+
+    # Heartbeat forces the latest value out
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 49})
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=60 + 900):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 3
+    assert sensor.native_value == 49
+
+
+def test_sensor_min_interval(mock_device_wrapper):
+    """Test that changes are rate limited by min_interval."""
+    description = WinixSensorEntityDescription(
+        key=SENSOR_HUMIDITY,
+        name="Current Humidity",
+        value_fn=lambda wrapper: wrapper.get_state().get(ATTR_HUMIDITY),
+        min_interval=timedelta(seconds=60),
+    )
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 50})
+
+    sensor = WinixSensor(mock_device_wrapper, Mock(), description)
+    sensor.async_write_ha_state = Mock()
+
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=0):
+        sensor._handle_coordinator_update()
+
+    mock_device_wrapper.get_state = MagicMock(return_value={ATTR_HUMIDITY: 40})
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=30):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 1
+
+    with patch("custom_components.winix.sensor.time.monotonic", return_value=61):
+        sensor._handle_coordinator_update()
+    assert sensor.async_write_ha_state.call_count == 2
+    assert sensor.native_value == 40
+
+
+def test_raw_sensor():
+    """Test that a passthrough sensor reads its code from the last poll."""
+    wrapper = build_mock_wrapper()
+    wrapper._driver.raw_attributes = RawAttributes(DEFAULT_PROFILE, {"D77": "5"})
+
+    sensor = WinixRawSensor(wrapper, Mock(), "D77")
+    assert sensor.native_value == 5
+    assert not sensor.entity_registry_enabled_default
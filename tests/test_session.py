@@ -0,0 +1,55 @@
+"""Test the Winix connection pool statistics."""
+
+import asyncio
+from unittest.mock import Mock
+
+import aiohttp
+
+from custom_components.winix.session import ConnectionStats, _build_trace_config
+
+
+def test_reuse_ratio():
+    """Test the connection reuse ratio."""
+    stats = ConnectionStats()
+    assert stats.reuse_ratio is None
+
+    stats.connections_created = 1
+    stats.connections_reused = 3
+    assert stats.reuse_ratio == 0.75
+    assert stats.as_dict()["reuse_ratio"] == 0.75
+
+
+async def test_trace_config_updates_stats():
+    """Test that trace signals update the counters."""
+    stats = ConnectionStats()
+    trace_config = _build_trace_config(stats)
+
+    for callback in trace_config.on_request_start:
+        await callback(None, None, None)
+    for callback in trace_config.on_connection_reuseconn:
+        await callback(None, None, None)
+    for callback in trace_config.on_dns_cache_hit:
+        await callback(None, None, None)
+
+    assert stats.requests == 1
+    assert stats.connections_reused == 1
+    assert stats.dns_cache_hits == 1
+
+
+async def test_trace_config_reports_transport_failures():
+    """Test that only transport errors count as connectivity failures."""
+    supervisor = Mock()
+    trace_config = _build_trace_config(ConnectionStats(), supervisor)
+
+    for exception in (
+        aiohttp.ClientConnectorError(Mock(), OSError()),
+        asyncio.TimeoutError(),
+        aiohttp.ClientPayloadError(),
+    ):
+        for callback in trace_config.on_request_exception:
+            await callback(None, None, Mock(exception=exception))
+    for callback in trace_config.on_request_end:
+        await callback(None, None, None)
+
+    assert supervisor.record_failure.call_count == 2
+    assert supervisor.record_success.call_count == 1
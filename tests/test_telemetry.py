@@ -0,0 +1,140 @@
+"""Test the binary telemetry log."""
+
+from pathlib import Path
+import threading
+
+import pytest
+
+from custom_components.winix.telemetry import (
+    RECORD,
+    STATUS_ERROR,
+    STATUS_LATE,
+    STATUS_OK,
+    TelemetryReader,
+    TelemetryWriter,
+    data_files,
+)
+
+from . import without_numpy
+
+TELEMETRY_MODULE = "custom_components.winix.telemetry"
+
+
+def write_log(directory: Path, **kwargs) -> TelemetryWriter:
+    """Write 100 polls of two devices, every tenth one late or failed."""
+    writer = TelemetryWriter(directory, **kwargs)
+    for index in range(100):
+        status = STATUS_OK
+        if index % 10 == 8:
+            status = STATUS_ERROR
+        elif index % 10 == 9:
+            status = STATUS_LATE
+        writer.record(
+            1000.0 + index,
+            f"device_{index % 2}",
+            None if status == STATUS_LATE else index / 100,
+            status,
+            "50" if index % 2 else 60,
+            None,
+            "auto",
+        )
+    writer.flush()
+    return writer
+
+
+@pytest.mark.parametrize("use_numpy", [True, False])
+def test_summary(tmp_path: Path, use_numpy: bool):
+    """Test that both implementations summarize the log the same way."""
+    write_log(tmp_path)
+    reader = TelemetryReader(tmp_path)
+
+    with without_numpy(TELEMETRY_MODULE, not use_numpy):
+        summary = reader.summary(percentiles=(50, 100))
+        recent = reader.summary(since=1090, device="device_1")
+        unknown = reader.summary(device="device_9")
+
+    assert summary.records == 100
+    assert summary.errors == 10
+    assert summary.late == 10
+    assert (summary.first, summary.last) == (1000.0, 1099.0)
+    assert summary.latency[100] == pytest.approx(0.97)
+    assert summary.humidity == {50: 55.0, 100: 60.0}
+    assert summary.devices == {"device_0": 50, "device_1": 50}
+
+    assert recent.records == 5
+    assert recent.late == 1
+    assert recent.devices == {"device_1": 5}
+    assert unknown.records == 0
+
+
+def test_records_round_trip(tmp_path: Path):
+    """Test that records keep their fields and index names across writers."""
+    write_log(tmp_path)
+    writer = TelemetryWriter(tmp_path)
+    writer.record(2000.0, "device_2", 0.5, STATUS_OK, 45, 50, "manual")
+    writer.flush()
+
+    reader = TelemetryReader(tmp_path)
+    assert reader.devices == ["device_0", "device_1", "device_2"]
+    assert reader.modes == ["auto", "manual"]
+
+    records = list(reader)
+    assert len(records) == 101
+    assert records[-1] == (2000.0, 0.5, 2, STATUS_OK, 45, 50, 1)
+    assert records[0][5] == 0xFF  # No target reported
+
+
+def test_rotation(tmp_path: Path):
+    """Test that files hold file_records records and old files are deleted."""
+    write_log(tmp_path, file_records=30, max_files=2)
+
+    files = data_files(tmp_path)
+    assert [path.name for path in files] == ["000003.bin", "000004.bin"]
+    assert [path.stat().st_size // RECORD.size for path in files] == [30, 10]
+    assert TelemetryReader(tmp_path).summary().first == 1060.0
+
+
+def test_torn_record_is_dropped(tmp_path: Path):
+    """Test that a partial record from an interrupted write is cut off."""
+    write_log(tmp_path)
+    path = data_files(tmp_path)[-1]
+    with path.open("ab") as file:
+        file.write(b"\0" * 7)
+    assert TelemetryReader(tmp_path).summary().records == 100
+
+    writer = TelemetryWriter(tmp_path)
+    writer.record(2000.0, "device_0", 0.1, STATUS_OK, 50, 50, "auto")
+    writer.flush()
+
+    assert path.stat().st_size == 101 * RECORD.size
+    assert list(TelemetryReader(tmp_path))[-1][0] == 2000.0
+
+
+def test_concurrent_flushes_keep_order(tmp_path):
+    """Test that a flush waits for one in progress, keeping records in order."""
+    writer = TelemetryWriter(tmp_path)
+    append = writer._append
+    started = threading.Event()
+    release = threading.Event()
+
+    def slow_append(buffer):
+        started.set()
+        release.wait(5)
+        append(buffer)
+
+    writer._append = slow_append
+    writer.record(1.0, "device_1", 0.1, STATUS_OK, 50, 45, "auto")
+    first = threading.Thread(target=writer.flush)
+    first.start()
+    assert started.wait(5)
+
+    writer.record(2.0, "device_1", 0.1, STATUS_OK, 49, 45, "auto")
+    second = threading.Thread(target=writer.flush)
+    second.start()
+    second.join(0.05)
+    assert second.is_alive()
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert [record[0] for record in TelemetryReader(tmp_path)] == [1.0, 2.0]
@@ -0,0 +1,139 @@
+"""Test cloud traffic record and replay."""
+
+import json
+from unittest.mock import MagicMock
+
+import aiohttp
+import pytest
+
+from custom_components.winix.core import codec
+from custom_components.winix.core.endpoints import DEFAULT_ENDPOINT
+from custom_components.winix.driver import WinixDriver
+from custom_components.winix.traffic import (
+    RecordingClient,
+    ReplayClient,
+    TrafficNotRecorded,
+    TrafficRecorder,
+    load_records,
+)
+
+STATE_URL = WinixDriver.STATE_URL.format(
+    base=DEFAULT_ENDPOINT.api_url, deviceid="device_1"
+)
+STATE_BODY = {"body": {"data": [{"attributes": {"D02": "1", "D10": "55"}}]}}
+
+
+def build_client(status: int, body: bytes) -> MagicMock:
+    """Return an aiohttp session mock answering every request with body."""
+    response = MagicMock(status=status)
+
+    async def read():
+        return body
+
+    response.read = read
+
+    context = MagicMock()
+
+    async def enter(*args):
+        return response
+
+    async def exit_(*args):
+        return False
+
+    context.__aenter__ = enter
+    context.__aexit__ = exit_
+
+    client = MagicMock()
+    client.request.return_value = context
+    return client
+
+
+async def test_record_then_replay(tmp_path):
+    """Test that a recorded session replays to the same decoded state."""
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = TrafficRecorder(path)
+    client = RecordingClient(
+        build_client(200, json.dumps(STATE_BODY).encode()), recorder
+    )
+
+    recorded_state = await WinixDriver("device_1", client).get_state()
+    assert recorder.flush() == 1
+
+    records = load_records(path)
+    assert records[0]["m"] == "GET"
+    assert records[0]["u"] == STATE_URL
+    assert records[0]["s"] == 200
+
+    replay = ReplayClient.from_file(path, speed=0)
+    assert await WinixDriver("device_1", replay).get_state() == recorded_state
+    assert replay.requests == 1
+
+
+async def test_binary_bodies_round_trip(tmp_path):
+    """Test that non UTF-8 bodies such as encrypted RPC responses survive."""
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = TrafficRecorder(path)
+    body = bytes(range(256))
+    client = RecordingClient(build_client(200, body), recorder)
+
+    response = await client.post("https://example.com/getDeviceInfoList")
+    assert await response.content.read() == body
+    recorder.flush()
+
+    replay = ReplayClient.from_file(path, speed=0)
+    response = await replay.post("https://example.com/getDeviceInfoList")
+    assert await response.read() == body
+
+
+async def test_replay_order_and_errors():
+    """Test repeated requests, error statuses and unknown requests."""
+    replay = ReplayClient(
+        [
+            {"m": "GET", "u": "https://a", "s": 200, "t": 0, "x": "first"},
+            {"m": "GET", "u": "https://a", "s": 500, "t": 0, "x": "second"},
+        ]
+    )
+
+    assert await (await replay.get("https://a")).text() == "first"
+    with pytest.raises(aiohttp.ClientResponseError):
+        await replay.get("https://a", raise_for_status=True)
+
+    # The last response keeps being served
+    assert (await replay.get("https://a")).status == 500
+
+    with pytest.raises(TrafficNotRecorded):
+        await replay.get("https://b")
+
+
+async def test_replay_matches_request_body(tmp_path):
+    """Test that requests to one URL replay per body, whatever the token."""
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = TrafficRecorder(path)
+    url = "https://example.com/getFilterAlarmInfo"
+    for device_id in ("device_1", "device_2"):
+        client = RecordingClient(build_client(200, device_id.encode()), recorder)
+        await client.post(
+            url, data=codec.encrypt({"accessToken": "old", "deviceId": device_id})
+        )
+    recorder.flush()
+    assert all(record["h"] for record in load_records(path))
+
+    replay = ReplayClient.from_file(path, speed=0)
+    for device_id in ("device_2", "device_1"):
+        body = codec.encrypt({"accessToken": "new", "deviceId": device_id})
+        response = await replay.post(url, data=body)
+        assert await response.text() == device_id
+
+
+def test_recorder_rotates_full_capture(tmp_path):
+    """Test that a capture reaching max_bytes is rotated before appending."""
+    path = tmp_path / "capture.jsonl.gz"
+    recorder = TrafficRecorder(path, max_bytes=1)
+
+    recorder.record("GET", "https://a", 200, b"first", 0)
+    recorder.flush()
+    recorder.record("GET", "https://a", 200, b"second", 0)
+    recorder.flush()
+
+    assert [record["x"] for record in load_records(path)] == ["second"]
+    assert [record["x"] for record in load_records(f"{path}.1")] == ["first"]
@@ -0,0 +1,70 @@
+"""Test LoopLagWatchdog."""
+
+import asyncio
+import time
+
+import pytest
+
+from custom_components.winix.watchdog import LoopLagExceeded, LoopLagWatchdog
+
+
+async def test_track_attributes_lag_to_active_sections():
+    """Test that a blocking call is attributed to every tracked section."""
+    watchdog = LoopLagWatchdog(interval=0.01, threshold=1)
+
+    with watchdog.track("poll_cycle"):
+        with watchdog.track("service.set_mode"):
+            await asyncio.sleep(0.015)
+            time.sleep(0.05)
+            await asyncio.sleep(0.02)
+
+    for label in ("poll_cycle", "service.set_mode"):
+        stats = watchdog.stats[label]
+        assert stats.sections == 1
+        assert stats.max_lag >= 0.03
+        assert stats.last_max_lag == stats.max_lag
+
+    # The heartbeat stops when nothing is tracked
+    assert watchdog._handle is None
+
+
+async def test_strict_mode_raises_when_lag_exceeds_threshold():
+    """Test that strict mode fails a section that blocks the loop."""
+    watchdog = LoopLagWatchdog(interval=0.01, threshold=0.02, strict=True)
+
+    with watchdog.track("quick"):
+        await asyncio.sleep(0.03)
+
+    with pytest.raises(LoopLagExceeded), watchdog.blocking("decode"):
+        time.sleep(0.05)
+
+    assert watchdog.stats["decode"].max_lag >= 0.05
+
+
+async def test_blocking_time_kept_apart_from_cycle_lag():
+    """Test that only blocking() time counts as blocked by Winix code."""
+    watchdog = LoopLagWatchdog(interval=0.01, threshold=1)
+
+    with watchdog.track("poll_cycle"):
+        await asyncio.sleep(0.015)
+        time.sleep(0.04)  # Lag from code that is not tracked as blocking
+        await asyncio.sleep(0.02)
+        with watchdog.blocking("get_state_decode"):
+            time.sleep(0.02)
+
+    cycle = watchdog.stats["poll_cycle"]
+    assert cycle.last_max_lag >= 0.03
+    assert 0.02 <= cycle.last_max_blocked < 0.04
+    assert watchdog.stats["get_state_decode"].max_blocked >= 0.02
+
+
+async def test_executor_jobs_are_timed_without_lag():
+    """Test that executor jobs record their duration, not loop lag."""
+    watchdog = LoopLagWatchdog(interval=0.01, threshold=1)
+
+    async with watchdog.executor("login"):
+        await asyncio.sleep(0.02)
+
+    assert watchdog.jobs["login"].runs == 1
+    assert watchdog.jobs["login"].last >= 0.02
+    assert "login" not in watchdog.stats